@@ -27,5 +27,9 @@ echo "Successfully collected static files"
 django-admin compilemessages
 echo "Successfully compiled messages"
 
+python manage.py generate_schema
+echo "Successfully generated OpenAPI schema"
+
 echo "Starting server"
-gunicorn core.wsgi:application --bind 0.0.0.0:8000
+# the API runs on WSGI; /users/notifications/stream/ is served by the ASGI service in docker-compose.yaml
+gunicorn core.wsgi:app --bind 0.0.0.0:8000
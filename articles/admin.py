@@ -1,6 +1,11 @@
 from django.contrib import admin
+from django.db.models import QuerySet
+from django.db.models.functions import Now
+from django.http import HttpRequest
 
-from .models import Topic, Article
+from core.admin import LargeTableAdmin
+from .models import Topic, Article, Comment, Clap, Report
+from .services import ArticleLifecycleService
 
 
 @admin.register(Topic)
@@ -11,8 +16,59 @@ class TopicAdmin(admin.ModelAdmin):
     list_filter: tuple[str, str, str] = ('id', 'name', 'is_active')
 
 @admin.register(Article)
-class ArticleAdmin(admin.ModelAdmin):
-    list_display: tuple[str, str] = ('id', 'title', 'created_at', 'updated_at')
+class ArticleAdmin(LargeTableAdmin):
+    list_display: tuple[str, ...] = ('id', 'title', 'author', 'status', 'created_at', 'updated_at')
     list_display_links: tuple[str, str] = ('id', 'title')
-    search_fields: tuple[str, str] = ('id', 'title')
-    list_filter: tuple[str, str, str] = ('id', 'title', 'status')
\ No newline at end of file
+    list_select_related: tuple[str] = ('author',)
+    # served by the article_title_trgm index on UPPER(title)
+    search_fields: tuple[str] = ('title',)
+    list_filter: tuple[str] = ('status',)
+    autocomplete_fields: tuple[str, str] = ('author', 'topics')
+    # primary key order is served by its index; Meta.ordering (-created_at) only has partial indexes
+    ordering: tuple[str] = ('-id',)
+
+
+@admin.register(Comment)
+class CommentAdmin(LargeTableAdmin):
+    list_display: tuple[str, ...] = ('id', 'user', 'article', 'parent', 'created_at')
+    list_select_related: tuple[str, str] = ('user', 'article')
+    autocomplete_fields: tuple[str, str] = ('user', 'article')
+    raw_id_fields: tuple[str] = ('parent',)
+    ordering: tuple[str] = ('-id',)
+    actions: list[str] = ['remove_content']
+
+    # replies stay in place, so a removed comment keeps its thread instead of deleting it
+    removed_content: str = "<p>Bu izoh moderator tomonidan olib tashlandi.</p>"
+
+    @admin.action(description="Remove the content of selected comments")
+    def remove_content(self, request: HttpRequest, queryset: QuerySet[Comment]) -> None:
+        updated: int = queryset.update(content=self.removed_content, updated_at=Now())
+        self.message_user(request, f"{updated} comment(s) removed.")
+
+
+@admin.register(Clap)
+class ClapAdmin(LargeTableAdmin):
+    list_display: tuple[str, ...] = ('id', 'user', 'article', 'count', 'created_at')
+    list_select_related: tuple[str, str] = ('user', 'article')
+    autocomplete_fields: tuple[str, str] = ('user', 'article')
+    ordering: tuple[str] = ('-id',)
+    actions: list[str] = ['reset_count']
+
+    @admin.action(description="Reset the count of selected claps")
+    def reset_count(self, request: HttpRequest, queryset: QuerySet[Clap]) -> None:
+        updated: int = queryset.update(count=0)
+        self.message_user(request, f"{updated} clap(s) reset.")
+
+
+@admin.register(Report)
+class ReportAdmin(LargeTableAdmin):
+    list_display: tuple[str, ...] = ('id', 'user', 'article', 'created_at')
+    list_select_related: tuple[str, str] = ('user', 'article')
+    autocomplete_fields: tuple[str, str] = ('user', 'article')
+    ordering: tuple[str] = ('-id',)
+    actions: list[str] = ['trash_articles']
+
+    @admin.action(description="Trash the articles of selected reports")
+    def trash_articles(self, request: HttpRequest, queryset: QuerySet[Report]) -> None:
+        trashed: int = ArticleLifecycleService.trash_reported(queryset)
+        self.message_user(request, f"{trashed} article(s) trashed.")
@@ -1,10 +1,12 @@
 from typing import Type
 
+from django.conf import settings
 from django.db.models import QuerySet, Q, Case, When, Value, BooleanField
 from django_filters import FilterSet, NumberFilter, BooleanFilter, CharFilter
 
 from users.models import CustomUser
-from .models import Article
+from .models import Article, Topic
+from .services import TrendingService
 
 
 class ArticleFilter(FilterSet):
@@ -18,6 +20,18 @@ class ArticleFilter(FilterSet):
     def filter_top_articles(self, queryset: QuerySet[Article], name: str, limit: int) -> QuerySet[Article]:
         return queryset.order_by('-views_count')[:limit]
 
+    trending: BooleanFilter = BooleanFilter(method='filter_trending')
+
+    def filter_trending(self, queryset: QuerySet[Article], name: str, trending: bool) -> QuerySet[Article]:
+        if not trending:
+            return queryset
+
+        # ?topics=<id> with a single topic reads that topic's own trending list
+        topics: list[Topic] = self.form.cleaned_data.get('topics') or []
+        topic_id: int | None = topics[0].pk if len(topics) == 1 else None
+
+        return TrendingService.filter_trending(queryset, settings.TRENDING_LIMIT, topic_id)
+
     is_recommend: BooleanFilter = BooleanFilter(method="filter_recommend_articles")
 
     def filter_recommend_articles(self, queryset: QuerySet[Article], name: str, is_recommend: bool) -> QuerySet[
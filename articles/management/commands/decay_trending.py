@@ -0,0 +1,26 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from loguru import logger
+
+from articles.services import TrendingService
+
+
+class Command(BaseCommand):
+    help = "Rescales trending scores to the current time and drops faded or unpublished articles, once per interval."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--once", action="store_true", help="Decay the scores once and exit.")
+        parser.add_argument("--interval", type=float, default=settings.TRENDING_DECAY_INTERVAL,
+                            help="Seconds between runs.")
+
+    def handle(self, *args, **options) -> None:
+        while True:
+            removed: int = TrendingService.decay()
+            logger.info(f"Decayed trending scores | Removed: {removed}")
+
+            if options["once"]:
+                break
+
+            time.sleep(options["interval"])
@@ -0,0 +1,30 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from loguru import logger
+
+from articles.services import ClapService
+
+
+class Command(BaseCommand):
+    help = "Writes claps coalesced in Redis to the clap table, one upsert per interval."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--once", action="store_true", help="Flush the pending claps and exit.")
+        parser.add_argument("--interval", type=float, default=settings.CLAP_FLUSH_INTERVAL,
+                            help="Seconds between flushes.")
+
+    def handle(self, *args, **options) -> None:
+        while True:
+            deltas = ClapService.take_pending()
+
+            if deltas:
+                written: int = ClapService.apply(deltas)
+                ClapService.ack_pending()
+                logger.info(f"Flushed {len(deltas)} pending claps | Written: {written}")
+
+            if options["once"]:
+                break
+
+            time.sleep(options["interval"])
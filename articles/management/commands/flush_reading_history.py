@@ -0,0 +1,30 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from loguru import logger
+
+from articles.services import ReadingHistoryService
+
+
+class Command(BaseCommand):
+    help = "Writes reads buffered in Redis to the reading history, one bulk insert per interval."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--once", action="store_true", help="Flush the pending reads and exit.")
+        parser.add_argument("--interval", type=float, default=settings.READING_HISTORY_FLUSH_INTERVAL,
+                            help="Seconds between flushes.")
+
+    def handle(self, *args, **options) -> None:
+        while True:
+            pairs = ReadingHistoryService.take_pending()
+
+            if pairs:
+                written: int = ReadingHistoryService.apply(pairs)
+                ReadingHistoryService.ack_pending()
+                logger.info(f"Flushed {len(pairs)} pending reads | New: {written}")
+
+            if options["once"]:
+                break
+
+            time.sleep(options["interval"])
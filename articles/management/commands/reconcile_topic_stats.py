@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from articles.services import TopicStatsService
+
+
+class Command(BaseCommand):
+    help = "Recounts the followers and published articles of every topic and fixes counters that drifted."
+
+    def handle(self, *args, **options) -> None:
+        drifted: int = TopicStatsService.reconcile()
+        self.stdout.write(f"Reconciled {drifted} topics")
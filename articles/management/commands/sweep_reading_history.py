@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from articles.services import ReadingHistoryService
+
+
+class Command(BaseCommand):
+    help = "Deletes reading history past the retention period and trims each user's history to the configured size."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--history-size", type=int, default=settings.READING_HISTORY_SIZE)
+        parser.add_argument("--retention-days", type=int, default=settings.READING_HISTORY_RETENTION_DAYS)
+        parser.add_argument("--batch-size", type=int, default=settings.READING_HISTORY_SWEEP_BATCH_SIZE)
+
+    def handle(self, *args, **options) -> None:
+        deleted: int = ReadingHistoryService.sweep(options["history_size"], options["retention_days"],
+                                                   options["batch_size"])
+        self.stdout.write(f"Deleted {deleted} reading history rows")
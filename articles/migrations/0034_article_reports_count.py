@@ -0,0 +1,23 @@
+# Generated by Django 4.2.14 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0033_article_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='reports_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(
+            sql='UPDATE article SET reports_count = '
+                '(SELECT COUNT(*) FROM report WHERE report.article_id = article.id)',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.14 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0034_article_reports_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='topic',
+            name='articles_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(
+            sql='UPDATE topic SET '
+                'followers_count = (SELECT COUNT(*) FROM topic_follow WHERE topic_follow.topic_id = topic.id), '
+                'articles_count = (SELECT COUNT(*) FROM article_topics '
+                'JOIN article ON article.id = article_topics.article_id '
+                "WHERE article_topics.topic_id = topic.id AND article.status = 'publish')",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.14 on 2026-10-19 12:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0035_topic_counters'),
+        # creates the pg_trgm extension
+        ('users', '0012_customuser_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='article_title_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.14 on 2026-10-19 12:00
+
+import core.db.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0036_article_title_trgm'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='article',
+            name='article_title_trgm',
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=core.db.indexes.UpperTrigramIndex('title', name='article_title_trgm'),
+        ),
+    ]
@@ -1,8 +1,10 @@
 from ckeditor.fields import RichTextField
 from django.conf import settings
 from django.db.models import Model, CharField, TextField, BooleanField, ForeignKey, ImageField, ManyToManyField, \
-    DateTimeField, PositiveBigIntegerField, CASCADE, UniqueConstraint, PositiveSmallIntegerField
+    DateTimeField, PositiveBigIntegerField, CASCADE, UniqueConstraint, PositiveSmallIntegerField, Index, Q, \
+    PositiveIntegerField
 
+from core.db.indexes import UpperTrigramIndex
 from users.models import CustomUser
 
 
@@ -16,6 +18,9 @@ class Topic(Model):
     name: CharField = CharField(max_length=50)
     description: TextField = TextField()
     is_active: BooleanField = BooleanField(default=True)
+    # kept by TopicStatsService and rewritten by the reconcile_topic_stats command
+    followers_count: PositiveIntegerField = PositiveIntegerField(default=0, editable=False)
+    articles_count: PositiveIntegerField = PositiveIntegerField(default=0, editable=False)
 
     def __str__(self) -> CharField:
         return self.name
@@ -34,22 +39,46 @@ class Article(Model):
         verbose_name: str = 'Article'
         verbose_name_plural: str = "Articles"
         ordering: list[str] = ["-created_at"]
+        indexes: list[Index] = [
+            # public feed and keyset pagination over published articles
+            Index(fields=["-created_at", "id"], name="article_publish_created_idx", condition=Q(status="publish")),
+            # ?get_top_articles=
+            Index(fields=["-views_count"], name="article_publish_views_idx", condition=Q(status="publish")),
+            # authenticated listing, which hides trashed and archived articles
+            Index(fields=["-created_at", "id"], name="article_visible_created_idx",
+                  condition=~Q(status__in=["trash", "archive"])),
+            # the author's own articles; also serves the author foreign key
+            Index(fields=["author", "-created_at"], name="article_author_created_idx"),
+            # admin search and autocomplete (title icontains)
+            UpperTrigramIndex("title", name="article_title_trgm"),
+        ]
 
-    author: ForeignKey = ForeignKey(to=CustomUser, on_delete=CASCADE)
+    author: ForeignKey = ForeignKey(to=CustomUser, on_delete=CASCADE, db_index=False)
     title: CharField = CharField(max_length=100)
     summary: CharField = CharField(max_length=200)
     content: RichTextField = RichTextField()
     status: CharField = CharField(choices=STATUS_CHOICES, default="pending", max_length=7)
     thumbnail: ImageField = ImageField(upload_to="thumbnails/", blank=True, null=True)
     topics: ManyToManyField = ManyToManyField(to=Topic, null=False, blank=False)
+    # distinct readers per reading-history retention window: a reader whose reading_history row was swept
+    # (READING_HISTORY_RETENTION_DAYS / READING_HISTORY_SIZE) is counted again on the next read
     views_count: PositiveBigIntegerField = PositiveBigIntegerField(default=0)
     reads_count: PositiveBigIntegerField = PositiveBigIntegerField(default=0)
+    # kept by ArticleLifecycleService.report, which trashes the article in the same UPDATE
+    reports_count: PositiveIntegerField = PositiveIntegerField(default=0)
     created_at: DateTimeField = DateTimeField(auto_now_add=True)
     updated_at: DateTimeField = DateTimeField(auto_now_add=True)
 
     def __str__(self) -> CharField:
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values) -> "Article":
+        instance: Article = super().from_db(db, field_names, values)
+        # remembered so that articles.signals can detect the transition to "publish"
+        instance.loaded_status = instance.__dict__.get("status")
+        return instance
+
 
 class Clap(Model):
     class Meta:
@@ -66,7 +95,7 @@ class Clap(Model):
     count: PositiveSmallIntegerField = PositiveSmallIntegerField(default=0)
 
     def __str__(self) -> str:
-        return f"{self.user.username} clapped {self.article.name}"
+        return f"{self.user.username} clapped {self.article.title}"
 
 
 class Comment(Model):
@@ -115,7 +144,8 @@ class Favorite(Model):
             UniqueConstraint(fields=["user", "article"], name="unique_favorite")
         ]
 
-    user: ForeignKey = ForeignKey(to="users.CustomUser", related_name="favorites", on_delete=CASCADE)
+    # (user, article) lookups and the user foreign key are served by the unique constraint
+    user: ForeignKey = ForeignKey(to="users.CustomUser", related_name="favorites", on_delete=CASCADE, db_index=False)
     article: ForeignKey = ForeignKey(to=Article, related_name="favorited_by", on_delete=CASCADE)
     created_at: DateTimeField = DateTimeField(auto_now_add=True)
 
@@ -133,7 +163,8 @@ class Report(Model):
             UniqueConstraint(fields=["user", "article"], name="unique_report")
         ]
 
-    user: ForeignKey = ForeignKey(to="users.CustomUser", related_name="reports", on_delete=CASCADE)
+    # (user, article) lookups and the user foreign key are served by the unique constraint
+    user: ForeignKey = ForeignKey(to="users.CustomUser", related_name="reports", on_delete=CASCADE, db_index=False)
     article: ForeignKey = ForeignKey(to=Article, related_name="reported_by", on_delete=CASCADE)
     created_at: DateTimeField = DateTimeField(auto_now_add=True)
 
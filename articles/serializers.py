@@ -1,16 +1,59 @@
-from typing import Type
+from collections import defaultdict
+from operator import itemgetter
+from typing import Type, Any, Callable
 
-from django.db.models import QuerySet
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import QuerySet, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 
-from users.serializers import UserSerializer
+from core.serialization import ValuesSerializer, file_url_extractor, format_datetime
+from users.serializers import UserSerializer, UserValuesSerializer
 from .models import Article, Topic, Clap, Comment, FAQ
+from .services import TopicCatalogue
 
 
 class TopicSerializer(serializers.ModelSerializer):
     class Meta:
         model: Type[Topic] = Topic
-        fields: str = "__all__"
+        fields: list[str] = ["id", "name", "description", "is_active"]
+
+
+@extend_schema_field(TopicSerializer(many=True))
+class ArticleTopicsField(serializers.Field):
+    """ An article's topics rendered from ``TopicCatalogue``; only the topic ids are read from the database. """
+
+    def __init__(self, **kwargs) -> None:
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, article: Article) -> list[dict[str, Any]]:
+        if "topics" in getattr(article, "_prefetched_objects_cache", {}):
+            topic_ids: list[int] = [topic.pk for topic in article.topics.all()]
+        else:
+            topic_ids: QuerySet = Article.topics.through.objects.filter(article_id=article.pk).values_list(
+                "topic_id", flat=True)
+
+        return TopicCatalogue.get_many(topic_ids)
+
+
+class CatalogueTopicRelatedField(serializers.PrimaryKeyRelatedField):
+    """ Accepts the id of an active topic, checked against ``TopicCatalogue`` instead of a query per id. """
+
+    def to_internal_value(self, data: Any) -> Topic:
+        try:
+            if isinstance(data, bool):
+                raise TypeError
+            topic: dict[str, Any] | None = TopicCatalogue.get(int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+        if topic is None or not topic["is_active"]:
+            self.fail('does_not_exist', pk_value=data)
+
+        return Topic.from_db(DEFAULT_DB_ALIAS, list(topic), list(topic.values()))
 
 
 class ClapSerializer(serializers.ModelSerializer):
@@ -23,8 +66,12 @@ class ClapSerializer(serializers.ModelSerializer):
         }
 
 
+class ClapCountSerializer(serializers.Serializer):
+    count = serializers.IntegerField(min_value=1, max_value=50, default=1)
+
+
 class ArticleCreateSerializer(serializers.ModelSerializer):
-    topic_ids = serializers.PrimaryKeyRelatedField(
+    topic_ids = CatalogueTopicRelatedField(
         many=True,
         source="topics",
         queryset=Topic.objects.filter(is_active=True),
@@ -49,7 +96,7 @@ class ArticleListSerializer(serializers.ModelSerializer):
                              "created_at", "updated_at", "claps_count", "comments_count"]
 
     author: UserSerializer = UserSerializer()
-    topics: TopicSerializer = TopicSerializer(many=True)
+    topics: ArticleTopicsField = ArticleTopicsField()
     claps_count: serializers.SerializerMethodField = serializers.SerializerMethodField(
         method_name="get_article_claps_count")
     comments_count: serializers.SerializerMethodField = serializers.SerializerMethodField(
@@ -93,7 +140,7 @@ class ArticleDetailSerializer(serializers.ModelSerializer):
                              "created_at", "updated_at", "claps_count", "comments_count"]
 
     author: UserSerializer = UserSerializer()
-    topics: TopicSerializer = TopicSerializer(many=True)
+    topics: ArticleTopicsField = ArticleTopicsField()
     claps_count: serializers.SerializerMethodField = serializers.SerializerMethodField(
         method_name="get_article_claps_count")
     comments_count: serializers.SerializerMethodField = serializers.SerializerMethodField(
@@ -106,7 +153,139 @@ class ArticleDetailSerializer(serializers.ModelSerializer):
         return Comment.objects.filter(article=article).count()
 
 
+class TopicDetailSerializer(TopicSerializer):
+    class Meta(TopicSerializer.Meta):
+        fields: list[str] = [*TopicSerializer.Meta.fields, "followers_count", "articles_count", "trending_articles"]
+
+    trending_articles: ArticleListSerializer = ArticleListSerializer(many=True)
+
+
 class FAQSerializer(serializers.ModelSerializer):
     class Meta:
         model: Type[FAQ] = FAQ
         fields: tuple[str] = "id", "question", "answer"
+
+
+def count_subquery(queryset: QuerySet) -> Coalesce:
+    """ Correlated ``COUNT(*)`` of ``queryset`` rows per outer article. """
+    counts: QuerySet = queryset.filter(article=OuterRef('pk')).order_by().values('article').annotate(
+        count=Count('pk')).values('count')
+    return Coalesce(Subquery(counts), 0)
+
+
+class ArticleListValuesSerializer(ValuesSerializer):
+    """
+    Fast-path counterpart of ``ArticleListSerializer``.
+
+    Authors and topic ids are loaded with one query each for the whole page, topics come from
+    ``TopicCatalogue``, and the clap and comment counts come from correlated subqueries instead of
+    two ``COUNT`` queries per article.
+    """
+
+    value_fields: tuple[str, ...] = ("id", "author_id", "title", "summary", "content", "status", "thumbnail",
+                                     "views_count", "reads_count", "created_at", "updated_at", "claps_count",
+                                     "comments_count")
+
+    def get_values_queryset(self, queryset: QuerySet[Article]) -> QuerySet[dict[str, Any]]:
+        return queryset.annotate(
+            claps_count=count_subquery(Clap.objects.all()),
+            comments_count=count_subquery(Comment.objects.all())
+        ).values(*self.value_fields)
+
+    def prepare(self, rows: list[dict[str, Any]]) -> None:
+        self.authors: dict[int, dict[str, Any]] = UserValuesSerializer(context=self.context).serialize_by_id(
+            row["author_id"] for row in rows)
+
+        topic_ids: defaultdict[int, list[int]] = defaultdict(list)
+        for article_id, topic_id in Article.topics.through.objects.filter(
+                article_id__in=[row["id"] for row in rows]).values_list("article_id", "topic_id"):
+            topic_ids[article_id].append(topic_id)
+
+        self.topics: defaultdict[int, list[dict[str, Any]]] = defaultdict(list, {
+            article_id: TopicCatalogue.get_many(ids) for article_id, ids in topic_ids.items()
+        })
+
+    def get_extractors(self) -> list[tuple[str, Callable[[dict[str, Any]], Any]]]:
+        thumbnail_url: Callable[[str | None], str | None] = file_url_extractor(
+            Article._meta.get_field("thumbnail"), self.request)
+
+        return [
+            ("id", itemgetter("id")),
+            ("author", lambda row: self.authors[row["author_id"]]),
+            ("title", itemgetter("title")),
+            ("summary", itemgetter("summary")),
+            ("content", itemgetter("content")),
+            ("status", itemgetter("status")),
+            ("thumbnail", lambda row: thumbnail_url(row["thumbnail"])),
+            ("views_count", itemgetter("views_count")),
+            ("reads_count", itemgetter("reads_count")),
+            ("topics", lambda row: self.topics[row["id"]]),
+            ("created_at", lambda row: format_datetime(row["created_at"])),
+            ("updated_at", lambda row: format_datetime(row["updated_at"])),
+            ("claps_count", itemgetter("claps_count")),
+            ("comments_count", itemgetter("comments_count")),
+        ]
+
+
+class ArticleDetailCommentsValuesSerializer(ValuesSerializer):
+    """
+    Fast-path counterpart of ``ArticleDetailCommentsSerializer``.
+
+    The reply tree is loaded one level per query rather than one query per comment. Like the nested
+    DRF serializer, replies are rendered without the request context.
+    """
+
+    value_fields: tuple[str, ...] = "id", "article_id", "user_id", "parent_id", "content", "created_at", "updated_at"
+
+    def prepare(self, rows: list[dict[str, Any]]) -> None:
+        self.replies: defaultdict[int, list[dict[str, Any]]] = defaultdict(list)
+        user_ids: set[int] = {row["user_id"] for row in rows}
+        parent_ids: set[int] = {row["id"] for row in rows}
+        loaded_ids: set[int] = set(parent_ids)
+
+        while parent_ids:
+            replies: list[dict[str, Any]] = list(
+                Comment.objects.filter(parent_id__in=parent_ids).values(*self.value_fields))
+
+            for reply in replies:
+                self.replies[reply["parent_id"]].append(reply)
+                user_ids.add(reply["user_id"])
+
+            parent_ids = {reply["id"] for reply in replies} - loaded_ids
+            loaded_ids |= parent_ids
+
+        user_serializer: UserValuesSerializer = UserValuesSerializer(context=self.context)
+        reply_user_serializer: UserValuesSerializer = UserValuesSerializer()
+        user_rows: dict[int, dict[str, Any]] = user_serializer.get_rows_by_id(user_ids)
+
+        self.users: dict[int, dict[str, Any]] = {
+            user_id: user_serializer.to_representation(row) for user_id, row in user_rows.items()
+        }
+        self.reply_users: dict[int, dict[str, Any]] = {
+            user_id: reply_user_serializer.to_representation(row) for user_id, row in user_rows.items()
+        }
+
+    def get_extractors(self) -> list[tuple[str, Callable[[dict[str, Any]], Any]]]:
+        self.reply_extractors: list[tuple[str, Callable[[dict[str, Any]], Any]]] = self.build_extractors(
+            lambda reply: self.reply_users[reply["user_id"]])
+
+        return self.build_extractors(lambda row: self.users[row["user_id"]])
+
+    def build_extractors(self, user: Callable[[dict[str, Any]], dict[str, Any]]) -> list[
+        tuple[str, Callable[[dict[str, Any]], Any]]]:
+        return [
+            ("id", itemgetter("id")),
+            ("article", itemgetter("article_id")),
+            ("user", user),
+            ("parent", itemgetter("parent_id")),
+            ("content", itemgetter("content")),
+            ("created_at", lambda row: format_datetime(row["created_at"])),
+            ("updated_at", lambda row: format_datetime(row["updated_at"])),
+            ("replies", self.represent_replies),
+        ]
+
+    def represent_replies(self, row: dict[str, Any]) -> list[dict[str, Any]]:
+        return [
+            {name: extract(reply) for name, extract in self.reply_extractors}
+            for reply in self.replies[row["id"]]
+        ]
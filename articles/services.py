@@ -0,0 +1,626 @@
+import datetime
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Iterable
+
+import redis
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import QuerySet, F, Case, When, Value, Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from loguru import logger
+
+from users.models import Pin, ReadingHistory
+from .models import Article, Clap, Report, Topic, TopicFollow
+
+User = get_user_model()
+
+
+class ClapService:
+    """
+    Applies clap deltas with a single ``INSERT ... ON CONFLICT DO UPDATE`` capped at ``MAX_CLAPS``.
+
+    With ``CLAP_COALESCE`` enabled the view only adds the delta to a Redis hash, and the ``flush_claps``
+    worker writes every pending (user, article) pair with one multi-row upsert per ``CLAP_FLUSH_INTERVAL``.
+    """
+
+    MAX_CLAPS = 50
+    PENDING_KEY = "claps:pending"
+    PROCESSING_KEY = "claps:processing"
+
+    # a batch left over by a crashed flush is retried before new deltas are taken
+    TAKE_PENDING_SCRIPT = """
+    if redis.call('EXISTS', KEYS[2]) == 0 then
+        if redis.call('EXISTS', KEYS[1]) == 0 then
+            return {}
+        end
+        redis.call('RENAME', KEYS[1], KEYS[2])
+    end
+    return redis.call('HGETALL', KEYS[2])
+    """
+
+    @classmethod
+    def get_redis_conn(cls) -> redis.Redis:
+        return redis.Redis.from_url(settings.REDIS_URL)
+
+    @classmethod
+    def on_conflict(cls) -> str:
+        least: str = "LEAST" if connection.vendor == "postgresql" else "MIN"
+        return (f"ON CONFLICT (user_id, article_id) DO UPDATE "
+                f"SET count = {least}({Clap._meta.db_table}.count + EXCLUDED.count, {cls.MAX_CLAPS})")
+
+    @classmethod
+    def clap(cls, user_id: int, article_id: int, count: int) -> int | None:
+        """
+        Adds ``count`` claps of the user to a published article and returns the new total,
+        or ``None`` when the article is not published.
+        """
+        sql: str = (
+            f"INSERT INTO {Clap._meta.db_table} (user_id, article_id, count, created_at) "
+            f"SELECT %s, id, %s, %s FROM {Article._meta.db_table} WHERE id = %s AND status = 'publish' "
+            f"{cls.on_conflict()} RETURNING count"
+        )
+        now: Any = connection.ops.adapt_datetimefield_value(timezone.now())
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [user_id, min(count, cls.MAX_CLAPS), now, article_id])
+            row: tuple[int] | None = cursor.fetchone()
+
+        return row[0] if row else None
+
+    @classmethod
+    def apply(cls, deltas: dict[tuple[int, int], int]) -> int:
+        """ Writes the deltas of many (user, article) pairs with one multi-row upsert. """
+        article_ids: set[int] = set(Article.objects.filter(
+            id__in={article_id for _, article_id in deltas}, status="publish").values_list("id", flat=True))
+        user_ids: set[int] = set(User.objects.filter(
+            id__in={user_id for user_id, _ in deltas}).values_list("id", flat=True))
+
+        now: Any = connection.ops.adapt_datetimefield_value(timezone.now())
+        rows: list[tuple[int, int, int, Any]] = [
+            (user_id, article_id, min(count, cls.MAX_CLAPS), now)
+            for (user_id, article_id), count in deltas.items()
+            if user_id in user_ids and article_id in article_ids
+        ]
+        if not rows:
+            return 0
+
+        sql: str = (
+            f"INSERT INTO {Clap._meta.db_table} (user_id, article_id, count, created_at) "
+            f"VALUES {', '.join(['(%s, %s, %s, %s)'] * len(rows))} {cls.on_conflict()}"
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [value for row in rows for value in row])
+
+        return len(rows)
+
+    @classmethod
+    def enqueue(cls, user_id: int, article_id: int, count: int) -> int:
+        """ Adds the delta to the pending hash and returns the pending claps of the pair. """
+        return cls.get_redis_conn().hincrby(cls.PENDING_KEY, f"{user_id}:{article_id}", count)
+
+    @classmethod
+    def discard(cls, user_id: int, article_id: int) -> None:
+        cls.get_redis_conn().hdel(cls.PENDING_KEY, f"{user_id}:{article_id}")
+
+    @classmethod
+    def take_pending(cls) -> dict[tuple[int, int], int]:
+        raw: list[bytes] = cls.get_redis_conn().eval(cls.TAKE_PENDING_SCRIPT, 2, cls.PENDING_KEY, cls.PROCESSING_KEY)
+
+        deltas: dict[tuple[int, int], int] = {}
+        for field, count in zip(raw[::2], raw[1::2]):
+            user_id, article_id = field.decode().split(":")
+            deltas[int(user_id), int(article_id)] = int(count)
+
+        return deltas
+
+    @classmethod
+    def ack_pending(cls) -> None:
+        cls.get_redis_conn().delete(cls.PROCESSING_KEY)
+
+
+class ArticleLifecycleService:
+    """
+    Article lifecycle transitions as single conditional statements that report whether a row changed.
+
+    Nothing is fetched before the write: only when no row was affected does the caller look the article
+    up once to tell a missing article from a forbidden or repeated action.
+    """
+
+    # an article is trashed by the report that takes it past this many reports
+    MAX_REPORTS = 3
+
+    @classmethod
+    def transition(cls, queryset: QuerySet[Article], article_id: int, status: str,
+                   author_id: int | None = None) -> bool:
+        """ ``UPDATE article SET status = ... WHERE id = ... [AND author_id = ...]`` within ``queryset``. """
+        filters: dict[str, Any] = {"pk": article_id}
+        if author_id is not None:
+            filters["author_id"] = author_id
+
+        with transaction.atomic():
+            # the published row is tried first, so it is known whether the topics lose a published article
+            if queryset.filter(status="publish", **filters).update(status=status):
+                if status != "publish":
+                    TopicStatsService.adjust_articles(Topic.objects.filter(article=article_id), -1)
+                return True
+
+            if queryset.filter(**filters).update(status=status):
+                if status == "publish":
+                    TopicStatsService.adjust_articles(Topic.objects.filter(article=article_id), 1)
+                return True
+
+        return False
+
+    @classmethod
+    def pin(cls, article_id: int) -> bool:
+        """ Pins a published article; ``False`` when it is not published or already pinned. """
+        sql: str = (
+            f"INSERT INTO {Pin._meta.db_table} (article_id, created_at) "
+            f"SELECT id, %s FROM {Article._meta.db_table} WHERE id = %s AND status = 'publish' "
+            f"ON CONFLICT (article_id) DO NOTHING RETURNING id"
+        )
+        now: Any = connection.ops.adapt_datetimefield_value(timezone.now())
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [now, article_id])
+            return cursor.fetchone() is not None
+
+    @classmethod
+    def unpin(cls, article_id: int) -> bool:
+        return bool(Pin.objects.filter(article_id=article_id, article__status="publish").delete()[0])
+
+    @classmethod
+    def report(cls, user_id: int, article_id: int) -> str | None:
+        """
+        Records the user's report of a published article and returns the article status after it,
+        or ``None`` when the article is not published or the user already reported it.
+        """
+        insert_sql: str = (
+            f"INSERT INTO {Report._meta.db_table} (user_id, article_id, created_at) "
+            f"SELECT %s, id, %s FROM {Article._meta.db_table} WHERE id = %s AND status = 'publish' "
+            f"ON CONFLICT (user_id, article_id) DO NOTHING RETURNING id"
+        )
+        # SET expressions see the old row, so reports_count >= MAX_REPORTS means this report exceeds it
+        update_sql: str = (
+            f"UPDATE {Article._meta.db_table} SET reports_count = reports_count + 1, "
+            f"status = CASE WHEN reports_count >= %s THEN 'trash' ELSE status END "
+            f"WHERE id = %s RETURNING status"
+        )
+        now: Any = connection.ops.adapt_datetimefield_value(timezone.now())
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(insert_sql, [user_id, now, article_id])
+            if cursor.fetchone() is None:
+                return None
+
+            cursor.execute(update_sql, [cls.MAX_REPORTS, article_id])
+            status: str = cursor.fetchone()[0]
+
+            if status == "trash":
+                TopicStatsService.adjust_articles(Topic.objects.filter(article=article_id), -1)
+
+        return status
+
+    @classmethod
+    def trash_reported(cls, reports: QuerySet[Report]) -> int:
+        """ Trashes the published articles of ``reports`` in one ``UPDATE`` and returns how many it trashed. """
+        reported_sql, params = reports.order_by().values("article_id").query.sql_with_params()
+        update_sql: str = (
+            f"UPDATE {Article._meta.db_table} SET status = 'trash' "
+            f"WHERE status = 'publish' AND id IN ({reported_sql}) RETURNING id"
+        )
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(update_sql, params)
+            trashed: list[int] = [row[0] for row in cursor.fetchall()]
+
+            if trashed:
+                TopicStatsService.remove_articles(trashed)
+
+        return len(trashed)
+
+
+class ReadingHistoryService:
+    """
+    Records first reads of an article off the request path.
+
+    With ``READING_HISTORY_BUFFER`` enabled the view only adds the (user, article) pair to a Redis set, and
+    the ``flush_reading_history`` worker writes every pending pair with one ``INSERT ... ON CONFLICT DO NOTHING``
+    per ``READING_HISTORY_FLUSH_INTERVAL``; the unique constraint drops pairs that were already recorded.
+    """
+
+    PENDING_KEY = "reading_history:pending"
+    PROCESSING_KEY = "reading_history:processing"
+    # pairs per INSERT, which keeps the statement under SQLite's bound parameter limit
+    INSERT_BATCH_SIZE = 400
+
+    # a batch left over by a crashed flush is retried before new pairs are taken
+    TAKE_PENDING_SCRIPT = """
+    if redis.call('EXISTS', KEYS[2]) == 0 then
+        if redis.call('EXISTS', KEYS[1]) == 0 then
+            return {}
+        end
+        redis.call('RENAME', KEYS[1], KEYS[2])
+    end
+    return redis.call('SMEMBERS', KEYS[2])
+    """
+
+    @classmethod
+    def get_redis_conn(cls) -> redis.Redis:
+        return redis.Redis.from_url(settings.REDIS_URL)
+
+    @classmethod
+    def record(cls, user_id: int, article_id: int) -> None:
+        if settings.READING_HISTORY_BUFFER:
+            try:
+                cls.get_redis_conn().sadd(cls.PENDING_KEY, f"{user_id}:{article_id}")
+                return
+            except redis.RedisError as error:
+                logger.warning(f"Could not buffer the read of article {article_id} by user {user_id} | {error}")
+
+        cls.apply({(user_id, article_id)})
+
+    @classmethod
+    def apply(cls, pairs: set[tuple[int, int]]) -> int:
+        """
+        Inserts the pairs not recorded yet, adds them to ``views_count`` and returns how many were new.
+
+        Only rows the ``INSERT ... ON CONFLICT DO NOTHING`` actually wrote are counted, so a pair flushed by
+        two concurrent calls (the worker and the request-path fallback) is counted once.
+        """
+        views: Counter[int] = Counter()
+        pairs_list: list[tuple[int, int]] = list(pairs)
+        now: Any = connection.ops.adapt_datetimefield_value(timezone.now())
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            for start in range(0, len(pairs_list), cls.INSERT_BATCH_SIZE):
+                batch: list[tuple[int, int]] = pairs_list[start:start + cls.INSERT_BATCH_SIZE]
+                # VALUES columns are column1, column2 on both PostgreSQL and SQLite; the WHERE drops pairs
+                # whose user or article is gone (and lets SQLite parse ON CONFLICT after INSERT ... SELECT)
+                sql: str = (
+                    f"INSERT INTO {ReadingHistory._meta.db_table} (user_id, article_id, created_at) "
+                    f"SELECT v.column1, v.column2, %s FROM (VALUES {', '.join(['(%s, %s)'] * len(batch))}) AS v "
+                    f"WHERE v.column1 IN (SELECT id FROM {connection.ops.quote_name(User._meta.db_table)}) "
+                    f"AND v.column2 IN (SELECT id FROM {Article._meta.db_table}) "
+                    f"ON CONFLICT (user_id, article_id) DO NOTHING RETURNING article_id"
+                )
+                cursor.execute(sql, [now, *(value for pair in batch for value in pair)])
+                views.update(row[0] for row in cursor.fetchall())
+
+            if views:
+                Article.objects.filter(id__in=views).update(views_count=F("views_count") + Case(
+                    *(When(id=article_id, then=Value(count)) for article_id, count in views.items()),
+                    default=Value(0)
+                ))
+
+        TrendingService.record("view", views)
+
+        return views.total()
+
+    @classmethod
+    def take_pending(cls) -> set[tuple[int, int]]:
+        raw: list[bytes] = cls.get_redis_conn().eval(cls.TAKE_PENDING_SCRIPT, 2, cls.PENDING_KEY, cls.PROCESSING_KEY)
+
+        pairs: set[tuple[int, int]] = set()
+        for member in raw:
+            user_id, article_id = member.decode().split(":")
+            pairs.add((int(user_id), int(article_id)))
+
+        return pairs
+
+    @classmethod
+    def ack_pending(cls) -> None:
+        cls.get_redis_conn().delete(cls.PROCESSING_KEY)
+
+    @classmethod
+    def sweep(cls, history_size: int, retention_days: int, batch_size: int) -> int:
+        """
+        Deletes reads older than ``retention_days`` and all but the newest ``history_size`` reads of each user,
+        which keeps the ``is_reading_history=false`` anti-join short for heavy readers.
+
+        A read is only counted in ``views_count`` when its row is inserted, so a reader whose row was swept is
+        counted again on the next read: ``views_count`` counts distinct readers per retention window (and per
+        history cap), not distinct readers ever.
+        """
+        expired: QuerySet = ReadingHistory.objects.filter(
+            created_at__lt=timezone.now() - datetime.timedelta(days=retention_days)
+        ).order_by().values_list("id", flat=True)
+        deleted: int = 0
+
+        # in batches, so the sweep never holds a long lock over the table
+        while expired_ids := list(expired[:batch_size]):
+            deleted += ReadingHistory.objects.filter(id__in=expired_ids).delete()[0]
+
+        overflowing: QuerySet = ReadingHistory.objects.order_by().values("user_id").annotate(
+            total=Count("id")).filter(total__gt=history_size).values_list("user_id", flat=True)
+
+        for user_id in overflowing.iterator():
+            stale_ids: QuerySet = ReadingHistory.objects.filter(user_id=user_id).order_by(
+                "-created_at", "-id").values_list("id", flat=True)[history_size:]
+            deleted += ReadingHistory.objects.filter(id__in=list(stale_ids)).delete()[0]
+
+        return deleted
+
+
+class TopicCatalogue:
+    """
+    Process-local copy of the topic table, so topics are serialized and validated without queries.
+
+    A process compares its copy with a version number in Redis at most once per
+    ``TOPIC_CATALOGUE_CHECK_INTERVAL`` seconds and reloads it when the version moved; saving or deleting
+    a topic bumps the version (see articles.signals).
+    """
+
+    VERSION_KEY = "topics:version"
+    # the fields of TopicSerializer; the counters change too often to be cached here
+    FIELDS: tuple[str, ...] = ("id", "name", "description", "is_active")
+
+    topics: dict[int, dict[str, Any]] | None = None
+    version: bytes | None = None
+    checked_at: float = float("-inf")
+    lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def get_redis_conn(cls) -> redis.Redis:
+        return redis.Redis.from_url(settings.REDIS_URL)
+
+    @classmethod
+    def get_topics(cls) -> dict[int, dict[str, Any]]:
+        """ Topics by id, in ``Topic.Meta.ordering``, with the fields of ``TopicSerializer``. """
+        topics: dict[int, dict[str, Any]] | None = cls.topics
+        if topics is not None and time.monotonic() - cls.checked_at < settings.TOPIC_CATALOGUE_CHECK_INTERVAL:
+            return topics
+
+        with cls.lock:
+            try:
+                version: bytes | None = cls.get_redis_conn().get(cls.VERSION_KEY) or b"0"
+            except redis.RedisError as error:
+                # without the version the copy is only trusted for one check interval
+                logger.warning(f"Could not read the topic catalogue version | {error}")
+                version = None
+
+            if cls.topics is None or version is None or version != cls.version:
+                cls.topics = {topic["id"]: topic for topic in Topic.objects.values(*cls.FIELDS)}
+                cls.version = version
+
+            cls.checked_at = time.monotonic()
+            return cls.topics
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cls.topics = None
+
+    @classmethod
+    def bump(cls) -> None:
+        cls.invalidate()
+        try:
+            cls.get_redis_conn().incr(cls.VERSION_KEY)
+        except redis.RedisError as error:
+            logger.warning(f"Could not bump the topic catalogue version | {error}")
+
+    @classmethod
+    def get(cls, topic_id: int) -> dict[str, Any] | None:
+        topic: dict[str, Any] | None = cls.get_topics().get(topic_id)
+
+        if topic is None and Topic.objects.filter(pk=topic_id).exists():
+            # created by another process since the last version check
+            cls.invalidate()
+            topic = cls.get_topics().get(topic_id)
+
+        return topic
+
+    @classmethod
+    def get_many(cls, topic_ids: Iterable[int]) -> list[dict[str, Any]]:
+        topic_ids: set[int] = set(topic_ids)
+        topics: dict[int, dict[str, Any]] = cls.get_topics()
+
+        if not topic_ids <= topics.keys():
+            cls.invalidate()
+            topics = cls.get_topics()
+
+        return [topic for topic_id, topic in topics.items() if topic_id in topic_ids]
+
+    @classmethod
+    def get_active(cls) -> list[dict[str, Any]]:
+        return [topic for topic in cls.get_topics().values() if topic["is_active"]]
+
+
+class TopicStatsService:
+    """
+    Follower and published-article counters of topics.
+
+    They are moved with ``F()`` updates wherever follows, article statuses or article topics change (see
+    articles.signals and ``ArticleLifecycleService``); ``reconcile_topic_stats`` rewrites counters that drifted,
+    e.g. after a topic was saved with stale counters or a write bypassed the signals.
+    """
+
+    @classmethod
+    def adjust_followers(cls, topic_id: int, delta: int) -> None:
+        Topic.objects.filter(pk=topic_id).update(followers_count=Greatest(F("followers_count") + delta, 0))
+
+    @classmethod
+    def adjust_articles(cls, topics: QuerySet[Topic], delta: int) -> None:
+        if delta:
+            topics.update(articles_count=Greatest(F("articles_count") + delta, 0))
+
+    @classmethod
+    def remove_articles(cls, article_ids: list[int]) -> None:
+        """ Takes articles that stopped being published off their topics, one ``UPDATE`` for every topic. """
+        links: QuerySet = Article.topics.through.objects.filter(article_id__in=article_ids)
+        removed: Subquery = Subquery(
+            links.filter(topic=OuterRef("pk")).order_by().values("topic").annotate(count=Count("pk")).values("count")
+        )
+        Topic.objects.filter(pk__in=links.values("topic_id")).update(
+            articles_count=Greatest(F("articles_count") - removed, 0)
+        )
+
+    @classmethod
+    def get_stats(cls, topic_id: int) -> dict[str, int] | None:
+        return Topic.objects.filter(pk=topic_id).values("followers_count", "articles_count").first()
+
+    @classmethod
+    def reconcile(cls) -> int:
+        """ Recounts every topic and returns how many had drifted. """
+        followers: Coalesce = Coalesce(Subquery(
+            TopicFollow.objects.filter(topic=OuterRef("pk")).order_by().values("topic").annotate(
+                count=Count("pk")).values("count")
+        ), 0)
+        articles: Coalesce = Coalesce(Subquery(
+            Article.topics.through.objects.filter(topic=OuterRef("pk"), article__status="publish").order_by().values(
+                "topic").annotate(count=Count("pk")).values("count")
+        ), 0)
+
+        drifted: list[int] = list(Topic.objects.annotate(
+            actual_followers=followers, actual_articles=articles
+        ).exclude(
+            followers_count=F("actual_followers"), articles_count=F("actual_articles")
+        ).values_list("id", flat=True))
+
+        if drifted:
+            Topic.objects.filter(id__in=drifted).update(followers_count=followers, articles_count=articles)
+
+        return len(drifted)
+
+
+class TrendingService:
+    """
+    Time-decayed trending scores of published articles in Redis sorted sets, one global and one per topic.
+
+    Every view, read, clap and comment adds ``WEIGHTS[event] * 2 ** ((now - epoch) / TRENDING_HALF_LIFE)``
+    to the article's score, so an event weighs half as much as one that happens ``TRENDING_HALF_LIFE``
+    seconds later and no score has to be recomputed on read. The ``decay_trending`` job rescales all scores
+    to a new epoch before they grow too large, and drops faded, unpublished and overflowing articles.
+    """
+
+    GLOBAL_KEY = "trending:articles"
+    KEYS_KEY = "trending:keys"
+    EPOCH_KEY = "trending:epoch"
+
+    WEIGHTS: dict[str, float] = {"view": 1.0, "read": 3.0, "clap": 0.5, "comment": 5.0}
+
+    # KEYS: epoch, key registry, sorted sets | ARGV: now, half-life, max size, article id, weight
+    RECORD_SCRIPT = """
+    local epoch = tonumber(redis.call('GET', KEYS[1]))
+    if not epoch then
+        epoch = tonumber(ARGV[1])
+        redis.call('SET', KEYS[1], ARGV[1])
+    end
+    local increment = tonumber(ARGV[5]) * 2 ^ ((tonumber(ARGV[1]) - epoch) / tonumber(ARGV[2]))
+    for i = 3, #KEYS do
+        redis.call('ZINCRBY', KEYS[i], increment, ARGV[4])
+        redis.call('SADD', KEYS[2], KEYS[i])
+        -- the lowest members are evicted, never the one just incremented, so a new article can enter a full set
+        local excess = redis.call('ZCARD', KEYS[i]) - tonumber(ARGV[3])
+        if excess > 0 then
+            for _, member in ipairs(redis.call('ZRANGE', KEYS[i], 0, excess)) do
+                if excess > 0 and member ~= ARGV[4] then
+                    redis.call('ZREM', KEYS[i], member)
+                    excess = excess - 1
+                end
+            end
+        end
+    end
+    """
+
+    # KEYS: epoch, sorted sets | ARGV: now, half-life, min score
+    REBASE_SCRIPT = """
+    local epoch = tonumber(redis.call('GET', KEYS[1]))
+    if not epoch then
+        return 0
+    end
+    local factor = 2 ^ ((epoch - tonumber(ARGV[1])) / tonumber(ARGV[2]))
+    local removed = 0
+    for i = 2, #KEYS do
+        local members = redis.call('ZRANGE', KEYS[i], 0, -1, 'WITHSCORES')
+        for j = 1, #members, 2 do
+            redis.call('ZADD', KEYS[i], tonumber(members[j + 1]) * factor, members[j])
+        end
+        removed = removed + redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', '(' .. ARGV[3])
+    end
+    redis.call('SET', KEYS[1], ARGV[1])
+    return removed
+    """
+
+    @classmethod
+    def get_redis_conn(cls) -> redis.Redis:
+        return redis.Redis.from_url(settings.REDIS_URL)
+
+    @staticmethod
+    def topic_key(topic_id: int) -> str:
+        return f"trending:topic:{topic_id}"
+
+    @classmethod
+    def record(cls, event: str, counts: dict[int, int]) -> None:
+        """ Adds ``counts[article_id]`` events of one kind to the scores of the articles and of their topics. """
+        if not counts:
+            return
+
+        topic_keys: defaultdict[int, list[str]] = defaultdict(list)
+        for article_id, topic_id in Article.topics.through.objects.filter(
+                article_id__in=counts).values_list("article_id", "topic_id"):
+            topic_keys[article_id].append(cls.topic_key(topic_id))
+
+        now: float = time.time()
+
+        try:
+            pipeline: redis.client.Pipeline = cls.get_redis_conn().pipeline(transaction=False)
+            for article_id, count in counts.items():
+                pipeline.eval(cls.RECORD_SCRIPT, 3 + len(topic_keys[article_id]), cls.EPOCH_KEY, cls.KEYS_KEY,
+                              cls.GLOBAL_KEY, *topic_keys[article_id], now, settings.TRENDING_HALF_LIFE,
+                              settings.TRENDING_MAX_SIZE, article_id, cls.WEIGHTS[event] * count)
+            pipeline.execute()
+        except redis.RedisError as error:
+            logger.warning(f"Could not record {event} events of articles {list(counts)} | {error}")
+
+    @classmethod
+    def get_top_ids(cls, limit: int, topic_id: int | None = None) -> list[int]:
+        key: str = cls.GLOBAL_KEY if topic_id is None else cls.topic_key(topic_id)
+        return [int(article_id) for article_id in cls.get_redis_conn().zrevrange(key, 0, limit - 1)]
+
+    @classmethod
+    def filter_trending(cls, queryset: QuerySet[Article], limit: int,
+                        topic_id: int | None = None) -> QuerySet[Article]:
+        """
+        The top ``limit`` trending articles of ``queryset``, best first; the most viewed ones while there is
+        no trending list (a fresh deploy, a flushed Redis, a quiet topic) or Redis is down.
+        """
+        try:
+            article_ids: list[int] = cls.get_top_ids(limit, topic_id)
+        except redis.RedisError as error:
+            logger.warning(f"Could not read trending articles | {error}")
+            article_ids = []
+
+        if not article_ids:
+            return queryset.order_by("-views_count", "-created_at")
+
+        return queryset.filter(id__in=article_ids).order_by(
+            Case(*(When(id=article_id, then=Value(rank)) for rank, article_id in enumerate(article_ids)))
+        )
+
+    @classmethod
+    def decay(cls) -> int:
+        """ Rescales every score to the current epoch and returns how many articles were dropped. """
+        conn: redis.Redis = cls.get_redis_conn()
+        keys: list[bytes] = sorted(conn.smembers(cls.KEYS_KEY))
+        if not keys:
+            return 0
+
+        removed: int = conn.eval(cls.REBASE_SCRIPT, 1 + len(keys), cls.EPOCH_KEY, *keys, time.time(),
+                                 settings.TRENDING_HALF_LIFE, settings.TRENDING_MIN_SCORE)
+
+        article_ids: set[int] = {int(article_id) for key in keys for article_id in conn.zrange(key, 0, -1)}
+        unpublished: set[int] = article_ids - set(Article.objects.filter(
+            id__in=article_ids, status="publish").values_list("id", flat=True))
+
+        if unpublished:
+            pipeline: redis.client.Pipeline = conn.pipeline()
+            for key in keys:
+                pipeline.zrem(key, *unpublished)
+            removed += sum(pipeline.execute())
+
+        return removed
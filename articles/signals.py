@@ -0,0 +1,84 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+
+from users.services import NotificationService
+from .models import Article, Topic, TopicFollow
+from .services import TopicCatalogue, TopicStatsService
+
+
+@receiver(post_save, sender=Article)
+def on_article_saved(sender, instance: Article, created: bool, **kwargs) -> None:
+    was_published: bool = getattr(instance, "loaded_status", None) == "publish"
+    is_published: bool = instance.status == "publish"
+
+    if is_published != was_published:
+        TopicStatsService.adjust_articles(Topic.objects.filter(article=instance.pk), 1 if is_published else -1)
+
+    if is_published and not was_published:
+        # a publish that is rolled back notifies nobody
+        article_id, author_id, title = instance.pk, instance.author_id, instance.title
+        transaction.on_commit(lambda: NotificationService.notify_article_published(
+            article_id=article_id, author_id=author_id, title=title))
+
+    instance.loaded_status = instance.status
+
+
+@receiver(pre_delete, sender=Article)
+def on_article_deleted(sender, instance: Article, **kwargs) -> None:
+    # before the cascade removes the article_topics rows
+    if getattr(instance, "loaded_status", instance.status) == "publish":
+        TopicStatsService.adjust_articles(Topic.objects.filter(article=instance.pk), -1)
+
+
+@receiver(m2m_changed, sender=Article.topics.through)
+def on_article_topics_changed(sender, instance: Article | Topic, action: str, reverse: bool,
+                              pk_set: set[int] | None, **kwargs) -> None:
+    if action not in ("post_add", "pre_remove", "pre_clear"):
+        return
+
+    # removals are counted before the rows go, and only for pairs that are actually linked
+    delta: int = 1 if action == "post_add" else -1
+
+    if not reverse:
+        if instance.status != "publish":
+            return
+
+        if action == "post_add":
+            topics: QuerySet[Topic] = Topic.objects.filter(pk__in=pk_set)
+        else:
+            topics: QuerySet[Topic] = Topic.objects.filter(article=instance.pk)
+            if action == "pre_remove":
+                topics = topics.filter(pk__in=pk_set)
+
+        TopicStatsService.adjust_articles(topics, delta)
+        return
+
+    if action == "post_add":
+        articles: QuerySet[Article] = Article.objects.filter(status="publish", pk__in=pk_set)
+    else:
+        articles: QuerySet[Article] = Article.objects.filter(status="publish", topics=instance.pk)
+        if action == "pre_remove":
+            articles = articles.filter(pk__in=pk_set)
+
+    TopicStatsService.adjust_articles(Topic.objects.filter(pk=instance.pk), delta * articles.count())
+
+
+@receiver(post_save, sender=TopicFollow)
+def on_topic_followed(sender, instance: TopicFollow, created: bool, **kwargs) -> None:
+    if created:
+        TopicStatsService.adjust_followers(instance.topic_id, 1)
+
+
+@receiver(post_delete, sender=TopicFollow)
+def on_topic_unfollowed(sender, instance: TopicFollow, **kwargs) -> None:
+    TopicStatsService.adjust_followers(instance.topic_id, -1)
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_delete, sender=Topic)
+def bump_topic_catalogue(sender, instance: Topic, **kwargs) -> None:
+    # this process sees the change at once; other processes reload once it is committed
+    TopicCatalogue.invalidate()
+    transaction.on_commit(TopicCatalogue.bump)
@@ -1,14 +1,16 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from .views import ArticlesView, TopicFollowView, CreateCommentsView, ArticleDetailCommentsView, CommentsView, \
-    FavoriteArticleView, ClapView, ReportArticleView, FAQListView
+from .views import ArticlesView, TopicListView, TopicDetailView, TopicFollowView, CreateCommentsView, \
+    ArticleDetailCommentsView, CommentsView, FavoriteArticleView, ClapView, ReportArticleView, FAQListView
 
 router = DefaultRouter()
 router.register(prefix='', viewset=ArticlesView, basename='articles')
 router.register(prefix=r'comments', viewset=CommentsView, basename='comments')
 
 urlpatterns: list = [
+    path('topics/', TopicListView.as_view(), name='topic-list'),
+    path('topics/<int:pk>/', TopicDetailView.as_view(), name='topic-detail'),
     path('topics/<int:pk>/follow/', TopicFollowView.as_view(), name='topic-follow'),
     path('<int:pk>/comments/', CreateCommentsView.as_view(), name='create-comment'),
     path('<int:pk>/detail/comments/', ArticleDetailCommentsView.as_view(), name='detail-article-comments'),
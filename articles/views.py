@@ -1,21 +1,24 @@
 from typing import Type, Any
 
-from django.db.models import QuerySet
+from django.conf import settings
+from django.db.models import QuerySet, F
 from django.http import HttpRequest
 from django.shortcuts import get_object_or_404
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse, OpenApiExample
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.serialization import ValuesListModelMixin
 from users.authentications import CustomJWTAuthentication
-from users.models import CustomUser, ReadingHistory, Pin
-from users.serializers import UserSerializer, PinSerializer
+from users.models import CustomUser
+from users.serializers import PinSerializer
 from .filters import ArticleFilter
-from .models import Article, TopicFollow, Topic, Comment, Favorite, Clap, Report, FAQ
+from .models import Article, TopicFollow, Comment, Favorite, Clap, FAQ
 from .schemas import articles_list_response, unauthorized_response, article_detail_response, \
     no_article_matches_response, bad_request_response, no_content_response, forbidden_response, article_read_response, \
     article_archived, article_pin, article_already_pinned, article_not_found
@@ -25,9 +28,15 @@ from .serializers import (
     ArticleListSerializer,
     CommentSerializer,
     ArticleDetailCommentsSerializer,
-    ClapSerializer,
-    FAQSerializer
+    ClapCountSerializer,
+    FAQSerializer,
+    TopicSerializer,
+    TopicDetailSerializer,
+    ArticleListValuesSerializer,
+    ArticleDetailCommentsValuesSerializer
 )
+from .services import ClapService, ArticleLifecycleService, ReadingHistoryService, TopicCatalogue, \
+    TopicStatsService, TrendingService
 
 
 @extend_schema_view(
@@ -116,8 +125,9 @@ from .serializers import (
         }
     )
 )
-class ArticlesView(viewsets.ModelViewSet):
+class ArticlesView(ValuesListModelMixin, viewsets.ModelViewSet):
     filterset_class: Type[ArticleFilter] = ArticleFilter
+    values_serializer_class: Type[ArticleListValuesSerializer] = ArticleListValuesSerializer
 
     authentication_classes: tuple[Type[CustomJWTAuthentication]] = CustomJWTAuthentication,
 
@@ -167,21 +177,10 @@ class ArticlesView(viewsets.ModelViewSet):
         return Response(data=create_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def destroy(self, request: HttpRequest, pk: int, *args, **kwargs) -> Response:
+        if ArticleLifecycleService.transition(self.get_queryset(), pk, "trash", author_id=request.user.id):
+            return Response(status=status.HTTP_204_NO_CONTENT)
 
-        article: Article | None = get_object_or_404(klass=self.get_queryset(), pk=pk)
-
-        if not request.user.is_authenticated:
-            return Response(data={'detail': 'Authentication credentials were not provided.'},
-                            status=status.HTTP_401_UNAUTHORIZED)
-
-        if request.user != article.author:
-            return Response(data={'detail': 'You do not have permission to perform this action.'},
-                            status=status.HTTP_403_FORBIDDEN)
-
-        article.status = 'trash'
-        article.save()
-
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        return self.transition_failed(pk)
 
     def retrieve(self, request: HttpRequest, pk: int, *args, **kwargs):
         try:
@@ -190,24 +189,19 @@ class ArticlesView(viewsets.ModelViewSet):
         except ValueError:
             return Response(data={"detail": "PK must be a valid integer"}, status=status.HTTP_404_NOT_FOUND)
 
-        user: CustomUser = request.user
-
-        if not ReadingHistory.objects.filter(user=user, article=article).exists():
-            ReadingHistory.objects.create(user=user, article=article)
+        if request.user.is_authenticated:
+            ReadingHistoryService.record(request.user.id, article.id)
 
-            article.views_count += 1
-            article.save()
-
-        return super().retrieve(request=request, *args, **kwargs)
+        return Response(data=self.get_serializer(article).data)
 
 
     @action(methods=["POST"], detail=True, description="Increments article reads count", url_path="read",
             url_name="article-read")
     def read(self, request: HttpRequest, pk: int, *args, **kwargs):
-        article: Article = get_object_or_404(klass=self.get_queryset(), pk=pk)
+        if not self.get_queryset().filter(pk=pk).update(reads_count=F("reads_count") + 1):
+            raise NotFound("No Article matches the given query.")
 
-        article.reads_count += 1
-        article.save()
+        TrendingService.record("read", {pk: 1})
 
         return Response(data={
             "detail": "Maqolani o'qish soni ortdi."
@@ -218,14 +212,8 @@ class ArticlesView(viewsets.ModelViewSet):
     @action(methods=["POST"], detail=True, description="Archives article", url_path="archive",
             url_name="article-archive")
     def archive(self, request: HttpRequest, pk: int, *args, **kwargs):
-        article: Article = get_object_or_404(klass=self.get_queryset(), pk=pk)
-
-        if request.user != article.author:
-            return Response(data={'detail': 'You do not have permission to perform this action.'},
-                            status=status.HTTP_403_FORBIDDEN)
-
-        article.status = "archive"
-        article.save()
+        if not ArticleLifecycleService.transition(self.get_queryset(), pk, "archive", author_id=request.user.id):
+            return self.transition_failed(pk)
 
         return Response(data={
             "detail": "Maqola arxivlandi."
@@ -235,13 +223,12 @@ class ArticlesView(viewsets.ModelViewSet):
     @action(methods=["POST"], detail=True, description="Pins article", url_path="pin",
             url_name="article-pin")
     def pin(self, request: HttpRequest, pk: int, *args, **kwargs):
-        article: Article = get_object_or_404(klass=self.get_queryset(), pk=pk)
+        if not ArticleLifecycleService.pin(pk):
+            if not self.get_queryset().filter(pk=pk).exists():
+                raise NotFound("No Article matches the given query.")
 
-        if Pin.objects.filter(article=article).exists():
             return Response(data={"detail": "Maqola allaqachon pin qilingan."}, status=status.HTTP_400_BAD_REQUEST)
 
-        Pin.objects.create(article=article)
-
         return Response(data={
             "detail": "Maqola pin qilindi."
         }, status=status.HTTP_200_OK)
@@ -250,19 +237,18 @@ class ArticlesView(viewsets.ModelViewSet):
     @action(methods=["DELETE"], detail=True, description="Unpins article", url_path="unpin",
             url_name="article-unpin")
     def unpin(self, request: HttpRequest, pk: int, *args, **kwargs):
-        article: Article = self.get_queryset().filter(pk=pk).first()
-
-        if article is None:
+        if not ArticleLifecycleService.unpin(pk):
             return Response(data={"detail": "Maqola topilmadi.."}, status=status.HTTP_404_NOT_FOUND)
 
-        pin: Pin = Pin.objects.filter(article=article).first()
-
-        if pin is None:
-            return Response(data={"detail": "Maqola topilmadi.."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
-        pin.delete()
+    def transition_failed(self, pk: int) -> Response:
+        # the conditional UPDATE matched nothing: the article is hidden, missing or someone else's
+        if not self.get_queryset().filter(pk=pk).exists():
+            raise NotFound("No Article matches the given query.")
 
-        return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response(data={'detail': 'You do not have permission to perform this action.'},
+                        status=status.HTTP_403_FORBIDDEN)
 
 
     def get_queryset(self) -> QuerySet[Article]:
@@ -271,6 +257,56 @@ class ArticlesView(viewsets.ModelViewSet):
         return Article.objects.filter(status="publish")
 
 
+@extend_schema_view(
+    get=extend_schema(
+        summary="List Topics",
+        request=None,
+        responses={
+            200: TopicSerializer(many=True)
+        }
+    )
+)
+class TopicListView(APIView):
+    permission_classes: tuple[Type[AllowAny]] = AllowAny,
+    authentication_classes: tuple[Type[CustomJWTAuthentication]] = CustomJWTAuthentication,
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> Response:
+        return Response(data=TopicCatalogue.get_active(), status=status.HTTP_200_OK)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Topic Details",
+        request=None,
+        responses={
+            200: TopicDetailSerializer,
+            404: "Hech qanday mavzu berilgan soʻrovga mos kelmaydi."
+        }
+    )
+)
+class TopicDetailView(APIView):
+    permission_classes: tuple[Type[AllowAny]] = AllowAny,
+    authentication_classes: tuple[Type[CustomJWTAuthentication]] = CustomJWTAuthentication,
+
+    def get(self, request: HttpRequest, pk: int, *args, **kwargs) -> Response:
+        topic: dict[str, Any] | None = TopicCatalogue.get(pk)
+        stats: dict[str, int] | None = TopicStatsService.get_stats(pk) if topic and topic["is_active"] else None
+
+        if stats is None:
+            return Response(
+                data={"detail": "Hech qanday mavzu berilgan soʻrovga mos kelmaydi."},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        serializer: ArticleListValuesSerializer = ArticleListValuesSerializer(context={"request": request})
+        trending: QuerySet[dict[str, Any]] = serializer.get_values_queryset(TrendingService.filter_trending(
+            Article.objects.filter(status="publish", topics=pk), settings.TOPIC_TRENDING_LIMIT, topic_id=pk
+        ))[:settings.TOPIC_TRENDING_LIMIT]
+
+        return Response(data={**topic, **stats, "trending_articles": serializer.serialize(trending)},
+                        status=status.HTTP_200_OK)
+
+
 @extend_schema_view(
     post=extend_schema(
         summary="Topic Follow",
@@ -295,7 +331,7 @@ class TopicFollowView(APIView):
     authentication_classes: tuple[Type[CustomJWTAuthentication]] = CustomJWTAuthentication,
 
     def post(self, request: HttpRequest, pk: int, *args, **kwargs):
-        topic: Topic | None = Topic.objects.filter(pk=pk).first()
+        topic: dict[str, Any] | None = TopicCatalogue.get(pk)
 
         if topic is None:
             return Response(
@@ -305,21 +341,21 @@ class TopicFollowView(APIView):
 
         user: CustomUser = request.user
 
-        if TopicFollow.objects.filter(user=user, topic=topic).exists():
+        if TopicFollow.objects.filter(user=user, topic_id=pk).exists():
             return Response(
-                data={"detail": f"Siz allaqachon '{topic.name}' mavzusini kuzatyapsiz."},
+                data={"detail": f"Siz allaqachon '{topic['name']}' mavzusini kuzatyapsiz."},
                 status=status.HTTP_200_OK
             )
 
-        TopicFollow.objects.create(user=user, topic=topic)
+        TopicFollow.objects.create(user=user, topic_id=pk)
 
         return Response(
-            data={"detail": f"Siz '{topic.name}' mavzusini kuzatyapsiz."},
+            data={"detail": f"Siz '{topic['name']}' mavzusini kuzatyapsiz."},
             status=status.HTTP_201_CREATED
         )
 
     def delete(self, request: HttpRequest, pk: int, *args, **kwargs):
-        topic: Topic | None = Topic.objects.filter(pk=pk).first()
+        topic: dict[str, Any] | None = TopicCatalogue.get(pk)
 
         if topic is None:
             return Response(
@@ -329,11 +365,11 @@ class TopicFollowView(APIView):
 
         user: CustomUser = request.user
 
-        follow: TopicFollow = TopicFollow.objects.filter(user=user, topic=topic).first()
+        follow: TopicFollow = TopicFollow.objects.filter(user=user, topic_id=pk).first()
 
         if not follow:
             return Response(
-                data={"detail": f"Siz '{topic.name}' mavzusini kuzatmaysiz."},
+                data={"detail": f"Siz '{topic['name']}' mavzusini kuzatmaysiz."},
                 status=status.HTTP_404_NOT_FOUND
             )
 
@@ -374,6 +410,7 @@ class CreateCommentsView(APIView):
 
         if serializer.is_valid():
             comment: Comment = serializer.save()
+            TrendingService.record("comment", {article.id: 1})
 
             comment_data: ArticleDetailCommentsSerializer = ArticleDetailCommentsSerializer(instance=comment)
 
@@ -458,6 +495,9 @@ class ArticleDetailCommentsView(ListAPIView):
     def list(self, request, *args, **kwargs):
         queryset: QuerySet[Comment] = self.filter_queryset(self.get_queryset())
 
+        if settings.FAST_SERIALIZATION:
+            return self.list_values(queryset)
+
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer: ArticleDetailCommentsSerializer = self.get_serializer(page, many=True)
@@ -486,6 +526,37 @@ class ArticleDetailCommentsView(ListAPIView):
         }
         return Response(data)
 
+    def list_values(self, queryset: QuerySet[Comment]) -> Response:
+        serializer: ArticleDetailCommentsValuesSerializer = ArticleDetailCommentsValuesSerializer(
+            context=self.get_serializer_context())
+        values: QuerySet[dict[str, Any]] = serializer.get_values_queryset(queryset)
+
+        page: list[dict[str, Any]] | None = self.paginate_queryset(values)
+        if page is not None:
+            paginated_data: dict = self.get_paginated_response(serializer.serialize(page)).data
+
+            data: dict = {
+                "count": paginated_data["count"],
+                "next": paginated_data["next"],
+                "previous": paginated_data["previous"],
+                "results": [
+                    {
+                        "comments": paginated_data["results"]
+                    }
+                ]
+            }
+
+            return Response(data)
+
+        data: dict = {
+            "results": [
+                {
+                    "comments": serializer.serialize(values)
+                }
+            ]
+        }
+        return Response(data)
+
 
 class FavoriteArticleView(APIView):
     queryset: QuerySet[Favorite] = Favorite.objects.all()
@@ -536,53 +607,73 @@ class FavoriteArticleView(APIView):
         }, status=status.HTTP_404_NOT_FOUND)
 
 
+@extend_schema_view(
+    post=extend_schema(
+        summary="Clap Article",
+        request=ClapCountSerializer,
+        responses={
+            201: OpenApiResponse(description="Claps applied",
+                                 examples=[OpenApiExample(name="Clap", value={"user": 1, "article": 1, "count": 5})]),
+            202: OpenApiResponse(description="Claps queued while CLAP_COALESCE is enabled",
+                                 examples=[OpenApiExample(name="Queued", value={"user": 1, "article": 1, "pending": 3})]),
+            400: bad_request_response,
+            401: unauthorized_response,
+            404: no_article_matches_response
+        }
+    )
+)
 class ClapView(APIView):
-    serializer_class: Type[ClapSerializer] = ClapSerializer
+    serializer_class: Type[ClapCountSerializer] = ClapCountSerializer
     permission_classes: tuple[Type[IsAuthenticated]] = IsAuthenticated,
     authentication_classes: tuple[Type[CustomJWTAuthentication]] = CustomJWTAuthentication,
+    throttle_scope: str = "clap"
 
     def post(self, request: HttpRequest, pk: int, *args, **kwargs) -> Response:
-        user: CustomUser = request.user
-
-        article: Article = get_object_or_404(self.get_articles_queryset(), pk=pk)
+        serializer: ClapCountSerializer = ClapCountSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
-        clap: Clap = Clap.objects.get_or_create(user=user, article=article)[0]
-
-        if clap.count >= 50:
-            serializer: ClapSerializer = ClapSerializer(instance=clap, partial=True)
-
-            return Response(data=serializer.data,
-                            status=status.HTTP_201_CREATED)
+        user: CustomUser = request.user
+        count: int = serializer.validated_data["count"]
 
-        clap.count += 1
+        if settings.CLAP_COALESCE:
+            get_object_or_404(self.get_articles_queryset().only("id"), pk=pk)
+            TrendingService.record("clap", {pk: count})
 
-        serializer: ClapSerializer = ClapSerializer(instance=clap, data={'count': clap.count}, partial=True)
+            return Response(data={
+                "user": user.id,
+                "article": pk,
+                "pending": ClapService.enqueue(user.id, pk, count)
+            }, status=status.HTTP_202_ACCEPTED)
 
-        if serializer.is_valid():
-            serializer.save()
+        total: int | None = ClapService.clap(user.id, pk, count)
 
-            data: dict[str, Any] = {
-                'user': UserSerializer(user).data,
-                'article': article.pk,
-                'count': serializer.data['count']
-            }
+        if total is None:
+            raise NotFound("No Article matches the given query.")
 
-            return Response(data=data, status=status.HTTP_201_CREATED)
+        TrendingService.record("clap", {pk: count})
 
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data={
+            "user": user.id,
+            "article": pk,
+            "count": total
+        }, status=status.HTTP_201_CREATED)
 
     def delete(self, request: HttpRequest, pk: int, *args, **kwargs) -> Response:
         user: CustomUser = request.user
 
-        article: Article = get_object_or_404(self.get_articles_queryset(), pk=pk)
-
-        clap: Clap = Clap.objects.filter(article=article, user=user).first()
+        if settings.CLAP_COALESCE:
+            ClapService.discard(user.id, pk)
 
-        if clap is not None:
-            clap.delete()
+        deleted: int = Clap.objects.filter(article__in=self.get_articles_queryset(), article_id=pk,
+                                           user=user).delete()[0]
 
+        if deleted:
             return Response(status=status.HTTP_204_NO_CONTENT)
 
+        # a missing or unpublished article is told apart from a missing clap only once nothing was deleted
+        if not self.get_articles_queryset().filter(pk=pk).exists():
+            raise NotFound("No Article matches the given query.")
+
         return Response(data={"detail": "Clap Not found."}, status=status.HTTP_404_NOT_FOUND)
 
     def get_articles_queryset(self) -> QuerySet[Article]:
@@ -592,27 +683,24 @@ class ClapView(APIView):
 class ReportArticleView(APIView):
     permission_classes: tuple[Type[IsAuthenticated]] = IsAuthenticated,
     authentication_classes: tuple[Type[CustomJWTAuthentication]] = CustomJWTAuthentication,
+    throttle_scope: str = "report"
 
     def get_queryset(self) -> Response:
         return Article.objects.filter(status="publish")
 
     def post(self, request: HttpRequest, pk: int, *args, **kwargs) -> Response:
-        article = get_object_or_404(klass=self.get_queryset(), pk=pk)
+        article_status: str | None = ArticleLifecycleService.report(request.user.id, pk)
 
-        user: CustomUser = request.user
+        if article_status is None:
+            if not self.get_queryset().filter(pk=pk).exists():
+                raise NotFound("No Article matches the given query.")
 
-        if Report.objects.filter(article=article, user=user).exists():
             return Response(data=[
                 "Ushbu maqola allaqachon shikoyat qilingan."
             ],
                 status=status.HTTP_400_BAD_REQUEST)
 
-        Report.objects.create(article=article, user=user)
-
-        if Report.objects.filter(article=article).count() > 3:
-            article.status = "trash"
-            article.save()
-
+        if article_status == "trash":
             return Response(data={"detail": "Maqola bir nechta shikoyatlar tufayli olib tashlandi."},
                             status=status.HTTP_200_OK)
 
@@ -0,0 +1,60 @@
+import json
+from typing import Any, Type
+
+from django.conf import settings
+from django.contrib.admin import ModelAdmin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Admin changelist paginator that stops counting at ``ADMIN_COUNT_LIMIT`` rows.
+
+    Up to the limit the count is exact; past it PostgreSQL's own estimate is used: ``pg_class.reltuples`` for
+    the whole table, the planner's row estimate for a filtered or searched list. Other databases count in full.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        queryset: QuerySet = self.object_list.order_by()
+        limit: int = settings.ADMIN_COUNT_LIMIT
+
+        # SELECT COUNT(*) FROM (... LIMIT limit + 1) reads at most limit + 1 rows
+        count: int = queryset[:limit + 1].count()
+        if count <= limit:
+            return count
+
+        estimate: int | None = self.estimate(queryset)
+        return super().count if estimate is None else max(estimate, count)
+
+    @staticmethod
+    def estimate(queryset: QuerySet) -> int | None:
+        connection: Any = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+
+        if not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+                               [queryset.model._meta.db_table])
+                row: tuple[int] | None = cursor.fetchone()
+            # -1 until the table is first analyzed
+            if row is not None and row[0] >= 0:
+                return row[0]
+
+        plan: list[dict[str, Any]] = json.loads(queryset.explain(format="json"))
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class LargeTableAdminMixin:
+    """ Changelists that never run a full ``COUNT(*)``: one bounded count, estimated past ``ADMIN_COUNT_LIMIT``. """
+
+    paginator: Type[Paginator] = EstimatedCountPaginator
+    show_full_result_count: bool = False
+
+
+class LargeTableAdmin(LargeTableAdminMixin, ModelAdmin):
+    pass
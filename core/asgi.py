@@ -1,7 +1,16 @@
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
+from core.db.connections import check_asgi_connections
+
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+# requests never reuse a thread's persistent connection here: PostgreSQL borrows from the pool, any other
+# database closes its connection at the end of the request
+os.environ.setdefault("DB_POOL", "True")
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
 
 application = get_asgi_application()
+
+check_asgi_connections(settings.DATABASES)
@@ -0,0 +1,34 @@
+import hashlib
+import math
+from typing import Iterator
+
+
+class BloomFilter:
+    """
+    Fixed-size set of strings that answers "maybe present" or "definitely absent".
+
+    Holding up to ``capacity`` items it is wrong about ``error_rate`` of the absent ones and never about
+    present ones; at the defaults of ``TOKEN_DENYLIST_CAPACITY`` that is about 180 KiB.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        self.capacity: int = capacity
+        self.size: int = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count: int = max(1, round(self.size / capacity * math.log(2)))
+        self.bits: bytearray = bytearray((self.size + 7) // 8)
+        self.count: int = 0
+
+    def positions(self, item: str) -> Iterator[int]:
+        # double hashing: the two halves of one digest generate every bit position
+        digest: bytes = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first: int = int.from_bytes(digest[:8], "little")
+        step: int = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * step) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> None:
+        for position in self.positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self.positions(item))
@@ -0,0 +1,96 @@
+import threading
+
+import psycopg2.extras
+from django.conf import settings
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+from django.db.utils import OperationalError
+from django.utils.asyncio import async_unsafe
+from psycopg2 import extensions
+from psycopg2.pool import ThreadedConnectionPool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL backend that borrows connections from a process-wide pool instead of opening one per thread.
+
+    Under ASGI the sync part of every request runs on a fresh thread, so the thread-local connections kept by
+    ``CONN_MAX_AGE`` are never reused. Here ``close()`` hands the connection back to the pool, and a borrower
+    waits up to ``DB_POOL_TIMEOUT`` seconds for a free one when ``DB_POOL_MAX_SIZE`` are in use.
+    """
+
+    pools: dict[str, ThreadedConnectionPool] = {}
+    slots: dict[str, threading.BoundedSemaphore] = {}
+    pools_lock: threading.Lock = threading.Lock()
+
+    def get_pool(self, conn_params: dict) -> ThreadedConnectionPool:
+        with self.pools_lock:
+            if self.alias not in self.pools:
+                self.pools[self.alias] = ThreadedConnectionPool(settings.DB_POOL_MIN_SIZE, settings.DB_POOL_MAX_SIZE,
+                                                                **conn_params)
+                self.slots[self.alias] = threading.BoundedSemaphore(settings.DB_POOL_MAX_SIZE)
+
+        return self.pools[self.alias]
+
+    @async_unsafe
+    def get_new_connection(self, conn_params: dict):
+        pool: ThreadedConnectionPool = self.get_pool(conn_params)
+
+        if not self.slots[self.alias].acquire(timeout=settings.DB_POOL_TIMEOUT):
+            raise OperationalError(f"No free connection in the {self.alias} pool after {settings.DB_POOL_TIMEOUT}s")
+
+        try:
+            connection = pool.getconn()
+            # after a database restart every idle connection may be stale; once they are all discarded,
+            # getconn() opens a fresh one
+            for _ in range(settings.DB_POOL_MAX_SIZE):
+                if self.is_pooled_connection_usable(connection):
+                    break
+                pool.putconn(connection, close=True)
+                connection = pool.getconn()
+        except Exception:
+            self.slots[self.alias].release()
+            raise
+
+        # the stock backend's per-connection setup, repeated because a pooled connection may be reused
+        options: dict = self.settings_dict["OPTIONS"]
+        self.isolation_level = IsolationLevel(options.get("isolation_level", IsolationLevel.READ_COMMITTED))
+        if "isolation_level" in options:
+            connection.isolation_level = self.isolation_level
+        psycopg2.extras.register_default_jsonb(conn_or_curs=connection, loads=lambda x: x)
+
+        return connection
+
+    def is_pooled_connection_usable(self, connection) -> bool:
+        """
+        ``closed`` stays 0 for a socket the server, PgBouncer or a failover dropped, so with
+        ``CONN_HEALTH_CHECKS`` (a no-op for Django itself at ``CONN_MAX_AGE = 0``) a checkout also runs ``SELECT 1``.
+        """
+        if connection.closed:
+            return False
+
+        if not self.settings_dict["CONN_HEALTH_CHECKS"]:
+            return True
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            if connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except psycopg2.Error:
+            return False
+
+        return True
+
+    def _close(self) -> None:
+        if self.connection is None:
+            return
+
+        with self.wrap_database_errors:
+            try:
+                if not self.connection.closed and \
+                        self.connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                    self.connection.rollback()
+            finally:
+                self.pools[self.alias].putconn(self.connection, close=bool(self.connection.closed))
+                self.slots[self.alias].release()
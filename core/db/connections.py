@@ -0,0 +1,19 @@
+from typing import Any
+
+from django.core.exceptions import ImproperlyConfigured
+
+
+def check_asgi_connections(databases: dict[str, dict[str, Any]]) -> None:
+    """
+    Rejects persistent connections under ASGI.
+
+    The sync part of every ASGI request runs on a new thread, so a connection kept for ``CONN_MAX_AGE`` is
+    never reused and stays open until it ages out: with enough requests they exhaust ``max_connections``.
+    PostgreSQL connections are pooled instead (``DB_POOL``, which sets ``CONN_MAX_AGE`` to 0).
+    """
+    for alias, database in databases.items():
+        if database.get("CONN_MAX_AGE", 0) != 0:
+            raise ImproperlyConfigured(
+                f"DATABASES[{alias!r}]['CONN_MAX_AGE'] is {database['CONN_MAX_AGE']!r}; under ASGI set DB_POOL=True "
+                f"(PostgreSQL) or DB_CONN_MAX_AGE=0."
+            )
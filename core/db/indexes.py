@@ -0,0 +1,27 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models import Index
+from django.db.models.functions import Upper
+
+
+class UpperTrigramIndex(GinIndex):
+    """
+    pg_trgm GIN index on ``UPPER(field)``.
+
+    ``icontains`` / ``istartswith`` compile to ``UPPER(column::text) LIKE UPPER(%s)`` on PostgreSQL, which a
+    ``gin_trgm_ops`` index on the bare column cannot serve. Other databases (SQLite in the tests) get a plain
+    ``UPPER(field)`` index.
+    """
+
+    def __init__(self, field: str, *, name: str) -> None:
+        self.field: str = field
+        super().__init__(OpClass(Upper(field), name="gin_trgm_ops"), name=name)
+
+    def deconstruct(self) -> tuple[str, tuple, dict]:
+        path, _, kwargs = super().deconstruct()
+        return path, (self.field,), {"name": kwargs["name"]}
+
+    def create_sql(self, model, schema_editor, using: str = "", **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return Index(Upper(self.field), name=self.name).create_sql(model, schema_editor, using, **kwargs)
+
+        return super().create_sql(model, schema_editor, using, **kwargs)
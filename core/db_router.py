@@ -0,0 +1,181 @@
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+import redis
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.http import HttpRequest
+from django.utils.functional import SimpleLazyObject, empty
+from loguru import logger
+
+SAFE_METHODS: tuple[str, ...] = ("GET", "HEAD", "OPTIONS")
+
+
+class PrimaryPin:
+    """
+    Keeps a client on the primary for ``DB_REPLICA_PIN_SECONDS`` after it writes, so it reads its own writes.
+
+    Browsers are pinned by a cookie; API clients that drop cookies are pinned by a per-user Redis key.
+    """
+
+    COOKIE_NAME = "db_pin_primary"
+
+    @classmethod
+    def get_redis_conn(cls) -> redis.Redis:
+        return redis.Redis.from_url(settings.REDIS_URL)
+
+    @staticmethod
+    def key(user_id: int) -> str:
+        return f"db:pin_primary:user:{user_id}"
+
+    @classmethod
+    def is_user_pinned(cls, user_id: int) -> bool:
+        try:
+            return bool(cls.get_redis_conn().exists(cls.key(user_id)))
+        except redis.RedisError:
+            # without the pin we cannot prove the replica has the user's writes
+            return True
+
+    @classmethod
+    def pin(cls, request: HttpRequest, response) -> None:
+        seconds: int = settings.DB_REPLICA_PIN_SECONDS
+        response.set_cookie(cls.COOKIE_NAME, "1", max_age=seconds, httponly=True, samesite="Lax")
+
+        user = get_loaded_user(request)
+        if user is not None and user.is_authenticated:
+            try:
+                cls.get_redis_conn().set(cls.key(user.id), 1, ex=seconds)
+            except redis.RedisError as error:
+                logger.warning(f"Could not pin user {user.id} to the primary database | {error}")
+
+
+def get_loaded_user(request: HttpRequest):
+    """ The request user if authentication already ran; never triggers the lazy session lookup. """
+    user = request.__dict__.get("user")
+
+    if isinstance(user, SimpleLazyObject):
+        return None if user._wrapped is empty else user._wrapped
+
+    return user
+
+
+class RequestRouting:
+    """ Decides lazily, on the first read of a request, whether it may be served by a replica. """
+
+    def __init__(self, request: HttpRequest | None = None) -> None:
+        self.request: HttpRequest | None = request
+        self.user_pinned: dict[int, bool] = {}
+
+    def use_replica(self) -> bool:
+        if self.request is None:
+            return True
+
+        if self.request.method not in SAFE_METHODS or PrimaryPin.COOKIE_NAME in self.request.COOKIES:
+            return False
+
+        user = get_loaded_user(self.request)
+        if user is None or not user.is_authenticated:
+            return True
+
+        if user.id not in self.user_pinned:
+            self.user_pinned[user.id] = PrimaryPin.is_user_pinned(user.id)
+
+        return not self.user_pinned[user.id]
+
+
+routing_state: ContextVar[RequestRouting | None] = ContextVar("routing_state", default=None)
+
+
+@contextmanager
+def replica_reads() -> Iterator[None]:
+    """ Lets code outside a request (workers, commands) send its reads to the replicas. """
+    token = routing_state.set(RequestRouting())
+    try:
+        yield
+    finally:
+        routing_state.reset(token)
+
+
+class ReplicaMonitor:
+    """
+    Health and replication lag of every replica, refreshed at most every ``DB_REPLICA_HEALTH_CHECK_INTERVAL``
+    seconds per process. A replica that errors or lags more than ``DB_REPLICA_MAX_LAG`` seconds is skipped.
+    """
+
+    LAG_SQL: dict[str, str] = {
+        "postgresql": (
+            "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+        ),
+    }
+
+    checked_at: dict[str, float] = {}
+    healthy: dict[str, bool] = {}
+
+    @classmethod
+    def check(cls, alias: str) -> bool:
+        connection = connections[alias]
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(cls.LAG_SQL.get(connection.vendor, "SELECT 0"))
+                lag: float = float(cursor.fetchone()[0] or 0)
+        except DatabaseError as error:
+            logger.warning(f"Replica {alias} is unavailable | {error}")
+            connection.close()
+            return False
+
+        if lag > settings.DB_REPLICA_MAX_LAG:
+            logger.warning(f"Replica {alias} lags {lag:.1f}s behind the primary")
+            return False
+
+        return True
+
+    @classmethod
+    def healthy_replicas(cls) -> list[str]:
+        now: float = time.monotonic()
+
+        for alias in settings.DATABASE_REPLICAS:
+            if now - cls.checked_at.get(alias, float("-inf")) >= settings.DB_REPLICA_HEALTH_CHECK_INTERVAL:
+                cls.healthy[alias] = cls.check(alias)
+                cls.checked_at[alias] = now
+
+        return [alias for alias in settings.DATABASE_REPLICAS if cls.healthy[alias]]
+
+    @classmethod
+    def choose(cls) -> str | None:
+        replicas: list[str] = cls.healthy_replicas()
+        return random.choice(replicas) if replicas else None
+
+
+class ReplicaRouter:
+    """
+    Sends reads of safe-method requests (and of ``replica_reads()`` blocks) to a healthy replica; everything
+    else, including reads inside a transaction on the primary, goes to the primary.
+    """
+
+    def db_for_read(self, model, **hints) -> str:
+        state: RequestRouting | None = routing_state.get()
+
+        if (
+                state is None
+                or not settings.DATABASE_REPLICAS
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block
+                or not state.use_replica()
+        ):
+            return DEFAULT_DB_ALIAS
+
+        return ReplicaMonitor.choose() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # replicas are copies of the primary, so objects from any alias may be related
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, model_name: str | None = None, **hints) -> bool:
+        return db == DEFAULT_DB_ALIAS
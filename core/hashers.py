@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with the cost parameters from ``ARGON2_TIME_COST``, ``ARGON2_MEMORY_COST`` and ``ARGON2_PARALLELISM``.
+
+    ``must_update`` compares a stored hash with these values, so after retuning, every password is rehashed
+    on its owner's next successful login.
+    """
+
+    @property
+    def time_cost(self) -> int:
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self) -> int:
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self) -> int:
+        return settings.ARGON2_PARALLELISM
@@ -0,0 +1,85 @@
+import threading
+from time import perf_counter
+from typing import Any
+
+from django.core import signals
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+
+
+class Command(BaseCommand):
+    help = ("Simulates requests that run one query and compares a new connection per request (CONN_MAX_AGE=0) "
+            "with the configured connection settings, reporting connection setups and time per request.")
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--requests", type=int, default=200, help="Simulated requests per mode.")
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="Database alias to benchmark.")
+        parser.add_argument("--new-thread", action="store_true",
+                            help="Run every request on a fresh thread, like the sync views of an ASGI server.")
+
+    def handle(self, *args, **options) -> None:
+        alias: str = options["database"]
+        settings_dict: dict[str, Any] = connections[alias].settings_dict
+        configured_max_age: int | None = settings_dict["CONN_MAX_AGE"]
+
+        self.stdout.write(f"{connections[alias].vendor} {settings_dict['ENGINE']} | "
+                          f"{options['requests']} requests | new thread per request: {options['new_thread']}")
+
+        modes: dict[str, int | None] = {
+            "new connection per request": 0,
+            f"configured (CONN_MAX_AGE={configured_max_age})": configured_max_age,
+        }
+
+        try:
+            for name, max_age in modes.items():
+                settings_dict["CONN_MAX_AGE"] = max_age
+                connections[alias].close()
+
+                created, seconds = self.run_requests(alias, options["requests"], options["new_thread"])
+                self.stdout.write(f"{name}: {created} connection setups | "
+                                  f"{seconds * 1000 / options['requests']:.3f} ms/request")
+        finally:
+            settings_dict["CONN_MAX_AGE"] = configured_max_age
+            connections[alias].close()
+
+    def run_requests(self, alias: str, count: int, new_thread: bool) -> tuple[int, float]:
+        created: list[Any] = []
+
+        def on_connection_created(sender, connection, **kwargs) -> None:
+            if connection.alias == alias:
+                created.append(connection)
+
+        def request() -> None:
+            # request_started/request_finished run close_old_connections(), as they do around a real request
+            signals.request_started.send(sender=self.__class__)
+            try:
+                with connections[alias].cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+            finally:
+                signals.request_finished.send(sender=self.__class__)
+
+        def request_in_thread() -> None:
+            try:
+                request()
+            finally:
+                # the thread ends here, so whatever its persistent connection was is gone too
+                connections[alias].close()
+
+        connection_created.connect(on_connection_created, weak=False)
+        started: float = perf_counter()
+
+        try:
+            for _ in range(count):
+                if new_thread:
+                    thread: threading.Thread = threading.Thread(target=request_in_thread)
+                    thread.start()
+                    thread.join()
+                else:
+                    request()
+        finally:
+            seconds: float = perf_counter() - started
+            connection_created.disconnect(on_connection_created)
+
+        return len(created), seconds
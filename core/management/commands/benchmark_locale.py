@@ -0,0 +1,70 @@
+from itertools import cycle, islice
+from time import perf_counter
+from typing import Any, Callable
+
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpRequest, HttpResponse
+from django.middleware.locale import LocaleMiddleware
+from django.test import RequestFactory
+from django.utils import translation
+
+from core.middlewares import CustomLocaleMiddleware
+
+
+class Command(BaseCommand):
+    help = ("Runs requests with a mix of Accept-Language headers through Django's LocaleMiddleware and "
+            "CustomLocaleMiddleware and reports the time each adds per request.")
+
+    headers: tuple[str, ...] = (
+        "uz-UZ,uz;q=0.9,ru;q=0.8,en-US;q=0.7,en;q=0.6",
+        "ru-RU,ru;q=0.9,en-US;q=0.8,en;q=0.7",
+        "en-US,en;q=0.9",
+        "de-DE,de;q=0.9,en;q=0.5",
+        "fr;q=0.2, ru;q=0.8, *;q=0.1",
+        "",
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--requests", type=int, default=20_000, help="Requests per middleware.")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per middleware; the best one is reported.")
+
+    def handle(self, *args, **options) -> None:
+        factory: RequestFactory = RequestFactory()
+        requests: list[HttpRequest] = [
+            factory.get("/articles/", HTTP_ACCEPT_LANGUAGE=header) if header else factory.get("/articles/")
+            for header in islice(cycle(self.headers), options["requests"])
+        ]
+
+        def view(request: HttpRequest) -> HttpResponse:
+            return HttpResponse()
+
+        middlewares: dict[str, Callable[[HttpRequest], HttpResponse]] = {
+            "django LocaleMiddleware": LocaleMiddleware(view),
+            "CustomLocaleMiddleware": CustomLocaleMiddleware(view),
+        }
+
+        for request in requests[:len(self.headers)]:
+            languages: set[str] = {middleware(request)["Content-Language"] for middleware in middlewares.values()}
+            if len(languages) != 1:
+                raise CommandError(f"{request.META.get('HTTP_ACCEPT_LANGUAGE')!r} resolves to {languages}")
+
+        for name, middleware in middlewares.items():
+            def run() -> None:
+                for request in requests:
+                    middleware(request)
+
+            seconds: float = self.best_of(run, options["repeat"])
+            self.stdout.write(f"{name}: {seconds * 1_000_000 / len(requests):.2f} µs/request")
+
+        translation.deactivate()
+
+    @staticmethod
+    def best_of(func: Callable[[], Any], repeat: int) -> float:
+        timings: list[float] = []
+
+        for _ in range(repeat):
+            started: float = perf_counter()
+            func()
+            timings.append(perf_counter() - started)
+
+        return min(timings)
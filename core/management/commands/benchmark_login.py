@@ -0,0 +1,71 @@
+from time import perf_counter
+from typing import Any, Callable
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from users.models import CustomUser
+from users.serializers import LoginSerializer
+
+
+class Command(BaseCommand):
+    help = ("Times a login that checks the password in LoginSerializer and again in the view (the former flow) "
+            "against the single check, for every configured password hasher whose library is installed.")
+
+    username: str = "benchmark-login"
+    password: str = "benchmark-Pa55word"
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--logins", type=int, default=10, help="Logins per run.")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per flow; the best one is reported.")
+
+    def handle(self, *args, **options) -> None:
+        logins: int = options["logins"]
+        credentials: dict[str, str] = {"username": self.username, "password": self.password}
+
+        def authenticate_twice() -> None:
+            for _ in range(logins):
+                serializer: LoginSerializer = LoginSerializer(data=credentials)
+                serializer.is_valid(raise_exception=True)
+                authenticate(**credentials)
+
+        def authenticate_once() -> None:
+            for _ in range(logins):
+                LoginSerializer(data=credentials).is_valid(raise_exception=True)
+
+        for hasher_path in settings.PASSWORD_HASHERS:
+            hashers: list[str] = [hasher_path, *(path for path in settings.PASSWORD_HASHERS if path != hasher_path)]
+
+            with override_settings(PASSWORD_HASHERS=hashers), transaction.atomic():
+                algorithm: str = get_hasher().algorithm
+
+                try:
+                    user: CustomUser = CustomUser(username=self.username, email=f"{self.username}@example.com")
+                    user.set_password(self.password)
+                except ValueError as error:
+                    self.stdout.write(f"{algorithm}: skipped | {error}")
+                    continue
+
+                user.save()
+                twice_seconds: float = self.best_of(authenticate_twice, options["repeat"])
+                once_seconds: float = self.best_of(authenticate_once, options["repeat"])
+                transaction.set_rollback(True)
+
+            self.stdout.write(f"{algorithm}: authenticate twice {twice_seconds * 1000 / logins:.1f} ms/login | "
+                              f"once {once_seconds * 1000 / logins:.1f} ms/login | "
+                              f"x{twice_seconds / once_seconds:.2f}")
+
+    @staticmethod
+    def best_of(func: Callable[[], Any], repeat: int) -> float:
+        timings: list[float] = []
+
+        for _ in range(repeat):
+            started: float = perf_counter()
+            func()
+            timings.append(perf_counter() - started)
+
+        return min(timings)
@@ -0,0 +1,86 @@
+from time import perf_counter
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpRequest, HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import path
+from loguru import logger
+
+
+def view(request: HttpRequest) -> HttpResponse:
+    return HttpResponse()
+
+
+# requests are routed here (request.urlconf), so the timings are the middleware stack and nothing else
+urlpatterns: list = [
+    path("articles/benchmark/", view),
+    path("admin/benchmark/", view),
+]
+
+DJANGO_MIDDLEWARE: dict[str, str] = {
+    "core.middlewares.BrowserSessionMiddleware": "django.contrib.sessions.middleware.SessionMiddleware",
+    "core.middlewares.BrowserCsrfViewMiddleware": "django.middleware.csrf.CsrfViewMiddleware",
+    "core.middlewares.BrowserAuthenticationMiddleware": "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middlewares.BrowserMessageMiddleware": "django.contrib.messages.middleware.MessageMiddleware",
+}
+
+
+class Command(BaseCommand):
+    help = ("Times an API and an admin path through MIDDLEWARE and through the same stack with Django's "
+            "session, CSRF, auth and messages middleware for every path, and reports the time per request.")
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--requests", type=int, default=5_000, help="Requests per path and stack.")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per path and stack; the best one is reported.")
+
+    def handle(self, *args, **options) -> None:
+        stacks: dict[str, list[str]] = {
+            "every path": [DJANGO_MIDDLEWARE.get(middleware, middleware) for middleware in settings.MIDDLEWARE],
+            "path-aware": list(settings.MIDDLEWARE),
+        }
+        factory: RequestFactory = RequestFactory()
+
+        # the request log lines would dwarf the middleware being measured
+        logger.disable("core.middlewares")
+        try:
+            with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+                for url in ("/articles/benchmark/", "/admin/benchmark/"):
+                    self.benchmark(url, stacks, factory, options["requests"], options["repeat"])
+        finally:
+            logger.enable("core.middlewares")
+
+    def benchmark(self, url: str, stacks: dict[str, list[str]], factory: RequestFactory, count: int,
+                  repeat: int) -> None:
+        timings: dict[str, float] = {}
+
+        for name, middleware in stacks.items():
+            with override_settings(MIDDLEWARE=middleware):
+                handler: BaseHandler = BaseHandler()
+                handler.load_middleware()
+
+            def run() -> None:
+                for _ in range(count):
+                    request: HttpRequest = factory.get(url, HTTP_ACCEPT_LANGUAGE="uz")
+                    request.urlconf = __name__
+                    response: HttpResponse = handler.get_response(request)
+                    if response.status_code != 200:
+                        raise CommandError(f"{url} answered {response.status_code}")
+
+            timings[name] = self.best_of(run, repeat) * 1_000_000 / count
+
+        self.stdout.write(f"{url}: " + " | ".join(f"{name} {micros:.1f} µs/request"
+                                                   for name, micros in timings.items()))
+
+    @staticmethod
+    def best_of(func: Callable[[], Any], repeat: int) -> float:
+        timings: list[float] = []
+
+        for _ in range(repeat):
+            started: float = perf_counter()
+            func()
+            timings.append(perf_counter() - started)
+
+        return min(timings)
@@ -0,0 +1,51 @@
+from secrets import token_urlsafe
+from time import perf_counter
+from typing import Any, Callable
+
+from django.contrib.auth.hashers import make_password, check_password
+from django.core.management.base import BaseCommand
+from django.utils.crypto import constant_time_compare
+
+from users.services import OTPService
+
+
+class Command(BaseCommand):
+    help = ("Compares hashing and verifying an OTP with the default password hasher (the former OTP path) "
+            "and with OTPService's keyed HMAC-SHA256, reporting time per operation.")
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--operations", type=int, default=20, help="Hash + verify pairs per run.")
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per method; the best one is reported.")
+
+    def handle(self, *args, **options) -> None:
+        operations: int = options["operations"]
+        otp_code: str = "123456"
+        otp_secret: str = token_urlsafe()
+        value: str = f"{otp_secret}:{otp_code}"
+
+        def password_hasher() -> None:
+            for _ in range(operations):
+                check_password(value, make_password(value))
+
+        def hmac() -> None:
+            for _ in range(operations):
+                stored: str = OTPService.hash_otp(otp_secret, otp_code)
+                constant_time_compare(OTPService.hash_otp(otp_secret, otp_code), stored)
+
+        hasher_seconds: float = self.best_of(password_hasher, options["repeat"])
+        hmac_seconds: float = self.best_of(hmac, options["repeat"])
+
+        self.stdout.write(f"password hasher: {hasher_seconds * 1_000_000 / operations:,.1f} µs per hash + verify")
+        self.stdout.write(f"hmac-sha256: {hmac_seconds * 1_000_000 / operations:,.1f} µs per hash + verify | "
+                          f"x{hasher_seconds / hmac_seconds:,.0f}")
+
+    @staticmethod
+    def best_of(func: Callable[[], Any], repeat: int) -> float:
+        timings: list[float] = []
+
+        for _ in range(repeat):
+            started: float = perf_counter()
+            func()
+            timings.append(perf_counter() - started)
+
+        return min(timings)
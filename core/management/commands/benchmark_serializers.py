@@ -0,0 +1,79 @@
+import json
+from time import perf_counter
+from typing import Any, Callable, Type
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import QuerySet
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import Serializer
+
+from articles.models import Article, Comment
+from articles.serializers import ArticleListSerializer, ArticleDetailCommentsSerializer, \
+    ArticleListValuesSerializer, ArticleDetailCommentsValuesSerializer
+from core.renderers import ORJSONRenderer
+from core.serialization import ValuesSerializer
+from users.models import CustomUser, Notification
+from users.serializers import UserSerializer, NotificationSerializer, UserValuesSerializer, \
+    NotificationValuesSerializer
+
+
+class Command(BaseCommand):
+    help = "Compares DRF serializers with their .values() counterparts on existing rows and reports rows per second."
+
+    cases: dict[str, tuple[Callable[[], QuerySet], Type[Serializer], Type[ValuesSerializer]]] = {
+        "articles": (lambda: Article.objects.order_by("id"), ArticleListSerializer, ArticleListValuesSerializer),
+        "comments": (lambda: Comment.objects.order_by("id"), ArticleDetailCommentsSerializer,
+                     ArticleDetailCommentsValuesSerializer),
+        "users": (lambda: CustomUser.objects.order_by("id"), UserSerializer, UserValuesSerializer),
+        "notifications": (lambda: Notification.objects.order_by("id"), NotificationSerializer,
+                          NotificationValuesSerializer),
+    }
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--rows", type=int, default=500, help="Rows to serialize per run.")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per serializer; the best one is reported.")
+
+    def handle(self, *args, **options) -> None:
+        rows: int = options["rows"]
+        repeat: int = options["repeat"]
+
+        for name, (get_queryset, serializer_class, values_serializer_class) in self.cases.items():
+            queryset: QuerySet = get_queryset()[:rows]
+
+            def drf() -> bytes:
+                return JSONRenderer().render(serializer_class(list(queryset), many=True).data)
+
+            def fast() -> bytes:
+                values_serializer: ValuesSerializer = values_serializer_class()
+                return ORJSONRenderer().render(values_serializer.serialize(
+                    values_serializer.get_values_queryset(get_queryset())[:rows]))
+
+            drf_output: bytes = drf()
+            fast_output: bytes = fast()
+            count: int = len(json.loads(drf_output))
+
+            if json.loads(drf_output) != json.loads(fast_output):
+                raise CommandError(f"{name}: fast serializer output differs from {serializer_class.__name__}")
+
+            if not count:
+                self.stdout.write(f"{name}: no rows, skipped")
+                continue
+
+            drf_seconds: float = self.best_of(drf, repeat)
+            fast_seconds: float = self.best_of(fast, repeat)
+
+            self.stdout.write(
+                f"{name}: {count} rows | drf {count / drf_seconds:,.0f} rows/s | "
+                f"fast {count / fast_seconds:,.0f} rows/s | x{drf_seconds / fast_seconds:.1f}"
+            )
+
+    @staticmethod
+    def best_of(func: Callable[[], Any], repeat: int) -> float:
+        timings: list[float] = []
+
+        for _ in range(repeat):
+            started: float = perf_counter()
+            func()
+            timings.append(perf_counter() - started)
+
+        return min(timings)
@@ -0,0 +1,20 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.schema import OpenAPISchema
+
+
+class Command(BaseCommand):
+    help = ("Generates the OpenAPI schema for every language in LANGUAGES into OPENAPI_SCHEMA_ROOT, named after "
+            "CODE_VERSION, so /schema/ serves it without generating on request.")
+
+    def handle(self, *args, **options) -> None:
+        if not settings.CODE_VERSION:
+            self.stdout.write("CODE_VERSION is not set; each process generates the schema on its first request.")
+            return
+
+        for language, _ in settings.LANGUAGES:
+            path: Path | None = OpenAPISchema.write(language)
+            self.stdout.write(f"{language}: {path}")
@@ -0,0 +1,72 @@
+from typing import Any
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+
+class Command(BaseCommand):
+    help = ("Reports unused indexes and sequentially scanned tables from pg_stat_user_indexes / pg_stat_user_tables, "
+            "and indexes declared on models but missing from the database.")
+
+    unused_indexes_sql: str = """
+        SELECT s.relname, s.indexrelname, pg_relation_size(s.indexrelid)
+        FROM pg_stat_user_indexes s
+        JOIN pg_index i ON i.indexrelid = s.indexrelid
+        WHERE s.idx_scan = 0 AND NOT i.indisunique AND NOT i.indisprimary
+        ORDER BY pg_relation_size(s.indexrelid) DESC
+    """
+
+    seq_scanned_tables_sql: str = """
+        SELECT relname, seq_scan, seq_tup_read, COALESCE(idx_scan, 0), n_live_tup
+        FROM pg_stat_user_tables
+        WHERE n_live_tup >= %s AND seq_scan > COALESCE(idx_scan, 0)
+        ORDER BY seq_tup_read DESC
+    """
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--min-rows", type=int, default=10_000,
+                            help="Only report sequential scans on tables with at least this many live rows.")
+
+    def handle(self, *args, **options) -> None:
+        if connection.vendor != "postgresql":
+            raise CommandError("index_report reads PostgreSQL statistics views and needs a PostgreSQL database.")
+
+        with connection.cursor() as cursor:
+            cursor.execute(self.unused_indexes_sql)
+            unused: list[tuple[Any, ...]] = cursor.fetchall()
+
+            cursor.execute(self.seq_scanned_tables_sql, [options["min_rows"]])
+            seq_scanned: list[tuple[Any, ...]] = cursor.fetchall()
+
+            missing: list[tuple[str, str]] = self.get_undeployed_indexes(cursor)
+
+        self.stdout.write("Unused indexes (idx_scan = 0 since the last stats reset):")
+        for table, index, size in unused:
+            self.stdout.write(f"  {table}.{index} | {size / 1024:,.0f} KiB")
+
+        self.stdout.write("Tables read mostly by sequential scans (candidates for a missing index):")
+        for table, seq_scan, seq_tup_read, idx_scan, live_rows in seq_scanned:
+            self.stdout.write(f"  {table} | seq_scan {seq_scan} | seq_tup_read {seq_tup_read} | "
+                              f"idx_scan {idx_scan} | rows {live_rows}")
+
+        self.stdout.write("Indexes declared on models but missing from the database:")
+        for table, index in missing:
+            self.stdout.write(f"  {table}.{index}")
+
+    @staticmethod
+    def get_undeployed_indexes(cursor) -> list[tuple[str, str]]:
+        missing: list[tuple[str, str]] = []
+
+        for model in apps.get_models():
+            if not model._meta.managed or model._meta.proxy:
+                continue
+
+            table: str = model._meta.db_table
+            existing: dict[str, Any] = connection.introspection.get_constraints(cursor, table)
+
+            for index in model._meta.indexes:
+                if index.name not in existing:
+                    missing.append((table, index.name))
+
+        return missing
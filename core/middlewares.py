@@ -1,20 +1,87 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.core.exceptions import MiddlewareNotUsed
 from django.utils import translation
+from django.middleware.csrf import CsrfViewMiddleware
+from django.utils.cache import patch_vary_headers
 from loguru import logger
 
+from core.db_router import RequestRouting, PrimaryPin, routing_state, SAFE_METHODS
+
 
 class CustomLocaleMiddleware:
+    """
+    Activates the request language and replaces Django's ``LocaleMiddleware``.
+
+    The language comes from the language cookie, then from the ``Accept-Language`` ranges in order of
+    quality, and is always one of ``LANGUAGES`` (``LANGUAGE_CODE`` when nothing matches). Clients send few
+    distinct headers, so each header's resolution is remembered in an LRU of ``LOCALE_CACHE_SIZE`` entries.
+    """
+
+    HEADER_MAX_LENGTH: int = 500
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.resolve_header = lru_cache(maxsize=settings.LOCALE_CACHE_SIZE)(self.resolve_accept_language)
+
+    @staticmethod
+    def parse_accept_language(header: str) -> list[str]:
+        """ Language ranges of an ``Accept-Language`` header by descending quality; ``q=0`` ones are dropped. """
+        ranges: list[tuple[float, int, str]] = []
+
+        for position, item in enumerate(header.split(",")):
+            language, _, parameters = item.partition(";")
+            language = language.strip().lower()
+            quality: float = 1.0
+
+            name, _, value = parameters.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    continue
+
+            if language and 0 < quality <= 1:
+                ranges.append((-quality, position, language))
+
+        return [language for _, _, language in sorted(ranges)]
+
+    @classmethod
+    def resolve_accept_language(cls, header: str) -> str:
+        for language in cls.parse_accept_language(header):
+            if language == "*":
+                break
+            try:
+                return translation.get_supported_language_variant(language)
+            except LookupError:
+                continue
+
+        return settings.LANGUAGE_CODE
+
+    def get_language(self, request) -> str:
+        cookie: str | None = request.COOKIES.get(settings.LANGUAGE_COOKIE_NAME)
+        if cookie:
+            try:
+                return translation.get_supported_language_variant(cookie)
+            except LookupError:
+                pass
+
+        # a long header is cut, which also bounds the memory held by the cache keys
+        header: str = request.META.get("HTTP_ACCEPT_LANGUAGE", "")[:self.HEADER_MAX_LENGTH]
+        return self.resolve_header(header) if header else settings.LANGUAGE_CODE
 
     def __call__(self, request):
-        language = request.META.get('HTTP_ACCEPT_LANGUAGE')
-        if language:
-            logger.info(f"Accepted languages: {language}")
-            language = language.split(',')[0]
-            translation.activate(language)
-            request.LANGUAGE_CODE = translation.get_language()
-            logger.info(f"Language activated: {language}")
+        translation.activate(self.get_language(request))
+        request.LANGUAGE_CODE = translation.get_language()
+
         response = self.get_response(request)
+
+        patch_vary_headers(response, ("Accept-Language",))
+        response.headers.setdefault("Content-Language", request.LANGUAGE_CODE)
         translation.deactivate()
         return response
 
@@ -34,10 +101,74 @@ class LogRequestMiddleware:
 
         return response
 
-    def get_client_ip(self, request):
+    @staticmethod
+    def get_client_ip(request):
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
         if x_forwarded_for:
             ip = x_forwarded_for.split(',')[0]
         else:
             ip = request.META.get('REMOTE_ADDR')
         return ip
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets ``core.db_router.ReplicaRouter`` send the reads of safe-method requests to replicas and pins
+    clients to the primary for a short while after a successful write.
+    """
+
+    def __init__(self, get_response):
+        if not settings.DATABASE_REPLICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = routing_state.set(RequestRouting(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            routing_state.reset(token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            PrimaryPin.pin(request, response)
+
+        return response
+
+
+
+class SkipForAPIMixin:
+    """
+    Skips the wrapped Django middleware for requests under ``API_PATH_PREFIXES``.
+
+    The API authenticates every request with a JWT (``CustomJWTAuthentication``) and its views are CSRF
+    exempt, so sessions, messages, the session-based user and CSRF checks only matter for the admin and
+    the browsable pages. Subclassing the Django classes keeps the admin's middleware system checks happy.
+    """
+
+    @staticmethod
+    def is_api_request(request) -> bool:
+        return request.path_info.startswith(settings.API_PATH_PREFIXES)
+
+    def __call__(self, request):
+        if self.is_api_request(request):
+            return self.get_response(request)
+        return super().__call__(request)
+
+
+class BrowserSessionMiddleware(SkipForAPIMixin, SessionMiddleware):
+    pass
+
+
+class BrowserAuthenticationMiddleware(SkipForAPIMixin, AuthenticationMiddleware):
+    pass
+
+
+class BrowserMessageMiddleware(SkipForAPIMixin, MessageMiddleware):
+    pass
+
+
+class BrowserCsrfViewMiddleware(SkipForAPIMixin, CsrfViewMiddleware):
+    def process_view(self, request, callback, callback_args, callback_kwargs):
+        if self.is_api_request(request):
+            return None
+        return super().process_view(request, callback, callback_args, callback_kwargs)
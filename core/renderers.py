@@ -0,0 +1,29 @@
+from typing import Any
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson when it is installed.
+
+    Types orjson does not know (lazy translations, decimals, datetimes) are handed to DRF's encoder so
+    the bytes match ``JSONRenderer``. Indented output and a missing orjson fall back to the stock renderer.
+    """
+
+    options: int = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson is not None else 0
+
+    def render(self, data: Any, accepted_media_type: str | None = None,
+               renderer_context: dict[str, Any] | None = None) -> bytes:
+        if data is None:
+            return b''
+
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return orjson.dumps(data, default=self.encoder_class().default, option=self.options)
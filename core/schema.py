@@ -0,0 +1,145 @@
+import hashlib
+import json
+from pathlib import Path
+from threading import Lock
+from typing import Any, Type
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+from loguru import logger
+from rest_framework.renderers import BaseRenderer
+from rest_framework.request import Request
+
+
+class OpenAPISchema:
+    """
+    The OpenAPI document, generated once per language and code version.
+
+    Generation walks every view and the response examples, so the result is written to
+    ``OPENAPI_SCHEMA_ROOT/schema-<CODE_VERSION>-<language>.json`` and kept in memory with each rendered
+    format. Without ``CODE_VERSION`` nothing is written and every process generates its own on first use.
+    """
+
+    schemas: dict[str, dict[str, Any]] = {}
+    documents: dict[tuple[str, str], tuple[bytes, str]] = {}
+    lock: Lock = Lock()
+
+    @classmethod
+    def path(cls, language: str) -> Path | None:
+        if not settings.CODE_VERSION:
+            return None
+
+        return Path(settings.OPENAPI_SCHEMA_ROOT) / f"schema-{settings.CODE_VERSION}-{language}.json"
+
+    @classmethod
+    def generate(cls, language: str) -> bytes:
+        generator_class: Type[SchemaGenerator] = spectacular_settings.DEFAULT_GENERATOR_CLASS
+
+        with translation.override(language):
+            schema: dict[str, Any] = generator_class().get_schema(request=None, public=True)
+            return OpenApiJsonRenderer().render(schema, OpenApiJsonRenderer.media_type)
+
+    @classmethod
+    def save(cls, path: Path, content: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # written aside and renamed, so a process starting meanwhile never reads half a file
+        partial: Path = path.with_suffix(".partial")
+        partial.write_bytes(content)
+        partial.replace(path)
+
+    @classmethod
+    def write(cls, language: str) -> Path | None:
+        path: Path | None = cls.path(language)
+        content: bytes = cls.generate(language)
+
+        if path is not None:
+            cls.save(path, content)
+
+        with cls.lock:
+            cls.schemas[language] = json.loads(content)
+
+        return path
+
+    @classmethod
+    def get_schema(cls, language: str) -> dict[str, Any]:
+        schema: dict[str, Any] | None = cls.schemas.get(language)
+        if schema is not None:
+            return schema
+
+        with cls.lock:
+            # another thread may have loaded it while this one waited
+            if language in cls.schemas:
+                return cls.schemas[language]
+
+            path: Path | None = cls.path(language)
+            if path is not None and path.is_file():
+                content: bytes = path.read_bytes()
+            else:
+                content = cls.generate(language)
+                if path is not None:
+                    try:
+                        cls.save(path, content)
+                    except OSError as error:
+                        # read-only deployments keep the schema in memory only
+                        logger.warning(f"OpenAPI schema not written to {path}: {error}")
+
+            cls.schemas[language] = json.loads(content)
+            return cls.schemas[language]
+
+    @classmethod
+    def get_document(cls, renderer: BaseRenderer, language: str) -> tuple[bytes, str]:
+        # keyed by the renderer's own media type, so Accept parameters cannot grow the cache
+        key: tuple[str, str] = (language, renderer.media_type)
+        document: tuple[bytes, str] | None = cls.documents.get(key)
+
+        if document is None:
+            content: bytes = renderer.render(cls.get_schema(language), renderer.media_type, {})
+            etag: str = f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+            document = cls.documents.setdefault(key, (content, etag))
+
+        return document
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls.lock:
+            cls.schemas.clear()
+            cls.documents.clear()
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """
+    ``SpectacularAPIView`` answering from ``OpenAPISchema`` with an ETag instead of generating per request.
+
+    The schema is the public one for the active language (or a supported ``?lang=``); ``?version=`` is not
+    honoured since the API is not versioned.
+    """
+
+    def get(self, request: Request, *args, **kwargs) -> HttpResponse:
+        language: str = translation.get_language() or settings.LANGUAGE_CODE
+        if request.GET.get('lang'):
+            try:
+                language = translation.get_supported_language_variant(request.GET['lang'])
+            except LookupError:
+                pass
+
+        renderer: BaseRenderer = request.accepted_renderer
+        content, etag = OpenAPISchema.get_document(renderer, language)
+
+        response: HttpResponse | None = get_conditional_response(request, etag=etag)
+        if response is None:
+            content_type: str = renderer.media_type
+            if renderer.charset:
+                content_type += f"; charset={renderer.charset}"
+
+            response = HttpResponse(content, content_type=content_type)
+            response["Content-Disposition"] = f'inline; filename="{self._get_filename(request, None)}"'
+
+        response["ETag"] = etag
+        patch_vary_headers(response, ("Accept",))
+        return response
@@ -0,0 +1,103 @@
+from datetime import datetime
+from typing import Any, Callable, Iterable, Type
+
+from django.conf import settings
+from django.db.models import QuerySet, FileField
+from django.http import HttpRequest
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+
+def format_datetime(value: datetime | None) -> str | None:
+    """ Mirrors ``serializers.DateTimeField`` output for the configured ``DATETIME_FORMAT``. """
+    if value is None:
+        return None
+
+    if settings.USE_TZ and timezone.is_aware(value):
+        value = value.astimezone(timezone.get_current_timezone())
+
+    return value.strftime(settings.REST_FRAMEWORK['DATETIME_FORMAT'])
+
+
+def file_url_extractor(field: FileField, request: HttpRequest | None) -> Callable[[str | None], str | None]:
+    """ Mirrors ``serializers.FileField`` output for a stored file name. """
+    storage = field.storage
+
+    def extract(name: str | None) -> str | None:
+        if not name:
+            return None
+
+        url: str = storage.url(name)
+
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+    return extract
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer over ``.values()`` rows.
+
+    Subclasses declare the columns to fetch and build a list of ``(name, extractor)`` pairs once per
+    serializer instance, so rendering a row is a flat loop of plain function calls instead of DRF's
+    per-field dispatch over model instances. Related data is fetched in batches by ``serialize``.
+    """
+
+    value_fields: tuple[str, ...] = ()
+
+    def __init__(self, context: dict[str, Any] | None = None) -> None:
+        self.context: dict[str, Any] = context or {}
+        self.request: Request | None = self.context.get('request')
+        self.extractors: list[tuple[str, Callable[[dict[str, Any]], Any]]] = self.get_extractors()
+
+    def get_extractors(self) -> list[tuple[str, Callable[[dict[str, Any]], Any]]]:
+        raise NotImplementedError
+
+    def get_values_queryset(self, queryset: QuerySet) -> QuerySet[dict[str, Any]]:
+        return queryset.values(*self.value_fields)
+
+    def prepare(self, rows: list[dict[str, Any]]) -> None:
+        """ Hook for batch-loading related data needed by the extractors. """
+
+    def to_representation(self, row: dict[str, Any]) -> dict[str, Any]:
+        return {name: extract(row) for name, extract in self.extractors}
+
+    def serialize(self, rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        rows: list[dict[str, Any]] = list(rows)
+        self.prepare(rows)
+        return [self.to_representation(row) for row in rows]
+
+
+class ValuesListModelMixin:
+    """
+    ``list`` implementation that uses ``values_serializer_class`` when ``FAST_SERIALIZATION`` is enabled,
+    and the regular DRF serializer otherwise.
+    """
+
+    values_serializer_class: Type[ValuesSerializer] | None = None
+
+    def use_values_serializer(self, queryset: QuerySet | None) -> bool:
+        return (
+                settings.FAST_SERIALIZATION
+                and self.values_serializer_class is not None
+                and isinstance(queryset, QuerySet)
+                and not queryset.query.is_sliced
+        )
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        queryset: QuerySet = self.filter_queryset(self.get_queryset())
+
+        if not self.use_values_serializer(queryset):
+            return super().list(request, *args, **kwargs)
+
+        serializer: ValuesSerializer = self.values_serializer_class(context=self.get_serializer_context())
+        values: QuerySet[dict[str, Any]] = serializer.get_values_queryset(queryset)
+
+        page: list[dict[str, Any]] | None = self.paginate_queryset(values)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+
+        return Response(serializer.serialize(values))
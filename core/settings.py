@@ -1,8 +1,9 @@
 import os
+from importlib.util import find_spec
 from datetime import timedelta, datetime
 from pathlib import Path
 
-from decouple import config
+from decouple import config, Csv
 from django.utils.translation import gettext_lazy as _
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -37,6 +38,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 EXTERNAL_APPS = [
@@ -64,6 +66,7 @@ CKEDITOR_CONFIGS = {
 }
 
 LOCAL_APPS = [
+    'core',
     'users',
     'articles'
 ]
@@ -72,18 +75,22 @@ INSTALLED_APPS = DJANGO_APPS + EXTERNAL_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    # static files are answered here, before any app middleware runs
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    "core.middlewares.ReplicaRoutingMiddleware",
+    # the Browser* middlewares are Django's, skipped for the JWT-only API_PATH_PREFIXES
+    "core.middlewares.BrowserSessionMiddleware",
+    # replaces django.middleware.locale.LocaleMiddleware, so it sits where that one would
+    'core.middlewares.CustomLocaleMiddleware',
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "core.middlewares.BrowserCsrfViewMiddleware",
+    "core.middlewares.BrowserAuthenticationMiddleware",
+    "core.middlewares.BrowserMessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    'core.middlewares.CustomLocaleMiddleware',
-    'django.middleware.locale.LocaleMiddleware',
     'core.middlewares.LogRequestMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware'
 ]
 
+API_PATH_PREFIXES = config('API_PATH_PREFIXES', default='/articles/,/users/', cast=Csv(post_process=tuple))
 
 ROOT_URLCONF = "core.urls"
 
@@ -134,6 +141,22 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing: "argon2" (needs argon2-cffi) or "pbkdf2". Hashes made by the other hasher, or with other
+# Argon2 costs, keep verifying and are rehashed on the user's next successful login.
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='argon2' if find_spec('argon2') else 'pbkdf2')
+ARGON2_TIME_COST = config('ARGON2_TIME_COST', default=2, cast=int)
+ARGON2_MEMORY_COST = config('ARGON2_MEMORY_COST', default=19 * 1024, cast=int)  # KiB
+ARGON2_PARALLELISM = config('ARGON2_PARALLELISM', default=1, cast=int)
+
+PASSWORD_HASHERS = [
+    'core.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+if PASSWORD_HASHER == 'pbkdf2':
+    PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop(1))
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
 
@@ -159,6 +182,9 @@ LOCALE_PATHS = [
     os.path.join(BASE_DIR, 'locale/'),
 ]
 
+# distinct Accept-Language headers whose resolved language each process remembers
+LOCALE_CACHE_SIZE = config('LOCALE_CACHE_SIZE', default=256, cast=int)
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/5.0/howto/static-files/
 
@@ -168,6 +194,14 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 
 STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
+# collectstatic writes .gz and, with Brotli installed, .br copies next to each file; hashed names are served
+# with an immutable, year-long Cache-Control, everything else (CKEditor loads its files unhashed) for:
+WHITENOISE_MAX_AGE = config('WHITENOISE_MAX_AGE', default=24 * 60 * 60, cast=int)
+# serve STATIC_URL from core.wsgi before Django (the serverless deployment); the middleware serves it otherwise
+STATIC_WSGI_BYPASS = config('STATIC_WSGI_BYPASS', default=False, cast=bool)
+# the names ManifestStaticFilesStorage gives copies: name.<12 hex digits>.ext
+STATIC_HASHED_FILE_PATTERN = r"\.[0-9a-f]{12}\.\w+$"
+
 MEDIA_URL = '/media/'
 
 MEDIA_ROOT = BASE_DIR / "media"
@@ -193,9 +227,49 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default=''),
         'HOST': config('DB_HOST', default=''),
         'PORT': config('DB_PORT', default=''),
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+        # PgBouncer in transaction pooling mode cannot keep the server-side cursors of .iterator() open; it also
+        # needs the database's TimeZone set to UTC so that Django never sends a session-level SET TIME ZONE
+        'DISABLE_SERVER_SIDE_CURSORS': config('DB_PGBOUNCER', default=False, cast=bool),
     }
 }
 
+# process-wide connection pool for the ASGI server, whose requests never reuse a thread's persistent connection;
+# core/asgi.py defaults DB_POOL to True and DB_CONN_MAX_AGE to 0, and refuses to start with persistent connections
+
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+DB_POOL_MIN_SIZE = config('DB_POOL_MIN_SIZE', default=2, cast=int)
+DB_POOL_MAX_SIZE = config('DB_POOL_MAX_SIZE', default=20, cast=int)
+DB_POOL_TIMEOUT = config('DB_POOL_TIMEOUT', default=10, cast=float)
+
+if DB_POOL and 'postgresql' in DATABASES['default']['ENGINE']:
+    DATABASES['default'].update({
+        'ENGINE': 'core.db.backends.postgresql_pool',
+        # connections are handed back to the pool at the end of every request
+        'CONN_MAX_AGE': 0,
+    })
+
+# read replicas, given as "host" or "host:port"; reads of GET requests are routed to them by core.db_router
+
+DB_REPLICA_HOSTS = config('DB_REPLICA_HOSTS', default='', cast=Csv())
+DB_REPLICA_MAX_LAG = config('DB_REPLICA_MAX_LAG', default=5, cast=float)
+DB_REPLICA_HEALTH_CHECK_INTERVAL = config('DB_REPLICA_HEALTH_CHECK_INTERVAL', default=10, cast=float)
+DB_REPLICA_PIN_SECONDS = config('DB_REPLICA_PIN_SECONDS', default=5, cast=int)
+
+DATABASES.update({
+    f'replica_{index}': {
+        **DATABASES['default'],
+        'HOST': host.partition(':')[0],
+        'PORT': host.partition(':')[2] or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    for index, host in enumerate(DB_REPLICA_HOSTS, start=1)
+})
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -206,11 +280,26 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DATETIME_FORMAT': '%Y-%m-%d %H:%M:%S',
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 10,
+    # views opt in with `throttle_scope`; see core.throttling
+    'DEFAULT_THROTTLE_CLASSES': ['core.throttling.RedisTokenBucketThrottle'],
+    'DEFAULT_THROTTLE_RATES': {
+        'login': config('THROTTLE_RATE_LOGIN', default='10/min'),
+        'password_reset': config('THROTTLE_RATE_PASSWORD_RESET', default='5/min'),
+        'clap': config('THROTTLE_RATE_CLAP', default='120/min'),
+        'report': config('THROTTLE_RATE_REPORT', default='20/hour'),
+    },
 }
 
+# Serve hot list endpoints through the `.values()` based serializers in core.serialization
+FAST_SERIALIZATION = config('FAST_SERIALIZATION', default=False, cast=bool)
+
 # JWT
 
 SIMPLE_JWT = {
@@ -244,6 +333,12 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=10),
 }
 
+# "allowlist": every request must present the token stored in Redis for its user.
+# "denylist": tokens are valid unless revoked; see users.services.TokenDenylist.
+TOKEN_REVOCATION = config('TOKEN_REVOCATION', default='allowlist')
+TOKEN_DENYLIST_SYNC_INTERVAL = config('TOKEN_DENYLIST_SYNC_INTERVAL', default=1.0, cast=float)
+TOKEN_DENYLIST_CAPACITY = config('TOKEN_DENYLIST_CAPACITY', default=100_000, cast=int)
+
 # drf_spectacular swagger
 
 SPECTACULAR_SETTINGS = {
@@ -261,6 +356,14 @@ SPECTACULAR_SETTINGS = {
     }
 }
 
+# schema-<CODE_VERSION>-<language>.json files written by `manage.py generate_schema` or the first /schema/
+# request; a new CODE_VERSION means a new file, and without one the schema is kept in memory only
+CODE_VERSION = config('CODE_VERSION', default=config('VERCEL_GIT_COMMIT_SHA', default=''))
+OPENAPI_SCHEMA_ROOT = config('OPENAPI_SCHEMA_ROOT', default=BASE_DIR / "openapi")
+
+# admin changelists count exactly up to this many rows and use PostgreSQL's estimate past it
+ADMIN_COUNT_LIMIT = config('ADMIN_COUNT_LIMIT', default=10_000, cast=int)
+
 AUTH_USER_MODEL = 'users.CustomUser'
 
 DJANGORESIZED_DEFAULT_SIZE = [1920, 1080]
@@ -316,6 +419,55 @@ CACHES = {
 SESSION_ENGINE = "django.contrib.sessions.backends.cache"
 SESSION_CACHE_ALIAS = "default"
 
+# password reset
+
+OTP_MAX_ATTEMPTS = config('OTP_MAX_ATTEMPTS', default=5, cast=int)
+
+# notifications
+
+NOTIFICATION_BATCH_SIZE = config('NOTIFICATION_BATCH_SIZE', default=1000, cast=int)
+NOTIFICATION_INBOX_SIZE = config('NOTIFICATION_INBOX_SIZE', default=500, cast=int)
+NOTIFICATION_RETENTION_DAYS = config('NOTIFICATION_RETENTION_DAYS', default=90, cast=int)
+NOTIFICATION_UNREAD_COUNT_TTL = config('NOTIFICATION_UNREAD_COUNT_TTL', default=60 * 60, cast=int)
+NOTIFICATION_STREAM_KEEPALIVE = config('NOTIFICATION_STREAM_KEEPALIVE', default=15, cast=int)
+NOTIFICATION_STREAM_LIFETIME = config('NOTIFICATION_STREAM_LIFETIME', default=300, cast=int)
+NOTIFICATION_STREAM_QUEUE_SIZE = config('NOTIFICATION_STREAM_QUEUE_SIZE', default=100, cast=int)
+
+# follow graph
+
+FOLLOW_GRAPH_CACHE_TTL = config('FOLLOW_GRAPH_CACHE_TTL', default=6 * 60 * 60, cast=int)
+FOLLOW_BULK_LIMIT = config('FOLLOW_BULK_LIMIT', default=100, cast=int)
+FOLLOW_SUGGESTIONS_LIMIT = config('FOLLOW_SUGGESTIONS_LIMIT', default=10, cast=int)
+FOLLOW_SUGGESTIONS_SAMPLE_SIZE = config('FOLLOW_SUGGESTIONS_SAMPLE_SIZE', default=200, cast=int)
+
+# claps
+
+CLAP_COALESCE = config('CLAP_COALESCE', default=False, cast=bool)
+CLAP_FLUSH_INTERVAL = config('CLAP_FLUSH_INTERVAL', default=1.0, cast=float)
+
+# topics
+
+TOPIC_CATALOGUE_CHECK_INTERVAL = config('TOPIC_CATALOGUE_CHECK_INTERVAL', default=1.0, cast=float)
+TOPIC_TRENDING_LIMIT = config('TOPIC_TRENDING_LIMIT', default=5, cast=int)
+
+# trending articles
+
+TRENDING_HALF_LIFE = config('TRENDING_HALF_LIFE', default=6 * 60 * 60, cast=float)
+TRENDING_LIMIT = config('TRENDING_LIMIT', default=100, cast=int)
+TRENDING_MAX_SIZE = config('TRENDING_MAX_SIZE', default=10_000, cast=int)
+TRENDING_MIN_SCORE = config('TRENDING_MIN_SCORE', default=0.01, cast=float)
+TRENDING_DECAY_INTERVAL = config('TRENDING_DECAY_INTERVAL', default=60 * 60, cast=float)
+
+# reading history; views_count counts a reader once per row, so it counts distinct readers per retention
+# window (and per history cap) rather than distinct readers ever
+
+# only with a flush_reading_history worker running (docker-compose); without one, views_count would never move
+READING_HISTORY_BUFFER = config('READING_HISTORY_BUFFER', default=False, cast=bool)
+READING_HISTORY_FLUSH_INTERVAL = config('READING_HISTORY_FLUSH_INTERVAL', default=1.0, cast=float)
+READING_HISTORY_SIZE = config('READING_HISTORY_SIZE', default=1000, cast=int)
+READING_HISTORY_RETENTION_DAYS = config('READING_HISTORY_RETENTION_DAYS', default=365, cast=int)
+READING_HISTORY_SWEEP_BATCH_SIZE = config('READING_HISTORY_SWEEP_BATCH_SIZE', default=10_000, cast=int)
+
 BIRTH_YEAR_MIN = 1900
 BIRTH_YEAR_MAX = datetime.now().year
 
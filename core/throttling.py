@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+from django.conf import settings
+from loguru import logger
+from rest_framework.throttling import ScopedRateThrottle
+
+from core.middlewares import LogRequestMiddleware
+
+
+class RedisTokenBucketThrottle(ScopedRateThrottle):
+    """
+    Per-route token bucket, checked with one Redis Lua call per request.
+
+    The view's ``throttle_scope`` selects a rate such as ``"10/min"`` from ``DEFAULT_THROTTLE_RATES``: each
+    user (or client IP for anonymous requests) gets a bucket of that many requests, refilled continuously over
+    the period. When Redis is unreachable every process limits with its own in-memory buckets instead.
+    """
+
+    # the clock is Redis' own, so every app server refills the same bucket at the same pace
+    TOKEN_BUCKET_SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local refill_rate = tonumber(ARGV[2])
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated_at = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * refill_rate)
+
+    local allowed = 0
+    local wait = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    else
+        wait = (1 - tokens) / refill_rate
+    end
+
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+    redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / refill_rate * 1000))
+    return {allowed, tostring(wait)}
+    """
+
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    LOCAL_MAX_BUCKETS: int = 10_000
+    local_buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+    local_lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def get_redis_conn(cls) -> redis.Redis:
+        return redis.Redis.from_url(settings.REDIS_URL)
+
+    def get_ident(self, request) -> str:
+        return LogRequestMiddleware.get_client_ip(request)
+
+    def allow_request(self, request, view) -> bool:
+        self.wait_seconds: float | None = None
+        self.scope = getattr(view, self.scope_attr, None)
+
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, self.wait_seconds = self.consume(self.key, self.num_requests, self.num_requests / self.duration)
+        return allowed
+
+    def wait(self) -> float | None:
+        return self.wait_seconds
+
+    @classmethod
+    def consume(cls, key: str, capacity: int, refill_rate: float) -> tuple[bool, float]:
+        """ Takes one token from the bucket; returns whether it was available and how long until one is. """
+        try:
+            allowed, wait = cls.get_redis_conn().eval(cls.TOKEN_BUCKET_SCRIPT, 1, key, capacity, refill_rate)
+        except redis.RedisError as error:
+            logger.warning(f"Rate limiting {key} in memory, Redis is unavailable | {error}")
+            return cls.consume_local(key, capacity, refill_rate)
+
+        return bool(allowed), float(wait)
+
+    @classmethod
+    def consume_local(cls, key: str, capacity: int, refill_rate: float) -> tuple[bool, float]:
+        now: float = time.monotonic()
+
+        with cls.local_lock:
+            tokens, updated_at = cls.local_buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+
+            allowed: bool = tokens >= 1
+            if allowed:
+                tokens -= 1
+
+            cls.local_buckets[key] = (tokens, now)
+            if len(cls.local_buckets) > cls.LOCAL_MAX_BUCKETS:
+                cls.local_buckets.popitem(last=False)
+
+        return allowed, 0.0 if allowed else (1 - tokens) / refill_rate
@@ -4,7 +4,9 @@ from django.contrib import admin
 from django.contrib.auth.decorators import user_passes_test
 from django.http import JsonResponse
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
+
+from core.schema import CachedSpectacularAPIView
 
 
 def is_authenticated(user):
@@ -16,7 +18,7 @@ urlpatterns: list = [
     path("admin/", admin.site.urls),
     path('health/', lambda _: JsonResponse({'detail': 'Healthy'}), name='health'),
     path('users/', include('users.urls')),
-    path('schema/', user_passes_test(is_authenticated)(SpectacularAPIView.as_view()), name='schema'),
+    path('schema/', user_passes_test(is_authenticated)(CachedSpectacularAPIView.as_view()), name='schema'),
     path('swagger/', user_passes_test(is_authenticated)(SpectacularSwaggerView.as_view()),
          name='swagger-ui'),
     path('redoc/', user_passes_test(is_authenticated)(SpectacularRedocView.as_view()), name='redoc'),
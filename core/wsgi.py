@@ -1,8 +1,21 @@
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
+from whitenoise import WhiteNoise
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
 # application = get_wsgi_application()
-app = get_wsgi_application()
\ No newline at end of file
+app = get_wsgi_application()
+
+if settings.STATIC_WSGI_BYPASS:
+    # answers STATIC_URL before Django builds a request, so static files skip every middleware and the URL
+    # resolver; vercel.json routes every path, /static/ included, to this module
+    app = WhiteNoise(
+        app,
+        root=settings.STATIC_ROOT,
+        prefix=settings.STATIC_URL,
+        max_age=settings.WHITENOISE_MAX_AGE,
+        immutable_file_test=settings.STATIC_HASHED_FILE_PATTERN,
+    )
@@ -0,0 +1,134 @@
+import pytest
+from django.db import connection
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+
+@pytest.fixture
+def topic(mocker, fake_redis):
+    from articles.services import TopicCatalogue
+    from tests.factories.topic_factory import TopicFactory
+
+    mocker.patch('articles.services.TopicCatalogue.get_redis_conn', return_value=fake_redis)
+    mocker.patch('articles.services.TrendingService.get_redis_conn', return_value=fake_redis)
+    TopicCatalogue.invalidate()
+    return TopicFactory.create(description='')
+
+
+@pytest.fixture
+def admin_client(client, user_factory):
+    user = user_factory.create(is_staff=True, is_superuser=True)
+    client.force_login(user)
+    return client
+
+
+@pytest.mark.django_db
+def test_paginator_counts_up_to_the_limit(mocker, user_factory):
+    """
+    Test the count is exact up to ADMIN_COUNT_LIMIT and comes from the estimate past it.
+    """
+    from core.admin import EstimatedCountPaginator
+    from users.models import CustomUser
+
+    user_factory.create_batch(3)
+    queryset = CustomUser.objects.all()
+
+    with override_settings(ADMIN_COUNT_LIMIT=5):
+        assert EstimatedCountPaginator(queryset, 2).count == 3
+
+    with override_settings(ADMIN_COUNT_LIMIT=2):
+        # no estimate (not PostgreSQL), so the full count
+        mocker.patch.object(EstimatedCountPaginator, 'estimate', return_value=None)
+        assert EstimatedCountPaginator(queryset, 2).count == 3
+
+        mocker.patch.object(EstimatedCountPaginator, 'estimate', return_value=1_000_000)
+        paginator = EstimatedCountPaginator(queryset, 2)
+        with CaptureQueriesContext(connection) as queries:
+            assert paginator.count == 1_000_000
+        assert len(queries) == 1
+        assert 'LIMIT 3' in queries[0]['sql']
+
+
+@pytest.mark.django_db
+@override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+@pytest.mark.parametrize('model', ['article', 'comment', 'clap', 'report'])
+def test_changelists_skip_full_count(admin_client, model):
+    """
+    Test the changelists render without an unbounded COUNT(*) of the table.
+    """
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(reverse(f'admin:articles_{model}_changelist'))
+
+    assert response.status_code == status.HTTP_200_OK
+    counts = [query['sql'] for query in queries if 'COUNT(' in query['sql']]
+    assert counts and all('LIMIT' in sql for sql in counts)
+
+
+@pytest.mark.django_db
+def test_bulk_actions_are_single_updates(mocker, topic, user_factory):
+    """
+    Test the comment and clap actions are one UPDATE each and the report action trashes published articles only.
+    """
+    from articles.admin import ClapAdmin, CommentAdmin, ReportAdmin
+    from articles.models import Article, Clap, Comment, Report, Topic
+    from django.contrib import admin
+    from tests.factories.article_factory import ArticleFactory
+    from tests.factories.clap_factory import ClapFactory
+    from tests.factories.comment_factory import CommentFactory
+
+    published = ArticleFactory.create(topics=[topic])
+    pending = ArticleFactory.create(status='pending', topics=[topic])
+    CommentFactory.create_batch(2, article=published)
+    ClapFactory.create_batch(2, article=published)
+    for article in (published, pending):
+        Report.objects.create(user=user_factory.create(), article=article)
+    assert Topic.objects.get(pk=topic.pk).articles_count == 1
+
+    mocker.patch('django.contrib.admin.ModelAdmin.message_user')
+    request = RequestFactory().post('/admin/')
+
+    with CaptureQueriesContext(connection) as queries:
+        CommentAdmin(Comment, admin.site).remove_content(request, Comment.objects.all())
+        ClapAdmin(Clap, admin.site).reset_count(request, Clap.objects.all())
+    assert [query['sql'].split()[0] for query in queries] == ['UPDATE', 'UPDATE']
+    assert set(Comment.objects.values_list('content', flat=True)) == {CommentAdmin.removed_content}
+    assert set(Clap.objects.values_list('count', flat=True)) == {0}
+
+    ReportAdmin(Report, admin.site).trash_articles(request, Report.objects.all())
+    assert Article.objects.get(pk=published.pk).status == 'trash'
+    assert Article.objects.get(pk=pending.pk).status == 'pending'
+    assert Topic.objects.get(pk=topic.pk).articles_count == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason="pg_trgm indexes exist on PostgreSQL only")
+@pytest.mark.parametrize('model_name, indexes', [
+    ('article', {'article_title_trgm'}),
+    ('customuser', {'user_username_trgm', 'user_email_trgm', 'user_first_name_en_trgm', 'user_last_name_en_trgm',
+                    'user_middle_name_en_trgm'}),
+])
+def test_admin_search_uses_trigram_indexes(model_name, indexes):
+    """
+    Test every column of the admin search (icontains) is an index scan on its UPPER(column) trigram index.
+    """
+    from django.apps import apps
+    from django.contrib import admin
+    from django.utils import translation
+
+    model = next(model for model in apps.get_models() if model._meta.model_name == model_name)
+    model_admin = admin.site._registry[model]
+    request = RequestFactory().get('/admin/', {'q': 'jahon'})
+
+    with connection.cursor() as cursor:
+        # tiny test tables are otherwise read sequentially whatever the indexes
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute('SET LOCAL enable_indexscan = off')
+    with translation.override('en'):
+        queryset, _ = model_admin.get_search_results(request, model._default_manager.all(), 'jahon')
+        plan = queryset.explain()
+
+    assert 'Seq Scan' not in plan
+    for index in indexes:
+        assert f'Bitmap Index Scan on {index}' in plan
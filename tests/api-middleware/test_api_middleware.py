@@ -0,0 +1,50 @@
+import pytest
+from django.http import HttpResponse
+from django.test import Client, RequestFactory
+from rest_framework import status
+
+from core.middlewares import BrowserSessionMiddleware, BrowserCsrfViewMiddleware, BrowserAuthenticationMiddleware
+
+
+def view(request):
+    return HttpResponse()
+
+
+@pytest.mark.parametrize('url, is_api', [
+    ('/articles/', True),
+    ('/users/me/', True),
+    ('/admin/login/', False),
+    ('/swagger/', False),
+])
+def test_browser_middleware_skips_api_paths(url, is_api):
+    """
+    Test session, auth and CSRF layers do nothing for API prefixes and run as usual elsewhere.
+    """
+    request = RequestFactory().post(url)
+    BrowserSessionMiddleware(BrowserAuthenticationMiddleware(view))(request)
+
+    assert hasattr(request, 'session') is not is_api
+    assert hasattr(request, 'user') is not is_api
+
+    csrf = BrowserCsrfViewMiddleware(view)
+    csrf.process_request(request)
+    response = csrf.process_view(request, view, (), {})
+    assert (response is None) is is_api
+
+
+@pytest.mark.django_db
+def test_api_and_admin_through_the_stack(api_client):
+    """
+    Test an API call sets no session or CSRF cookies, while the admin keeps its session user and CSRF check.
+    """
+    response = api_client().post('/users/login/', {'username': 'nobody', 'password': 'wrong'})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not response.cookies
+
+    # the admin needs the session-based user to send an anonymous visitor to its login page
+    response = Client().get('/admin/')
+    assert response.status_code == status.HTTP_302_FOUND
+
+    client = Client(enforce_csrf_checks=True)
+    response = client.post('/admin/login/', {'username': 'nobody', 'password': 'wrong'})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
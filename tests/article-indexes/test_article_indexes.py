@@ -0,0 +1,86 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import QuerySet
+
+
+def explain(queryset: QuerySet) -> str:
+    """
+    Return the query plan, with sequential scans disabled on PostgreSQL so that tiny test tables
+    still show which index the planner can use.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+    return queryset.explain()
+
+
+@pytest.fixture
+def articles():
+    from tests.factories.article_factory import ArticleFactory
+
+    return ArticleFactory.create_batch(3, status='publish') + ArticleFactory.create_batch(2, status='trash')
+
+
+def test_article_indexes_declared():
+    """
+    Test the reviewed index set is declared on the models.
+    """
+    from articles.models import Article, Favorite, Report
+    from users.models import ReadingHistory
+
+    indexes = {index.name: index for index in Article._meta.indexes}
+
+    assert indexes['article_publish_created_idx'].fields == ['-created_at', 'id']
+    assert indexes['article_publish_views_idx'].fields == ['-views_count']
+    assert indexes['article_publish_created_idx'].condition.children == [('status', 'publish')]
+    assert indexes['article_author_created_idx'].fields == ['author', '-created_at']
+
+    for model in (Favorite, Report, ReadingHistory):
+        assert [constraint.fields for constraint in model._meta.constraints] == [('user', 'article')]
+        assert model._meta.get_field('user').db_index is False
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'order_by, index_name',
+    [
+        (('-created_at',), 'article_publish_created_idx'),
+        (('-views_count',), 'article_publish_views_idx'),
+    ]
+)
+def test_published_feed_uses_partial_index(articles, order_by, index_name):
+    """
+    Test the published feeds are planned on their partial indexes.
+    """
+    from articles.models import Article
+
+    plan = explain(Article.objects.filter(status='publish').order_by(*order_by)[:10])
+
+    assert index_name in plan
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason="SQLite cannot prove NOT IN index predicates")
+def test_visible_articles_use_partial_index(articles):
+    """
+    Test the authenticated listing is planned on the partial index that skips trashed and archived articles.
+    """
+    from articles.models import Article
+
+    plan = explain(Article.objects.exclude(status__in=('trash', 'archive'))[:10])
+
+    assert 'article_visible_created_idx' in plan
+
+
+@pytest.mark.django_db
+def test_index_report_requires_postgresql():
+    """
+    Test index_report reads PostgreSQL statistics and refuses other databases.
+    """
+    if connection.vendor == 'postgresql':
+        call_command('index_report', '--min-rows', '0')
+    else:
+        with pytest.raises(CommandError):
+            call_command('index_report')
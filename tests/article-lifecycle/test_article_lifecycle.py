@@ -0,0 +1,108 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from users.enums import TokenType
+
+
+@pytest.fixture
+def lifecycle_client(user_factory, api_client, tokens, mocker, fake_redis):
+    """
+    Create an author with a stored access token and a published article of theirs.
+    """
+    from tests.factories.article_factory import ArticleFactory
+
+    mocker.patch('users.services.TokenService.get_redis_client', return_value=fake_redis)
+
+    def login(user):
+        access, _ = tokens(user)
+        fake_redis.sadd(f"user:{user.id}:{TokenType.ACCESS}", access)
+        return api_client(token=access)
+
+    author = user_factory.create()
+    return login, author, ArticleFactory.create(author=author, status='publish')
+
+
+@pytest.mark.django_db
+def test_destroy_is_one_conditional_update(lifecycle_client):
+    """
+    Test trashing an article writes only its status, in one statement, and the 403/404 cases.
+    """
+    from articles.models import Article
+
+    login, author, article = lifecycle_client
+    client = login(author)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.delete(f'/articles/{article.id}/')
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "article"')]
+    assert len(updates) == 1
+    assert 'title' not in updates[0]
+    assert Article.objects.get(id=article.id).status == 'trash'
+
+    response = client.delete(f'/articles/{article.id}/')
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_archive_by_another_user_is_forbidden(lifecycle_client, user_factory):
+    """
+    Test only the author can archive, and a refused archive changes nothing.
+    """
+    from articles.models import Article
+
+    login, _, article = lifecycle_client
+
+    response = login(user_factory.create()).post(f'/articles/{article.id}/archive/')
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert Article.objects.get(id=article.id).status == 'publish'
+
+
+@pytest.mark.django_db
+def test_pin_and_unpin(lifecycle_client):
+    """
+    Test pinning is a single insert and repeated pins and unpins are refused.
+    """
+    from articles.services import ArticleLifecycleService
+
+    login, author, article = lifecycle_client
+    client = login(author)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert client.post(f'/articles/{article.id}/pin/').status_code == status.HTTP_200_OK
+    assert len(queries) == 2  # token user lookup and the pin insert
+
+    assert ArticleLifecycleService.pin(article.id) is False
+    assert client.post(f'/articles/{article.id}/pin/').status_code == status.HTTP_400_BAD_REQUEST
+    assert client.post('/articles/999999/pin/').status_code == status.HTTP_404_NOT_FOUND
+
+    assert ArticleLifecycleService.unpin(article.id) is True
+    assert ArticleLifecycleService.unpin(article.id) is False
+
+
+@pytest.mark.django_db
+def test_reports_count_trashes_atomically(lifecycle_client, user_factory):
+    """
+    Test the report counter and the auto-trash of the report that exceeds the limit.
+    """
+    from articles.models import Article
+    from articles.services import ArticleLifecycleService
+
+    _, _, article = lifecycle_client
+    users = user_factory.create_batch(5)
+    limit = ArticleLifecycleService.MAX_REPORTS
+
+    statuses = [ArticleLifecycleService.report(user.id, article.id) for user in users[:limit]]
+    assert statuses == ['publish'] * limit
+    assert ArticleLifecycleService.report(users[0].id, article.id) is None
+
+    assert ArticleLifecycleService.report(users[limit].id, article.id) == 'trash'
+    assert ArticleLifecycleService.report(users[limit + 1].id, article.id) is None
+
+    article = Article.objects.get(id=article.id)
+    assert article.reports_count == limit + 1
+    assert article.status == 'trash'
@@ -0,0 +1,88 @@
+import pytest
+from django.db import connection
+from rest_framework import status
+
+
+@pytest.fixture
+def authors(user_factory):
+    return [
+        user_factory.create(username='shohjahon', first_name='Shohjahon', last_name='Oktamov'),
+        user_factory.create(username='jahongir', first_name='Jahongir', last_name='Karimov'),
+        user_factory.create(username='alisher', first_name='Alisher', last_name='Navoiy'),
+        user_factory.create(username='shohruh', first_name='Shohruh', last_name='Oktamov', is_active=False),
+    ]
+
+
+def test_trigram_indexes_declared():
+    """
+    Test the searchable columns have pg_trgm GIN indexes on UPPER(column) instead of hash indexes.
+    """
+    from django.contrib.postgres.indexes import GinIndex, HashIndex, OpClass
+    from django.db.models.functions import Upper
+    from users.models import CustomUser, SEARCH_FIELDS
+
+    trigram_indexes = {index.name: index for index in CustomUser._meta.indexes if isinstance(index, GinIndex)}
+
+    assert {f'user_{field}_trgm' for field in SEARCH_FIELDS}.issubset(trigram_indexes)
+    assert {'user_first_name_en_trgm', 'user_first_name_uz_trgm', 'user_first_name_ru_trgm'}.issubset(trigram_indexes)
+    for field in SEARCH_FIELDS:
+        assert trigram_indexes[f'user_{field}_trgm'].expressions == (OpClass(Upper(field), name='gin_trgm_ops'),)
+    assert not any(isinstance(index, HashIndex) for index in CustomUser._meta.indexes)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'params, expected_usernames',
+    [
+        ({'q': 'jahon'}, ['shohjahon', 'jahongir']),
+        ({'q': 'oktamov'}, ['shohjahon']),
+        ({'q': 'jah', 'mode': 'prefix'}, ['jahongir']),
+        ({'q': 'nav', 'mode': 'prefix'}, ['alisher']),
+    ]
+)
+def test_author_search(api_client, authors, params, expected_usernames):
+    """
+    Test author search matches usernames and names of active users.
+    """
+    response = api_client().get('/users/search/', data=params)
+
+    assert response.status_code == status.HTTP_200_OK
+    usernames = [user['username'] for user in response.data['results']]
+
+    if connection.vendor == 'postgresql' and params.get('mode') != 'prefix':
+        # ranked by similarity, so only the membership is stable across the fixtures
+        assert sorted(usernames) == sorted(expected_usernames)
+    else:
+        assert usernames == sorted(expected_usernames)
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason="pg_trgm indexes exist on PostgreSQL only")
+@pytest.mark.parametrize('prefix', [True, False])
+def test_author_search_uses_trigram_indexes(authors, prefix):
+    """
+    Test every branch of both search modes is an index scan on the UPPER(column) trigram indexes.
+    """
+    from users.models import SEARCH_FIELDS
+    from users.services import UserService
+
+    with connection.cursor() as cursor:
+        # tiny test tables are otherwise read sequentially, or in username order for the prefix mode
+        cursor.execute('SET LOCAL enable_seqscan = off')
+        cursor.execute('SET LOCAL enable_indexscan = off')
+    plan = UserService.search('jahon', prefix=prefix).explain()
+
+    assert 'Seq Scan' not in plan
+    for field in SEARCH_FIELDS:
+        assert f'Bitmap Index Scan on user_{field}_trgm' in plan
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('params', [{}, {'q': 'a'}, {'q': 'ali', 'mode': 'fuzzy'}])
+def test_author_search_validation(api_client, params):
+    """
+    Test author search rejects missing, too short and unknown parameters.
+    """
+    response = api_client().get('/users/search/', data=params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,111 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from users.enums import TokenType
+
+
+@pytest.fixture
+def clap_client(user_factory, api_client, tokens, mocker, fake_redis):
+    """
+    Create a user with a stored access token and a published article.
+    """
+    from tests.factories.article_factory import ArticleFactory
+
+    mocker.patch('users.services.TokenService.get_redis_client', return_value=fake_redis)
+    mocker.patch('articles.services.ClapService.get_redis_conn', return_value=fake_redis)
+
+    user = user_factory.create()
+    access, _ = tokens(user)
+    fake_redis.sadd(f"user:{user.id}:{TokenType.ACCESS}", access)
+
+    return api_client(token=access), user, ArticleFactory.create(status='publish')
+
+
+@pytest.mark.django_db
+def test_clap_is_a_single_capped_upsert(clap_client):
+    """
+    Test a clap delta is applied with one statement and capped at 50.
+    """
+    from articles.models import Clap
+
+    client, user, article = clap_client
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(f'/articles/{article.id}/clap/', data={'count': 30}, format='json')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data == {'user': user.id, 'article': article.id, 'count': 30}
+    assert len([query for query in queries if 'clap' in query['sql']]) == 1
+
+    response = client.post(f'/articles/{article.id}/clap/', data={'count': 30}, format='json')
+    assert response.data['count'] == 50
+    assert Clap.objects.get(user=user, article=article).count == 50
+
+    response = client.post(f'/articles/{article.id}/clap/', data={'count': 51}, format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_clap_unpublished_article(clap_client):
+    """
+    Test clapping an unpublished article returns 404 and writes nothing.
+    """
+    from articles.models import Clap
+    from tests.factories.article_factory import ArticleFactory
+
+    client, _, _ = clap_client
+    article = ArticleFactory.create(status='pending')
+
+    response = client.post(f'/articles/{article.id}/clap/')
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert not Clap.objects.exists()
+
+
+@pytest.mark.django_db
+def test_unclap_tells_missing_article_from_missing_clap(clap_client):
+    """
+    Test unclapping answers the article 404 for an unpublished article and "Clap Not found." otherwise.
+    """
+    from tests.factories.article_factory import ArticleFactory
+
+    client, _, article = clap_client
+    pending = ArticleFactory.create(status='pending')
+
+    response = client.delete(f'/articles/{pending.id}/clap/')
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.data['detail'] == "No Article matches the given query."
+
+    response = client.delete(f'/articles/{article.id}/clap/')
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert response.data['detail'] == "Clap Not found."
+
+    client.post(f'/articles/{article.id}/clap/', data={'count': 3}, format='json')
+    assert client.delete(f'/articles/{article.id}/clap/').status_code == status.HTTP_204_NO_CONTENT
+
+
+@pytest.mark.django_db
+def test_coalesced_claps_are_flushed(clap_client, settings, fake_redis):
+    """
+    Test coalesced taps are queued in Redis and written by flush_claps in one upsert.
+    """
+    from django.core.management import call_command
+    from articles.models import Clap
+    from articles.services import ClapService
+
+    settings.CLAP_COALESCE = True
+    client, user, article = clap_client
+
+    for _ in range(3):
+        response = client.post(f'/articles/{article.id}/clap/', data={'count': 2}, format='json')
+        assert response.status_code == status.HTTP_202_ACCEPTED
+
+    assert response.data['pending'] == 6
+    assert not Clap.objects.exists()
+
+    call_command('flush_claps', '--once')
+
+    assert Clap.objects.get(user=user, article=article).count == 6
+    assert not fake_redis.exists(ClapService.PENDING_KEY, ClapService.PROCESSING_KEY)
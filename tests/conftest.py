@@ -40,3 +40,15 @@ def tokens():
 @pytest.fixture
 def fake_redis():
     return fakeredis.FakeRedis()
+
+
+@pytest.fixture(autouse=True)
+def throttle_buckets(mocker, fake_redis):
+    """
+    Give every test empty rate-limit buckets, so requests of earlier tests do not throttle it.
+    """
+    from collections import OrderedDict
+    from core.throttling import RedisTokenBucketThrottle
+
+    mocker.patch.object(RedisTokenBucketThrottle, 'get_redis_conn', return_value=fake_redis)
+    mocker.patch.object(RedisTokenBucketThrottle, 'local_buckets', OrderedDict())
@@ -0,0 +1,138 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+
+def test_default_database_keeps_connections():
+    from django.conf import settings
+
+    database = settings.DATABASES['default']
+    assert 'CONN_MAX_AGE' in database
+    assert database['CONN_HEALTH_CHECKS'] is True
+    assert 'DISABLE_SERVER_SIDE_CURSORS' in database
+
+
+@pytest.mark.django_db(transaction=True)
+def test_benchmark_connections_restores_settings():
+    from django.db import connections
+
+    max_age = connections['default'].settings_dict['CONN_MAX_AGE']
+    out = StringIO()
+
+    call_command('benchmark_connections', '--requests', '5', stdout=out)
+
+    output = out.getvalue()
+    assert 'new connection per request' in output
+    assert f'configured (CONN_MAX_AGE={max_age})' in output
+    assert connections['default'].settings_dict['CONN_MAX_AGE'] == max_age
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, sql):
+        import psycopg2
+
+        if self.connection.stale:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+
+
+class FakeConnection:
+    def __init__(self, stale):
+        from psycopg2 import extensions
+
+        self.stale = stale
+        self.closed = 0
+        self.info = type('Info', (), {'transaction_status': extensions.TRANSACTION_STATUS_IDLE})()
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+class FakePool:
+    def __init__(self, idle):
+        self.idle = idle
+        self.discarded = []
+
+    def getconn(self):
+        return self.idle.pop(0) if self.idle else FakeConnection(stale=False)
+
+    def putconn(self, connection, close=False):
+        if close:
+            self.discarded.append(connection)
+
+
+def test_pool_discards_connections_dropped_by_the_server(mocker):
+    """
+    Test a checkout skips pooled connections that fail SELECT 1 although psycopg2 still reports them open.
+    """
+    import threading
+
+    from django.db import connections
+    from core.db.backends.postgresql_pool.base import DatabaseWrapper
+
+    mocker.patch('psycopg2.extras.register_default_jsonb')
+    settings_dict = {**connections['default'].settings_dict, 'OPTIONS': {}, 'CONN_HEALTH_CHECKS': True}
+    wrapper = DatabaseWrapper(settings_dict, alias='pool-test')
+
+    stale = [FakeConnection(stale=True), FakeConnection(stale=True)]
+    pool = FakePool(idle=list(stale))
+    mocker.patch.dict(DatabaseWrapper.pools, {'pool-test': pool})
+    mocker.patch.dict(DatabaseWrapper.slots, {'pool-test': threading.BoundedSemaphore(1)})
+
+    connection = wrapper.get_new_connection({})
+
+    assert not connection.stale
+    assert pool.discarded == stale
+
+
+@pytest.mark.parametrize('databases, rejected', [
+    ({'default': {'CONN_MAX_AGE': 0}, 'replica_1': {'CONN_MAX_AGE': 0}}, False),
+    ({'default': {'CONN_MAX_AGE': 0}, 'replica_1': {'CONN_MAX_AGE': 60}}, True),
+    ({'default': {'CONN_MAX_AGE': None}}, True),
+])
+def test_asgi_rejects_persistent_connections(databases, rejected):
+    """
+    Test persistent connections, which ASGI request threads never reuse, are refused.
+    """
+    from django.core.exceptions import ImproperlyConfigured
+    from core.db.connections import check_asgi_connections
+
+    if rejected:
+        with pytest.raises(ImproperlyConfigured):
+            check_asgi_connections(databases)
+    else:
+        check_asgi_connections(databases)
+
+
+@pytest.mark.parametrize('environ, output', [
+    ({}, 'CONN_MAX_AGE=0'),
+    ({'DB_CONN_MAX_AGE': '60'}, 'ImproperlyConfigured'),
+])
+def test_asgi_application_defaults_to_short_lived_connections(environ, output):
+    """
+    Test the ASGI entry point closes connections after each request by default and will not start with
+    persistent connections.
+    """
+    import os
+    import subprocess
+    import sys
+    from django.conf import settings
+
+    env = {key: value for key, value in os.environ.items() if not key.startswith('DB_')}
+    result = subprocess.run(
+        [sys.executable, '-c', "from core import asgi; from django.conf import settings; "
+                               "print(f\"CONN_MAX_AGE={settings.DATABASES['default']['CONN_MAX_AGE']}\")"],
+        cwd=settings.BASE_DIR, env={**env, 'REDIS_URL': settings.REDIS_URL, **environ},
+        capture_output=True, text=True, timeout=60,
+    )
+
+    assert output in result.stdout + result.stderr
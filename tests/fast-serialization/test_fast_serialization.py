@@ -0,0 +1,97 @@
+import datetime
+import json
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy as _
+from rest_framework.renderers import JSONRenderer
+
+
+def test_orjson_renderer_matches_json_renderer():
+    """
+    Test ORJSONRenderer renders the same document as DRF's JSONRenderer.
+    """
+    from core.renderers import ORJSONRenderer
+
+    data = {
+        "detail": _("Hisob maʼlumotlari yaroqsiz"),
+        "created_at": datetime.datetime(2024, 7, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+        "amount": Decimal("1.50"),
+        "results": [{"id": 1, "title": "Maqola", "topics": []}],
+        1: None,
+    }
+
+    expected = json.loads(JSONRenderer().render(data))
+
+    assert json.loads(ORJSONRenderer().render(data)) == expected
+    assert ORJSONRenderer().render(None) == b''
+
+
+@pytest.mark.django_db
+def test_article_list_values_serializer():
+    """
+    Test ArticleListValuesSerializer output is identical to ArticleListSerializer.
+    """
+    from articles.models import Article
+    from articles.serializers import ArticleListSerializer, ArticleListValuesSerializer
+    from tests.factories.article_factory import ArticleFactory
+    from tests.factories.clap_factory import ClapFactory
+    from tests.factories.comment_factory import CommentFactory
+    from tests.factories.topic_factory import TopicFactory
+
+    topics = TopicFactory.create_batch(2)
+    articles = ArticleFactory.create_batch(3, topics=topics)
+    ClapFactory.create(article=articles[0])
+    CommentFactory.create_batch(2, article=articles[1])
+
+    queryset = Article.objects.order_by("id")
+    serializer = ArticleListValuesSerializer()
+
+    expected = ArticleListSerializer(queryset, many=True).data
+
+    assert serializer.serialize(serializer.get_values_queryset(queryset)) == expected
+
+
+@pytest.mark.django_db
+def test_comments_values_serializer():
+    """
+    Test ArticleDetailCommentsValuesSerializer renders the same reply tree as ArticleDetailCommentsSerializer.
+    """
+    from articles.models import Comment
+    from articles.serializers import ArticleDetailCommentsSerializer, ArticleDetailCommentsValuesSerializer
+    from tests.factories.article_factory import ArticleFactory
+    from tests.factories.comment_factory import CommentFactory
+
+    article = ArticleFactory.create()
+    comment = CommentFactory.create(article=article)
+    reply = CommentFactory.create(article=article, parent=comment)
+    CommentFactory.create(article=article, parent=reply)
+
+    queryset = Comment.objects.filter(article=article).order_by("id")
+    serializer = ArticleDetailCommentsValuesSerializer()
+
+    expected = ArticleDetailCommentsSerializer(queryset, many=True).data
+
+    assert serializer.serialize(serializer.get_values_queryset(queryset)) == expected
+
+
+@pytest.mark.django_db
+def test_notification_values_serializer(user_factory):
+    """
+    Test NotificationValuesSerializer output is identical to NotificationSerializer.
+    """
+    from django.utils import timezone
+    from tests.factories.notification_factory import NotificationFactory
+    from users.models import Notification
+    from users.serializers import NotificationSerializer, NotificationValuesSerializer
+
+    user = user_factory.create()
+    NotificationFactory.create(user=user, read=True, read_at=timezone.now())
+    NotificationFactory.create(user=user, read_at=None)
+
+    queryset = Notification.objects.order_by("id")
+    serializer = NotificationValuesSerializer()
+
+    expected = NotificationSerializer(queryset, many=True).data
+
+    assert serializer.serialize(serializer.get_values_queryset(queryset)) == expected
@@ -0,0 +1,132 @@
+import pytest
+from rest_framework import status
+
+from users.enums import TokenType
+
+
+@pytest.fixture
+def follow_client(user_factory, api_client, tokens, mocker, fake_redis):
+    """
+    Create a user with a stored access token and route every Redis client to fake redis.
+    """
+    mocker.patch('users.services.TokenService.get_redis_client', return_value=fake_redis)
+    mocker.patch('users.services.NotificationService.get_redis_conn', return_value=fake_redis)
+    mocker.patch('users.services.FollowService.get_redis_conn', return_value=fake_redis)
+
+    user = user_factory.create()
+    access, _ = tokens(user)
+    fake_redis.sadd(f"user:{user.id}:{TokenType.ACCESS}", access)
+
+    return api_client(token=access), user
+
+
+@pytest.mark.django_db
+def test_bulk_follow_and_unfollow(follow_client, user_factory, fake_redis):
+    """
+    Test bulk follow creates the rows once, keeps loaded sets in sync and enqueues notifications.
+    """
+    from users.models import Follow
+    from users.services import FollowService, NotificationService
+
+    client, user = follow_client
+    authors = user_factory.create_batch(3)
+    author_ids = [author.id for author in authors]
+
+    assert FollowService.get_counts(authors[0].id) == {'followers': 0, 'followings': 0}
+
+    response = client.post('/users/follow/', data={'user_ids': author_ids[:2]}, format='json')
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(response.data['followed']) == sorted(author_ids[:2])
+    assert response.data['already_following'] == []
+
+    response = client.post('/users/follow/', data={'user_ids': author_ids + [user.id, 999999]}, format='json')
+    assert response.data['followed'] == [author_ids[2]]
+    assert sorted(response.data['already_following']) == sorted(author_ids[:2])
+
+    assert Follow.objects.filter(follower=user).count() == 3
+    assert fake_redis.llen(NotificationService.EVENTS_KEY) == 3
+    # loaded before the follow, so it was updated in place instead of reloaded
+    assert FollowService.get_counts(authors[0].id) == {'followers': 1, 'followings': 0}
+    assert FollowService.get_counts(user.id) == {'followers': 0, 'followings': 3}
+
+    response = client.get('/users/following/check/', data={'user_ids': f"{author_ids[0]},{user.id}"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {author_ids[0]: True, user.id: False}
+
+    response = client.get('/users/following/')
+    assert response.data['count'] == 3
+
+    response = client.delete('/users/follow/', data={'user_ids': author_ids[:2]}, format='json')
+    assert response.data == {'unfollowed': 2}
+    assert FollowService.is_following(user.id, author_ids) == dict(zip(author_ids, [False, False, True]))
+    assert FollowService.get_counts(authors[0].id)['followers'] == 0
+
+    response = client.get(f'/users/{authors[2].id}/follow/counts/')
+    assert response.data == {'followers_count': 1, 'followings_count': 0}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('direction', ['followers', 'followings'])
+def test_load_racing_a_follow_is_not_cached(follow_client, user_factory, mocker, direction):
+    """
+    Test a set read from the table before a concurrent follow is not stored over the follow, and the next
+    read loads the set again.
+    """
+    from users.services import FollowService
+
+    _, user = follow_client
+    author = user_factory.create()
+    user_id = author.id if direction == 'followers' else user.id
+    read_members = FollowService.read_members
+
+    def read_then_follow(*args):
+        members = read_members(*args)
+        # committed after the table read, while the set is still missing from Redis
+        FollowService.follow(user, [author.id])
+        return members
+
+    mocker.patch.object(FollowService, 'read_members', side_effect=read_then_follow)
+    assert FollowService.get_members(direction, [user_id]) == {user_id: set()}
+
+    mocker.patch.object(FollowService, 'read_members', side_effect=read_members)
+    expected = user.id if direction == 'followers' else author.id
+    assert FollowService.get_members(direction, [user_id]) == {user_id: {expected}}
+    assert FollowService.get_members(direction, [user_id]) == {user_id: {expected}}
+    assert FollowService.read_members.call_count == 1
+
+
+@pytest.mark.django_db
+def test_mutual_follows_and_suggested_authors(follow_client, user_factory):
+    """
+    Test mutual follows and suggestions are computed from the cached sets.
+    """
+    from tests.factories.follow_factory import FollowFactory
+
+    client, user = follow_client
+    friend, other, popular, niche = user_factory.create_batch(4)
+
+    for follower, followee in [(user, friend), (friend, user), (user, other),
+                               (friend, popular), (other, popular), (other, niche)]:
+        FollowFactory.create(follower=follower, followee=followee)
+
+    response = client.get('/users/following/mutual/')
+    assert response.status_code == status.HTTP_200_OK
+    assert [row['id'] for row in response.data['results']] == [friend.id]
+
+    response = client.get('/users/following/suggested/')
+    assert response.status_code == status.HTTP_200_OK
+    assert [row['id'] for row in response.data] == [popular.id, niche.id]
+
+
+@pytest.mark.django_db
+def test_bulk_follow_validation(follow_client):
+    """
+    Test bulk follow rejects an empty id list.
+    """
+    client, _ = follow_client
+
+    response = client.post('/users/follow/', data={'user_ids': []}, format='json')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.get('/users/following/check/')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
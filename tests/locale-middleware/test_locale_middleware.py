@@ -0,0 +1,60 @@
+import pytest
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils import translation
+
+from core.middlewares import CustomLocaleMiddleware
+
+
+@pytest.fixture
+def locale_middleware():
+    seen = {}
+
+    def view(request):
+        seen['language'] = translation.get_language()
+        return HttpResponse()
+
+    return CustomLocaleMiddleware(view), seen
+
+
+@pytest.mark.parametrize('header, language', [
+    ('ru-RU,ru;q=0.9,en;q=0.5', 'ru'),
+    ('fr;q=0.2, ru;q=0.8, *;q=0.1', 'ru'),
+    ('de, uz;q=0.5, en;q=0.4', 'uz'),
+    ('en-US', 'en'),
+    ('ru;q=0, uz', 'uz'),
+    ('ru;q=abc, uz;q=0.3', 'uz'),
+    ('de-DE,fr', settings.LANGUAGE_CODE),
+    ('', settings.LANGUAGE_CODE),
+])
+def test_language_follows_quality_values(locale_middleware, header, language):
+    """
+    Test the highest-quality supported range is activated and unsupported ones never are.
+    """
+    middleware, seen = locale_middleware
+    response = middleware(RequestFactory().get('/', HTTP_ACCEPT_LANGUAGE=header))
+
+    assert seen['language'] == language
+    assert response['Content-Language'] == language
+    assert 'Accept-Language' in response['Vary']
+
+
+def test_cookie_wins_and_headers_are_memoized(locale_middleware):
+    """
+    Test the language cookie overrides the header, and a repeated header is resolved from the LRU.
+    """
+    middleware, seen = locale_middleware
+    factory = RequestFactory()
+
+    request = factory.get('/', HTTP_ACCEPT_LANGUAGE='ru')
+    request.COOKIES[settings.LANGUAGE_COOKIE_NAME] = 'uz'
+    middleware(request)
+    assert seen['language'] == 'uz'
+
+    for _ in range(3):
+        middleware(factory.get('/', HTTP_ACCEPT_LANGUAGE='en-GB,ru;q=0.5'))
+
+    assert seen['language'] == 'en'
+    assert middleware.resolve_header.cache_info().hits == 2
+    assert middleware.resolve_header.cache_info().currsize == 1
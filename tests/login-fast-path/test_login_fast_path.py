@@ -0,0 +1,78 @@
+import pytest
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from rest_framework import status
+
+from users.enums import TokenType
+from users.models import CustomUser
+
+PASSWORD = 'strong_password_123'
+
+
+@pytest.mark.django_db
+def test_login_checks_the_password_once(api_client, user_factory, mocker):
+    """
+    Test a login, successful or not, runs exactly one password check.
+    """
+    user = user_factory.create(password=PASSWORD)
+    check_password = mocker.spy(CustomUser, 'check_password')
+
+    response = api_client().post('/users/login/', {'username': user.username, 'password': PASSWORD})
+    assert response.status_code == status.HTTP_200_OK
+    assert sorted(response.json()) == ['access', 'refresh']
+    assert check_password.call_count == 1
+
+    response = api_client().post('/users/login/', {'username': user.username, 'password': 'wrong'})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert check_password.call_count == 2
+
+
+@pytest.mark.django_db
+def test_login_rehashes_outdated_passwords(api_client, user_factory):
+    """
+    Test a PBKDF2 hash, and an Argon2 hash with old costs, are replaced by the configured Argon2 on login.
+    """
+    pytest.importorskip('argon2')
+    user = user_factory.create()
+    CustomUser.objects.filter(id=user.id).update(password=make_password(PASSWORD, hasher='pbkdf2_sha256'))
+
+    hashers = ['core.hashers.TunedArgon2PasswordHasher', 'django.contrib.auth.hashers.PBKDF2PasswordHasher']
+
+    with override_settings(PASSWORD_HASHERS=hashers, ARGON2_TIME_COST=1):
+        response = api_client().post('/users/login/', {'username': user.username, 'password': PASSWORD})
+        assert response.status_code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert user.password.startswith('argon2$') and ',t=1,' in user.password
+
+        with override_settings(ARGON2_TIME_COST=2):
+            response = api_client().post('/users/login/', {'username': user.username, 'password': PASSWORD})
+            assert response.status_code == status.HTTP_200_OK
+            user.refresh_from_db()
+            assert ',t=2,' in user.password
+            assert user.check_password(PASSWORD)
+
+
+@pytest.mark.django_db
+def test_change_password_checks_the_old_password_once(api_client, user_factory, tokens, mocker, fake_redis):
+    """
+    Test changing a password checks the old one on the authenticated user, without authenticate().
+    """
+    mocker.patch('users.services.TokenService.get_redis_client', return_value=fake_redis)
+    user = user_factory.create(password=PASSWORD)
+    access, _ = tokens(user)
+    fake_redis.sadd(f"user:{user.id}:{TokenType.ACCESS}", access)
+    authenticate = mocker.spy(ModelBackend, 'authenticate')
+    check_password = mocker.spy(CustomUser, 'check_password')
+    client = api_client(token=access)
+
+    response = client.put('/users/password/change/', {'old_password': 'wrong', 'new_password': 'new_password_123'})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.put('/users/password/change/', {'old_password': PASSWORD, 'new_password': 'new_password_123'})
+    assert response.status_code == status.HTTP_200_OK
+    assert check_password.call_count == 2
+    assert not authenticate.called
+
+    user.refresh_from_db()
+    assert user.check_password('new_password_123')
@@ -0,0 +1,175 @@
+import pytest
+
+
+@pytest.fixture
+def notification_redis(mocker, fake_redis):
+    mocker.patch('users.services.NotificationService.get_redis_conn', return_value=fake_redis)
+    return fake_redis
+
+
+@pytest.mark.django_db
+def test_follow_events_are_coalesced(notification_redis, user_factory):
+    """
+    Test follow events for the same author become a single "N kishi" notification.
+    """
+    from users.models import Notification
+    from users.services import NotificationService
+
+    author = user_factory.create()
+    followers = user_factory.create_batch(3)
+
+    NotificationService.notify_follow(follower=followers[0], followee=author)
+    NotificationService.process_events(NotificationService.take_events(limit=100))
+    NotificationService.ack_events()
+
+    notification = Notification.objects.get(user=author)
+    assert notification.message == f"{followers[0].username} sizga follow qildi."
+
+    for follower in followers[1:]:
+        NotificationService.notify_follow(follower=follower, followee=author)
+    NotificationService.process_events(NotificationService.take_events(limit=100))
+    NotificationService.ack_events()
+
+    notification = Notification.objects.get(user=author)
+    assert notification.count == 3
+    assert notification.message == "3 kishi sizga follow qildi."
+
+
+@pytest.mark.django_db
+def test_article_publish_fans_out_to_followers(notification_redis, user_factory, settings,
+                                              django_capture_on_commit_callbacks):
+    """
+    Test publishing an article creates one notification per follower in batches.
+    """
+    from tests.factories.article_factory import ArticleFactory
+    from tests.factories.follow_factory import FollowFactory
+    from users.models import Notification
+    from users.services import NotificationService
+
+    settings.NOTIFICATION_BATCH_SIZE = 2
+    author = user_factory.create()
+    follows = [FollowFactory.create(followee=author) for _ in range(5)]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        article = ArticleFactory.create(author=author, status="publish")
+    created = NotificationService.process_events(NotificationService.take_events(limit=100))
+
+    assert created == len(follows)
+    assert set(Notification.objects.values_list("user_id", flat=True)) == {follow.follower_id for follow in follows}
+    assert all(article.title in message for message in Notification.objects.values_list("message", flat=True))
+
+
+@pytest.mark.django_db
+def test_failed_batch_is_retried(notification_redis, user_factory):
+    """
+    Test a batch whose processing fails stays queued for the next run, and is dropped once acked.
+    """
+    from unittest import mock
+
+    from django.core.management import call_command
+    from users.models import Notification
+    from users.services import NotificationService
+
+    author, follower = user_factory.create_batch(2)
+    NotificationService.notify_follow(follower=follower, followee=author)
+
+    with mock.patch.object(NotificationService, 'coalesce_follows', side_effect=RuntimeError):
+        with pytest.raises(RuntimeError):
+            call_command('process_notifications', '--once')
+    assert notification_redis.llen(NotificationService.PROCESSING_KEY) == 1
+
+    call_command('process_notifications', '--once')
+
+    assert Notification.objects.get(user=author).message == f"{follower.username} sizga follow qildi."
+    assert notification_redis.exists(NotificationService.PROCESSING_KEY) == 0
+    assert NotificationService.take_events(limit=100) == []
+
+
+@pytest.mark.django_db
+def test_failed_batch_writes_nothing(notification_redis, user_factory, django_capture_on_commit_callbacks):
+    """
+    Test a batch that fails part way is rolled back, so its retry writes every notification once, and
+    counters and streams are only updated after the commit.
+    """
+    from unittest import mock
+
+    from users.models import Notification
+    from users.services import NotificationService
+
+    author, follower = user_factory.create_batch(2)
+    NotificationService.notify_follow(follower=follower, followee=author)
+    NotificationService.notify_article_published(article_id=1, author_id=author.id, title="Title")
+    events = NotificationService.take_events(limit=100)
+
+    with mock.patch.object(NotificationService, 'fan_out_articles', side_effect=RuntimeError):
+        with pytest.raises(RuntimeError):
+            NotificationService.process_events(events)
+    assert not Notification.objects.exists()
+
+    with mock.patch.object(NotificationService, 'publish') as publish:
+        with django_capture_on_commit_callbacks() as callbacks:
+            NotificationService.process_events(events)
+        publish.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+        publish.assert_called_once()
+
+    notification = Notification.objects.get(user=author)
+    assert notification.count == 1
+    assert notification.message == f"{follower.username} sizga follow qildi."
+
+
+@pytest.mark.django_db
+def test_coalesce_looks_up_unread_by_recipient(notification_redis, user_factory):
+    """
+    Test the unread follow notifications are looked up by recipient, which notification_unread_idx serves.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from users.services import NotificationService
+
+    author = user_factory.create()
+
+    with CaptureQueriesContext(connection) as queries:
+        NotificationService.coalesce_follows({author.id: ["follower"]})
+
+    lookup = next(query['sql'] for query in queries if query['sql'].startswith('SELECT'))
+    assert '"notification"."user_id" IN' in lookup
+
+
+@pytest.mark.django_db
+def test_rolled_back_publish_notifies_nobody(notification_redis, user_factory, django_capture_on_commit_callbacks):
+    """
+    Test the publish event is queued only once the transaction commits.
+    """
+    from django.db import transaction
+    from tests.factories.article_factory import ArticleFactory
+    from users.services import NotificationService
+
+    author = user_factory.create()
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(RuntimeError), transaction.atomic():
+            ArticleFactory.create(author=author, status="publish")
+            raise RuntimeError
+
+    assert NotificationService.take_events(limit=100) == []
+
+
+@pytest.mark.django_db
+def test_sweep_caps_inbox_size(user_factory):
+    """
+    Test sweep keeps only the newest notifications of each user.
+    """
+    from tests.factories.notification_factory import NotificationFactory
+    from users.models import Notification
+    from users.services import NotificationService
+
+    user = user_factory.create()
+    notifications = NotificationFactory.create_batch(5, user=user)
+
+    deleted = NotificationService.sweep(inbox_size=2, retention_days=90)
+
+    assert deleted == 3
+    assert Notification.objects.filter(user=user).count() == 2
+    assert Notification.objects.filter(pk__in=[n.pk for n in notifications]).count() == 2
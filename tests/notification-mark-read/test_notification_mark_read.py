@@ -0,0 +1,97 @@
+import pytest
+from rest_framework import status
+
+from users.enums import TokenType
+
+
+@pytest.fixture
+def notification_client(user_factory, api_client, tokens, mocker, fake_redis):
+    """
+    Create a user with stored access token and unread notifications.
+    """
+    from tests.factories.notification_factory import NotificationFactory
+
+    mocker.patch('users.services.TokenService.get_redis_client', return_value=fake_redis)
+    mocker.patch('users.services.NotificationService.get_redis_conn', return_value=fake_redis)
+
+    user = user_factory.create()
+    access, _ = tokens(user)
+    fake_redis.sadd(f"user:{user.id}:{TokenType.ACCESS}", access)
+
+    notifications = sorted(NotificationFactory.create_batch(4, user=user, read_at=None), key=lambda n: n.id)
+    return api_client(token=access), user, notifications
+
+
+def test_notification_partial_index():
+    """
+    Test the unread notifications partial index is declared.
+    """
+    from users.models import Notification
+
+    index = next(index for index in Notification._meta.indexes if index.name == 'notification_unread_idx')
+    assert index.fields == ['user', 'created_at']
+    assert index.condition.children == [('read', False)]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'payload, expected_read',
+    [
+        ({}, 4),
+        ({'up_to_id': 'second'}, 2),
+        ({'ids': 'first_and_last'}, 2),
+    ]
+)
+def test_mark_notifications_read(notification_client, payload, expected_read):
+    """
+    Test bulk marking notifications as read keeps the unread counter in sync.
+    """
+    from users.models import Notification
+
+    client, user, notifications = notification_client
+
+    response = client.get('/users/notifications/')
+    assert response.data['count'] == 4
+
+    if payload.get('up_to_id'):
+        payload = {'up_to_id': notifications[1].id}
+    elif payload.get('ids'):
+        payload = {'ids': [notifications[0].id, notifications[-1].id]}
+
+    response = client.post('/users/notifications/read/', data=payload, format='json')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {'updated': expected_read, 'unread_count': 4 - expected_read}
+    assert Notification.objects.filter(user=user, read=True, read_at__isnull=False).count() == expected_read
+
+    response = client.get('/users/notifications/')
+    assert response.data['count'] == 4 - expected_read
+    assert len(response.data['results']) == 4 - expected_read
+
+
+@pytest.mark.django_db
+def test_mark_notifications_read_rejects_ids_with_up_to_id(notification_client):
+    """
+    Test ids and up_to_id cannot be combined.
+    """
+    client, _, notifications = notification_client
+
+    response = client.post('/users/notifications/read/',
+                           data={'ids': [notifications[0].id], 'up_to_id': notifications[0].id}, format='json')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_mark_other_users_notification(notification_client, user_factory):
+    """
+    Test a user cannot mark somebody else's notification as read.
+    """
+    from tests.factories.notification_factory import NotificationFactory
+
+    client, _, _ = notification_client
+    notification = NotificationFactory.create(user=user_factory.create(), read_at=None)
+
+    response = client.patch(f'/users/notifications/{notification.id}/', data={'read': True})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import fakeredis
+import pytest
+from fakeredis import aioredis
+
+
+def test_notification_stream_pushes_published_notifications(mocker):
+    """
+    Test the SSE generator sends the unread count and then every notification published for the user.
+    """
+    from users.services import NotificationService
+    from users.streams import notification_events
+
+    server = fakeredis.FakeServer()
+    mocker.patch('users.streams.aioredis.Redis.from_url', return_value=aioredis.FakeRedis(server=server))
+    mocker.patch('users.services.NotificationService.get_unread_count', return_value=2)
+    publisher = fakeredis.FakeRedis(server=server)
+    payload = {"id": 1, "message": "user sizga follow qildi.", "read_at": None, "created_at": "2024-09-01 10:00:00",
+               "read": False}
+
+    async def consume():
+        events = notification_events(user_id=1)
+
+        assert await events.__anext__() == "retry: 3000\n\n"
+        assert await events.__anext__() == 'event: unread\ndata: {"unread_count": 2}\n\n'
+
+        next_event = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0.1)
+        publisher.publish(NotificationService.channel_name(1), json.dumps(payload))
+
+        event = await asyncio.wait_for(next_event, timeout=5)
+        await events.aclose()
+        return event
+
+    event = asyncio.run(consume())
+
+    assert event == f"event: notification\ndata: {json.dumps(payload)}\n\n"
+
+
+@pytest.mark.django_db
+def test_notification_stream_requires_authentication(async_client):
+    """
+    Test the stream rejects anonymous requests.
+    """
+    from asgiref.sync import async_to_sync
+
+    response = async_to_sync(async_client.get)('/users/notifications/stream/')
+
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_notification_stream_is_not_served_over_wsgi(client):
+    """
+    Test a WSGI server answers the stream with 501 instead of buffering it.
+    """
+    response = client.get('/users/notifications/stream/')
+
+    assert response.status_code == 501
+
+
+@pytest.mark.django_db
+def test_unread_count_is_cached(mocker, fake_redis, user_factory):
+    """
+    Test the unread count is computed once and then served from Redis until it is invalidated.
+    """
+    from tests.factories.notification_factory import NotificationFactory
+    from users.services import NotificationService
+
+    mocker.patch('users.services.NotificationService.get_redis_conn', return_value=fake_redis)
+    user = user_factory.create()
+    NotificationFactory.create_batch(2, user=user)
+
+    assert NotificationService.get_unread_count(user.id) == 2
+
+    NotificationFactory.create(user=user)
+    assert NotificationService.get_unread_count(user.id) == 2
+
+    NotificationService.invalidate_unread_count(user.id)
+    assert NotificationService.get_unread_count(user.id) == 3
@@ -0,0 +1,80 @@
+import pytest
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from core.schema import OpenAPISchema
+
+
+@pytest.fixture(autouse=True)
+def clear_schema():
+    OpenAPISchema.clear()
+    yield
+    OpenAPISchema.clear()
+
+
+@pytest.fixture
+def docs_client(client, user_factory):
+    user = user_factory.create()
+    client.force_login(user)
+    return client
+
+
+@pytest.mark.django_db
+def test_schema_generated_once_and_served_with_etag(docs_client, mocker):
+    """
+    Test the schema is generated on the first request only and revalidates with its ETag.
+    """
+    generate = mocker.spy(OpenAPISchema, 'generate')
+
+    first = docs_client.get(reverse('schema'))
+    second = docs_client.get(reverse('schema'))
+
+    assert first.status_code == second.status_code == status.HTTP_200_OK
+    assert 'application/vnd.oai.openapi' in first['Content-Type']
+    assert first.content == second.content
+    assert first['ETag'] == second['ETag']
+    assert generate.call_count == 1
+
+    response = docs_client.get(reverse('schema'), HTTP_IF_NONE_MATCH=first['ETag'])
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response['ETag'] == first['ETag']
+
+    response = docs_client.get(reverse('schema'), HTTP_ACCEPT='application/vnd.oai.openapi+json')
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['info']['title'] == 'Medium'
+    assert response['ETag'] != first['ETag']
+    assert generate.call_count == 1
+
+
+@pytest.mark.django_db
+def test_schema_file_reused_per_code_version(docs_client, mocker, tmp_path):
+    """
+    Test the generated file is read back by a fresh process and a new code version generates a new one.
+    """
+    generate = mocker.spy(OpenAPISchema, 'generate')
+
+    with override_settings(CODE_VERSION='v1', OPENAPI_SCHEMA_ROOT=tmp_path):
+        response = docs_client.get(reverse('schema'), {'lang': 'en'})
+        assert response.status_code == status.HTTP_200_OK
+        assert (tmp_path / 'schema-v1-en.json').is_file()
+
+        OpenAPISchema.clear()
+        assert docs_client.get(reverse('schema'), {'lang': 'en'}).content == response.content
+        assert generate.call_count == 1
+
+    with override_settings(CODE_VERSION='v2', OPENAPI_SCHEMA_ROOT=tmp_path):
+        OpenAPISchema.clear()
+        docs_client.get(reverse('schema'), {'lang': 'en'})
+        assert (tmp_path / 'schema-v2-en.json').is_file()
+        assert generate.call_count == 2
+
+
+@pytest.mark.django_db
+def test_schema_requires_login(client):
+    """
+    Test anonymous users are still redirected to log in.
+    """
+    response = client.get(reverse('schema'))
+
+    assert response.status_code == status.HTTP_302_FOUND
@@ -0,0 +1,54 @@
+import pytest
+from django.test import override_settings
+
+from users.exceptions import OTPException
+from users.services import OTPService
+
+
+@pytest.fixture
+def otp_redis(mocker, fake_redis):
+    mocker.patch('users.services.OTPService.get_redis_conn', return_value=fake_redis)
+    return fake_redis
+
+
+def test_otp_is_stored_as_keyed_hmac(otp_redis):
+    """
+    Test the stored value is an HMAC-SHA256 of secret and code, and only that pair verifies.
+    """
+    otp_code, otp_secret = OTPService.generate_otp('user@example.com')
+    stored = otp_redis.get('user@example.com:otp').decode()
+
+    assert len(otp_code) == 6 and otp_code.isdigit()
+    assert len(stored) == 64 and otp_code not in stored
+    assert 0 < otp_redis.ttl('user@example.com:otp') <= 120
+
+    OTPService.check_otp('user@example.com', otp_code, otp_secret)
+
+    wrong_code = f"{(int(otp_code) + 1) % 10 ** 6:06d}"
+    with pytest.raises(OTPException):
+        OTPService.check_otp('user@example.com', wrong_code, otp_secret)
+    with pytest.raises(OTPException):
+        OTPService.check_otp('user@example.com', otp_code, 'another-secret')
+    with pytest.raises(OTPException):
+        OTPService.check_otp('other@example.com', otp_code, otp_secret)
+
+
+@override_settings(OTP_MAX_ATTEMPTS=2)
+def test_otp_is_burned_after_max_attempts(otp_redis):
+    """
+    Test failed guesses are counted and the code stops working once the attempts run out.
+    """
+    otp_code, otp_secret = OTPService.generate_otp('user@example.com')
+
+    for _ in range(2):
+        with pytest.raises(OTPException):
+            OTPService.check_otp('user@example.com', '000000' if otp_code != '000000' else '111111', otp_secret)
+    assert 0 < otp_redis.ttl('user@example.com:otp:attempts') <= 120
+
+    with pytest.raises(OTPException):
+        OTPService.check_otp('user@example.com', otp_code, otp_secret)
+    assert not otp_redis.exists('user@example.com:otp', 'user@example.com:otp:attempts')
+
+    # a new code starts a new count
+    otp_code, otp_secret = OTPService.generate_otp('user@example.com')
+    OTPService.check_otp('user@example.com', otp_code, otp_secret)
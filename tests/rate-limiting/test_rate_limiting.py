@@ -0,0 +1,84 @@
+import pytest
+import redis
+from rest_framework import status
+
+from core.throttling import RedisTokenBucketThrottle
+from users.enums import TokenType
+
+
+@pytest.fixture
+def throttle_rates(mocker):
+    """
+    Let tests set tight rates; the buckets themselves are reset per test in conftest.
+    """
+    return mocker.patch.dict(RedisTokenBucketThrottle.THROTTLE_RATES)
+
+
+@pytest.mark.django_db
+def test_login_is_throttled_per_client_ip(api_client, user_factory, throttle_rates):
+    """
+    Test a client IP gets `login` rate requests, then 429 with Retry-After, while another IP is unaffected.
+    """
+    throttle_rates['login'] = '2/min'
+    user = user_factory.create()
+    client = api_client()
+    data = {'username': user.username, 'password': 'wrong-password'}
+
+    for _ in range(2):
+        response = client.post('/users/login/', data, REMOTE_ADDR='10.0.0.1')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    response = client.post('/users/login/', data, REMOTE_ADDR='10.0.0.1')
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert 0 < int(response['Retry-After']) <= 30
+
+    response = client.post('/users/login/', data, REMOTE_ADDR='10.0.0.2')
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    # behind a proxy the first X-Forwarded-For address is the client
+    response = client.post('/users/login/', data, HTTP_X_FORWARDED_FOR='10.0.0.1, 172.16.0.1')
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+@pytest.mark.django_db
+def test_report_is_throttled_per_user(api_client, user_factory, tokens, mocker, fake_redis, throttle_rates):
+    """
+    Test authenticated routes count requests per user, not per IP.
+    """
+    from tests.factories.article_factory import ArticleFactory
+
+    throttle_rates['report'] = '1/hour'
+    mocker.patch('users.services.TokenService.get_redis_client', return_value=fake_redis)
+    articles = ArticleFactory.create_batch(2, status='publish')
+
+    def login(user):
+        access, _ = tokens(user)
+        fake_redis.sadd(f"user:{user.id}:{TokenType.ACCESS}", access)
+        return api_client(token=access)
+
+    client = login(user_factory.create())
+    assert client.post(f'/articles/{articles[0].id}/report/').status_code == status.HTTP_201_CREATED
+    assert client.post(f'/articles/{articles[1].id}/report/').status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    other = login(user_factory.create())
+    assert other.post(f'/articles/{articles[1].id}/report/').status_code == status.HTTP_201_CREATED
+
+
+def test_token_bucket_refills_and_falls_back_to_memory(mocker, fake_redis):
+    """
+    Test the Lua bucket refills over time, and the in-memory bucket takes over when Redis fails.
+    """
+    assert RedisTokenBucketThrottle.consume('throttle:test:a', 1, 0.001) == (True, 0.0)
+    allowed, wait = RedisTokenBucketThrottle.consume('throttle:test:a', 1, 0.001)
+    assert not allowed and 0 < wait <= 1000
+    assert 0 < fake_redis.pttl('throttle:test:a') <= 1_000_000
+
+    fake_redis.hset('throttle:test:a', 'updated_at', 0)
+    assert RedisTokenBucketThrottle.consume('throttle:test:a', 1, 0.001) == (True, 0.0)
+
+    mocker.patch('core.throttling.RedisTokenBucketThrottle.get_redis_conn',
+                 side_effect=redis.ConnectionError('down'))
+    assert RedisTokenBucketThrottle.consume('throttle:test:b', 2, 0.001)[0]
+    assert RedisTokenBucketThrottle.consume('throttle:test:b', 2, 0.001)[0]
+    allowed, wait = RedisTokenBucketThrottle.consume('throttle:test:b', 2, 0.001)
+    assert not allowed and wait > 0
@@ -0,0 +1,112 @@
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+
+@pytest.fixture
+def replicas(settings, mocker, fake_redis):
+    """
+    Configure one replica and make it healthy without touching a database.
+    """
+    from core.db_router import ReplicaMonitor
+
+    settings.DATABASE_REPLICAS = ['replica_1']
+    mocker.patch('core.db_router.PrimaryPin.get_redis_conn', return_value=fake_redis)
+    mocker.patch.object(ReplicaMonitor, 'checked_at', {})
+    mocker.patch.object(ReplicaMonitor, 'healthy', {})
+    return mocker.patch.object(ReplicaMonitor, 'check', return_value=True)
+
+
+def read_alias(request):
+    """
+    Return the alias the router picks for a read issued while ``request`` is being handled.
+    """
+    from core.db_router import ReplicaRouter, RequestRouting, routing_state
+    from users.models import CustomUser
+
+    token = routing_state.set(RequestRouting(request) if request is not None else None)
+    try:
+        return ReplicaRouter().db_for_read(CustomUser)
+    finally:
+        routing_state.reset(token)
+
+
+def test_reads_outside_requests_use_primary(replicas):
+    assert read_alias(None) == 'default'
+
+
+def test_safe_requests_read_from_replica(replicas):
+    from core.db_router import PrimaryPin
+
+    factory = RequestFactory()
+
+    assert read_alias(factory.get('/articles/')) == 'replica_1'
+    assert read_alias(factory.post('/articles/')) == 'default'
+
+    pinned = factory.get('/articles/')
+    pinned.COOKIES[PrimaryPin.COOKIE_NAME] = '1'
+    assert read_alias(pinned) == 'default'
+
+
+def test_user_pinned_after_write(replicas, mocker):
+    """
+    Test a successful write pins the user by cookie and Redis key, and their next reads go to the primary.
+    """
+    from core.db_router import PrimaryPin
+    from core.middlewares import ReplicaRoutingMiddleware
+
+    user = mocker.Mock(id=7, is_authenticated=True)
+    request = RequestFactory().post('/articles/')
+    request.user = user
+
+    response = ReplicaRoutingMiddleware(lambda request: HttpResponse(status=201))(request)
+
+    assert response.cookies[PrimaryPin.COOKIE_NAME]['max-age'] == 5
+    assert PrimaryPin.is_user_pinned(user.id)
+
+    request = RequestFactory().get('/articles/')
+    request.user = user
+    assert read_alias(request) == 'default'
+
+
+def test_unhealthy_or_lagging_replica_falls_back(replicas, settings):
+    """
+    Test the health check result is cached for the interval and an unhealthy replica is skipped.
+    """
+    from core.db_router import ReplicaMonitor
+
+    settings.DB_REPLICA_HEALTH_CHECK_INTERVAL = 60
+    replicas.return_value = False
+
+    assert read_alias(RequestFactory().get('/articles/')) == 'default'
+    assert read_alias(RequestFactory().get('/articles/')) == 'default'
+    replicas.assert_called_once_with('replica_1')
+
+    ReplicaMonitor.checked_at.clear()
+    replicas.return_value = True
+    assert read_alias(RequestFactory().get('/articles/')) == 'replica_1'
+
+
+def test_middleware_disabled_without_replicas(settings):
+    from django.core.exceptions import MiddlewareNotUsed
+    from core.middlewares import ReplicaRoutingMiddleware
+
+    settings.DATABASE_REPLICAS = []
+
+    with pytest.raises(MiddlewareNotUsed):
+        ReplicaRoutingMiddleware(lambda request: HttpResponse())
+
+
+@pytest.mark.parametrize('lag, healthy', [(0, True), (30, False)])
+def test_replica_lag_check(settings, mocker, lag, healthy):
+    """
+    Test a replica lagging more than DB_REPLICA_MAX_LAG seconds is reported unhealthy.
+    """
+    from core.db_router import ReplicaMonitor
+
+    settings.DB_REPLICA_MAX_LAG = 5
+    connection = mocker.MagicMock(vendor='postgresql')
+    connection.cursor.return_value.__enter__.return_value.fetchone.return_value = (lag,)
+    mocker.patch('core.db_router.connections', {'replica_1': connection})
+
+    assert ReplicaMonitor.check('replica_1') is healthy
@@ -0,0 +1,167 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from users.enums import TokenType
+
+
+@pytest.fixture
+def reader_client(user_factory, api_client, tokens, mocker, fake_redis):
+    """
+    Create a reader with a stored access token and a published article.
+    """
+    from tests.factories.article_factory import ArticleFactory
+
+    mocker.patch('users.services.TokenService.get_redis_client', return_value=fake_redis)
+    mocker.patch('articles.services.ReadingHistoryService.get_redis_conn', return_value=fake_redis)
+
+    user = user_factory.create()
+    access, _ = tokens(user)
+    fake_redis.sadd(f"user:{user.id}:{TokenType.ACCESS}", access)
+
+    return api_client(token=access), user, ArticleFactory.create(status='publish')
+
+
+@pytest.mark.django_db
+def test_retrieve_does_not_write(reader_client, settings):
+    """
+    Test retrieving an article only buffers the read, and the flush records it once.
+    """
+    from articles.models import Article
+    from articles.services import ReadingHistoryService
+    from users.models import ReadingHistory
+
+    settings.READING_HISTORY_BUFFER = True
+    client, user, article = reader_client
+
+    with CaptureQueriesContext(connection) as queries:
+        for _ in range(2):
+            assert client.get(f'/articles/{article.id}/').status_code == status.HTTP_200_OK
+
+    assert not [query for query in queries if query['sql'].startswith(('INSERT', 'UPDATE'))]
+    assert not ReadingHistory.objects.exists()
+
+    assert ReadingHistoryService.apply(ReadingHistoryService.take_pending()) == 1
+    ReadingHistoryService.ack_pending()
+
+    assert ReadingHistory.objects.filter(user=user, article=article).count() == 1
+    assert Article.objects.get(id=article.id).views_count == article.views_count + 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('buffer', [False, True])
+def test_views_count_follows_buffer_setting(reader_client, settings, buffer):
+    """
+    Test views_count moves on the request without the buffer, and only after the worker's flush with it.
+    """
+    from django.core.management import call_command
+    from articles.models import Article
+
+    settings.READING_HISTORY_BUFFER = buffer
+    client, _, article = reader_client
+
+    assert client.get(f'/articles/{article.id}/').status_code == status.HTTP_200_OK
+    assert Article.objects.get(id=article.id).views_count == article.views_count + (not buffer)
+
+    call_command('flush_reading_history', '--once')
+    assert Article.objects.get(id=article.id).views_count == article.views_count + 1
+
+
+def test_reading_history_buffer_is_off_by_default():
+    """
+    Test reads are written on the request path unless a flush worker is configured.
+    """
+    from django.conf import settings
+
+    assert settings.READING_HISTORY_BUFFER is False
+
+
+@pytest.mark.django_db
+def test_apply_skips_recorded_and_unknown_pairs(user_factory):
+    """
+    Test a flush counts only new reads and ignores pairs whose user or article is gone.
+    """
+    from articles.models import Article
+    from articles.services import ReadingHistoryService
+    from tests.factories.article_factory import ArticleFactory
+    from users.models import ReadingHistory
+
+    users = user_factory.create_batch(2)
+    article = ArticleFactory.create(status='publish')
+    ReadingHistory.objects.create(user=users[0], article=article)
+
+    with CaptureQueriesContext(connection) as queries:
+        written = ReadingHistoryService.apply({(users[0].id, article.id), (users[1].id, article.id),
+                                               (users[1].id, 999999), (999999, article.id)})
+
+    assert written == 1
+    assert ReadingHistory.objects.filter(article=article).count() == 2
+    assert Article.objects.get(id=article.id).views_count == article.views_count + 1
+    # views come from the rows the insert returned, never from reading the table first
+    assert not [query for query in queries
+                if query['sql'].startswith('SELECT') and 'FROM "reading_history"' in query['sql']]
+
+    assert ReadingHistoryService.apply({(users[1].id, article.id)}) == 0
+    assert Article.objects.get(id=article.id).views_count == article.views_count + 1
+
+
+@pytest.mark.django_db
+def test_sweep_reading_history(user_factory):
+    """
+    Test the sweep deletes expired reads and trims each user's history to the newest rows.
+    """
+    import datetime
+
+    from django.core.management import call_command
+    from django.utils import timezone
+
+    from tests.factories.article_factory import ArticleFactory
+    from users.models import ReadingHistory
+
+    heavy, light = user_factory.create_batch(2)
+    articles = ArticleFactory.create_batch(4, status='publish')
+    now = timezone.now()
+
+    for article in articles:
+        ReadingHistory.objects.create(user=heavy, article=article)
+    for age, row in enumerate(ReadingHistory.objects.filter(user=heavy).order_by('id')):
+        ReadingHistory.objects.filter(id=row.id).update(created_at=now - datetime.timedelta(days=len(articles) - age))
+
+    expired = ReadingHistory.objects.create(user=light, article=articles[0])
+    ReadingHistory.objects.filter(id=expired.id).update(created_at=now - datetime.timedelta(days=400))
+    ReadingHistory.objects.create(user=light, article=articles[1])
+
+    call_command('sweep_reading_history', '--history-size', '2', '--retention-days', '365', '--batch-size', '1')
+
+    assert set(ReadingHistory.objects.filter(user=heavy).values_list('article_id', flat=True)) == {
+        articles[2].id, articles[3].id}
+    assert list(ReadingHistory.objects.filter(user=light).values_list('article_id', flat=True)) == [articles[1].id]
+
+
+@pytest.mark.django_db
+def test_views_count_per_retention_window(user_factory, mocker, fake_redis):
+    """
+    Test a reader whose read was swept counts as a view again, while a kept read never does.
+    """
+    import datetime
+
+    from django.utils import timezone
+
+    from articles.models import Article
+    from articles.services import ReadingHistoryService
+    from tests.factories.article_factory import ArticleFactory
+    from users.models import ReadingHistory
+
+    mocker.patch('articles.services.TrendingService.get_redis_conn', return_value=fake_redis)
+    reader = user_factory.create()
+    article = ArticleFactory.create(status='publish', views_count=0)
+
+    assert ReadingHistoryService.apply({(reader.id, article.id)}) == 1
+    assert ReadingHistoryService.apply({(reader.id, article.id)}) == 0
+
+    ReadingHistory.objects.update(created_at=timezone.now() - datetime.timedelta(days=400))
+    ReadingHistoryService.sweep(history_size=10, retention_days=365, batch_size=10)
+
+    assert ReadingHistoryService.apply({(reader.id, article.id)}) == 1
+    assert Article.objects.get(id=article.id).views_count == 2
@@ -262,7 +262,7 @@ def test_forgot_password_verify_view(forgot_password_verify_data, api_client, mo
     mocker.patch('users.services.OTPService.get_redis_conn', return_value=redis_conn)
     mocker.patch('users.services.OTPService.check_otp', side_effect=check_otp_side_effect)
     mock_token_hash = make_password(token_urlsafe())
-    mocker.patch('users.views.make_password', return_value=mock_token_hash)
+    mocker.patch('users.services.OTPService.generate_token', return_value=mock_token_hash)
     client = api_client()
     resp = client.post(f'/users/password/forgot/verify/{otp_secret}/', data, format='json')
     assert resp.status_code == status_code
@@ -10,9 +10,9 @@ def test_custom_user_meta_class():
 
     index_names = {index.name for index in meta.indexes}
     expected_indexes = {
-        'customuser_first_name_hash_idx',
-        'customuser_last_name_hash_idx',
-        'customuser_middle_name_hash_idx',
-        'customuser_username_idx'
+        'customuser_username_idx',
+        'user_username_trgm',
+        'user_first_name_uz_trgm',
+        'user_last_name_uz_trgm',
     }
     assert expected_indexes.issubset(index_names)
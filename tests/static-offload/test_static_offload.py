@@ -0,0 +1,72 @@
+import importlib
+import io
+
+import pytest
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+
+import core.wsgi
+
+
+def test_whitenoise_runs_before_app_middleware():
+    """
+    Test static files are answered right after SecurityMiddleware, ahead of every app middleware.
+    """
+    assert settings.MIDDLEWARE[:2] == [
+        "django.middleware.security.SecurityMiddleware",
+        "whitenoise.middleware.WhiteNoiseMiddleware",
+    ]
+
+
+@pytest.fixture
+def wsgi_bypass(tmp_path):
+    (tmp_path / "css").mkdir()
+    (tmp_path / "css" / "site.0123456789ab.css").write_text("body {}" * 200)
+    (tmp_path / "css" / "site.css").write_text("body {}" * 200)
+
+    with override_settings(STATIC_WSGI_BYPASS=True, STATIC_ROOT=tmp_path):
+        yield importlib.reload(core.wsgi).app
+
+    importlib.reload(core.wsgi)
+
+
+def call(app, path, **environ):
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started.update(status=status, headers=dict(headers))
+
+    environ = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": path, "SERVER_NAME": "localhost", "SERVER_PORT": "80",
+        "wsgi.url_scheme": "http", "wsgi.input": io.BytesIO(), "wsgi.errors": io.StringIO(), **environ,
+    }
+    body = b"".join(app(environ, start_response))
+    return started["status"], started["headers"], body
+
+
+@pytest.mark.parametrize('path, cache_control', [
+    ('/static/css/site.0123456789ab.css', 'max-age=315360000, public, immutable'),
+    ('/static/css/site.css', f'max-age={24 * 60 * 60}, public'),
+])
+def test_wsgi_bypass_serves_static(wsgi_bypass, path, cache_control):
+    """
+    Test the WSGI wrapper serves STATIC_URL itself, hashed names cached as immutable, the rest for a day.
+    """
+    status, headers, body = call(wsgi_bypass, path)
+
+    assert status.startswith("200")
+    assert headers["Cache-Control"] == cache_control
+    assert body == b"body {}" * 200
+
+
+@pytest.mark.django_db
+def test_wsgi_bypass_passes_other_paths_to_django(wsgi_bypass):
+    """
+    Test paths outside STATIC_URL still reach Django.
+    """
+    with override_settings(ALLOWED_HOSTS=["localhost"]):
+        status, headers, body = call(wsgi_bypass, reverse('health'))
+
+    assert status.startswith("200")
+    assert body == b'{"detail": "Healthy"}'
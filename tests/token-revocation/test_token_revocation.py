@@ -0,0 +1,97 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+
+from core.bloom import BloomFilter
+from users.services import TokenDenylist
+
+
+@pytest.fixture
+def denylist(mocker, fake_redis):
+    """
+    Switch to the denylist mode with a fresh process-local filter over a fake Redis.
+    """
+    mocker.patch('users.services.TokenDenylist.get_redis_conn', return_value=fake_redis)
+    for name, value in (('bloom', None), ('synced_score', float('-inf')),
+                        ('synced_at', float('-inf')), ('built_at', float('-inf'))):
+        mocker.patch.object(TokenDenylist, name, value)
+
+    with override_settings(TOKEN_REVOCATION='denylist'):
+        yield fake_redis
+
+
+def test_bloom_filter_has_no_false_negatives():
+    """
+    Test every added item is found and absent items rarely are.
+    """
+    bloom = BloomFilter(1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"added-{i}")
+
+    assert all(f"added-{i}" in bloom for i in range(1000))
+    assert sum(f"absent-{i}" in bloom for i in range(10_000)) < 300
+
+
+@pytest.mark.django_db
+def test_logout_revokes_only_the_current_token(api_client, user_factory, tokens, denylist):
+    """
+    Test logout denies its own token while the user's other sessions keep working, without an allow-list.
+    """
+    user = user_factory.create()
+    phone, laptop = (api_client(token=tokens(user)[0]) for _ in range(2))
+
+    assert phone.get('/users/me/').status_code == status.HTTP_200_OK
+    assert phone.post('/users/logout/').status_code == status.HTTP_200_OK
+
+    assert phone.get('/users/me/').status_code == status.HTTP_401_UNAUTHORIZED
+    assert laptop.get('/users/me/').status_code == status.HTTP_200_OK
+    assert denylist.zcard(TokenDenylist.KEY) == 1
+    assert not denylist.exists(f"user:{user.id}:access")
+
+
+@pytest.mark.django_db
+def test_logout_all_is_one_update(api_client, user_factory, tokens, denylist, django_assert_num_queries):
+    """
+    Test logging out everywhere is a single write that rejects all earlier tokens, but not later ones.
+    """
+    from users.services import TokenService
+
+    user = user_factory.create()
+    with mock.patch('rest_framework_simplejwt.tokens.aware_utcnow', return_value=timezone.now() - timedelta(seconds=5)):
+        phone, laptop = (api_client(token=tokens(user)[0]) for _ in range(2))
+
+    assert phone.get('/users/me/').status_code == status.HTTP_200_OK
+    assert phone.post('/users/logout/all/').status_code == status.HTTP_200_OK
+
+    assert phone.get('/users/me/').status_code == status.HTTP_401_UNAUTHORIZED
+    assert laptop.get('/users/me/').status_code == status.HTTP_401_UNAUTHORIZED
+    assert api_client(token=tokens(user)[0]).get('/users/me/').status_code == status.HTTP_200_OK
+
+    with django_assert_num_queries(1):
+        TokenService.revoke_all(user)
+
+
+@pytest.mark.django_db
+def test_unrevoked_tokens_are_checked_without_redis(api_client, user_factory, tokens, denylist, mocker):
+    """
+    Test a never-revoked token costs no Redis call between syncs, and other processes' revocations arrive.
+    """
+    user = user_factory.create()
+    access, _ = tokens(user)
+    client = api_client(token=access)
+    assert client.get('/users/me/').status_code == status.HTTP_200_OK
+
+    get_redis_conn = mocker.patch('users.services.TokenDenylist.get_redis_conn', return_value=denylist)
+    assert client.get('/users/me/').status_code == status.HTTP_200_OK
+    assert not get_redis_conn.called
+
+    # another process revokes the token; this one sees it on its next sync
+    from rest_framework_simplejwt.tokens import AccessToken
+    denylist.eval(TokenDenylist.DENY_SCRIPT, 1, TokenDenylist.KEY, AccessToken(access)['jti'], 3600)
+    TokenDenylist.synced_at = float('-inf')
+
+    assert client.get('/users/me/').status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,88 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+
+@pytest.fixture
+def catalogue(mocker, fake_redis):
+    """
+    Start every test from an empty catalogue versioned in fake Redis.
+    """
+    from articles.services import TopicCatalogue
+
+    mocker.patch('articles.services.TopicCatalogue.get_redis_conn', return_value=fake_redis)
+    TopicCatalogue.invalidate()
+    return TopicCatalogue
+
+
+@pytest.mark.django_db
+def test_topics_list_is_served_from_memory(catalogue, api_client):
+    """
+    Test /articles/topics/ lists active topics and reuses the catalogue until the version moves.
+    """
+    from tests.factories.topic_factory import TopicFactory
+
+    active = TopicFactory.create(name='python', description='')
+    TopicFactory.create(name='archived', description='', is_active=False)
+
+    client = api_client()
+    response = client.get('/articles/topics/')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == [{'id': active.id, 'name': 'python', 'description': '', 'is_active': True}]
+
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get('/articles/topics/').status_code == status.HTTP_200_OK
+    assert not [query for query in queries if 'topic' in query['sql']]
+
+
+@pytest.mark.django_db
+def test_version_bump_reloads_other_processes(catalogue, fake_redis, settings):
+    """
+    Test a copy loaded before a topic change is reloaded once the Redis version is bumped.
+    """
+    from articles.models import Topic
+    from tests.factories.topic_factory import TopicFactory
+
+    settings.TOPIC_CATALOGUE_CHECK_INTERVAL = 0
+    topic = TopicFactory.create(name='python')
+    assert catalogue.get(topic.id)['name'] == 'python'
+
+    # a write made by another process: no signal runs here, only the version moves
+    Topic.objects.filter(id=topic.id).update(name='django')
+    assert catalogue.get(topic.id)['name'] == 'python'
+
+    fake_redis.incr(catalogue.VERSION_KEY)
+    assert catalogue.get(topic.id)['name'] == 'django'
+
+
+@pytest.mark.django_db
+def test_article_topics_and_validation_use_the_catalogue(catalogue):
+    """
+    Test article topics are rendered and validated from the catalogue.
+    """
+    from articles.serializers import ArticleCreateSerializer, ArticleDetailSerializer, TopicSerializer
+    from tests.factories.article_factory import ArticleFactory
+    from tests.factories.topic_factory import TopicFactory
+
+    topics = TopicFactory.create_batch(2)
+    inactive = TopicFactory.create(is_active=False)
+    article = ArticleFactory.create()
+    article.topics.set(topics)
+
+    expected = TopicSerializer(article.topics.all(), many=True).data
+    assert ArticleDetailSerializer(article).data['topics'] == expected
+
+    catalogue.get_topics()
+    with CaptureQueriesContext(connection) as queries:
+        serializer = ArticleCreateSerializer(data={'title': 't', 'summary': 's', 'content': 'c',
+                                                   'topic_ids': [topic.id for topic in topics],
+                                                   'author': article.author_id})
+        assert serializer.is_valid(), serializer.errors
+    assert not [query for query in queries if 'topic' in query['sql']]
+
+    serializer = ArticleCreateSerializer(data={'title': 't', 'summary': 's', 'content': 'c',
+                                               'topic_ids': [inactive.id], 'author': article.author_id})
+    assert not serializer.is_valid()
+    assert 'topic_ids' in serializer.errors
@@ -0,0 +1,99 @@
+import pytest
+from rest_framework import status
+
+
+@pytest.fixture
+def topic(mocker, fake_redis):
+    """
+    Create an active topic with an empty catalogue and trending lists in fake Redis.
+    """
+    from articles.services import TopicCatalogue
+    from tests.factories.topic_factory import TopicFactory
+
+    mocker.patch('articles.services.TopicCatalogue.get_redis_conn', return_value=fake_redis)
+    mocker.patch('articles.services.TrendingService.get_redis_conn', return_value=fake_redis)
+    TopicCatalogue.invalidate()
+    return TopicFactory.create(description='')
+
+
+def counters(topic):
+    from articles.models import Topic
+
+    return tuple(Topic.objects.filter(pk=topic.pk).values_list('followers_count', 'articles_count').get())
+
+
+@pytest.mark.django_db
+def test_counters_follow_article_lifecycle(topic):
+    """
+    Test the published-article counter follows publishing, topic changes, trashing and deletion.
+    """
+    from articles.models import Article
+    from articles.services import ArticleLifecycleService
+    from tests.factories.article_factory import ArticleFactory
+
+    published = ArticleFactory.create(topics=[topic])
+    pending = ArticleFactory.create(status='pending', topics=[topic])
+    assert counters(topic) == (0, 1)
+
+    pending.status = 'publish'
+    pending.save()
+    assert counters(topic) == (0, 2)
+
+    published.topics.remove(topic)
+    assert counters(topic) == (0, 1)
+    topic.article_set.add(published)
+    assert counters(topic) == (0, 2)
+
+    assert ArticleLifecycleService.transition(Article.objects.all(), published.id, 'trash')
+    assert counters(topic) == (0, 1)
+
+    pending.delete()
+    assert counters(topic) == (0, 0)
+
+
+@pytest.mark.django_db
+def test_topic_page(topic, user_factory, api_client):
+    """
+    Test the topic page returns the counters and the trending published articles.
+    """
+    from articles.models import TopicFollow
+    from articles.services import TrendingService
+    from tests.factories.article_factory import ArticleFactory
+
+    for user in user_factory.create_batch(2):
+        TopicFollow.objects.create(user=user, topic=topic)
+    TopicFollow.objects.filter(topic=topic).first().delete()
+
+    popular = ArticleFactory.create(topics=[topic])
+    other = ArticleFactory.create(topics=[topic])
+    ArticleFactory.create(status='pending', topics=[topic])
+    TrendingService.record('comment', {popular.id: 1})
+    TrendingService.record('view', {other.id: 1})
+
+    response = api_client().get(f'/articles/topics/{topic.id}/')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data['name'] == topic.name
+    assert (response.data['followers_count'], response.data['articles_count']) == (1, 2)
+    assert [article['id'] for article in response.data['trending_articles']] == [popular.id, other.id]
+
+    assert api_client().get('/articles/topics/999999/').status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_reconcile_topic_stats(topic, user_factory):
+    """
+    Test reconciliation rewrites only counters that drifted.
+    """
+    from django.core.management import call_command
+
+    from articles.models import Topic, TopicFollow
+    from tests.factories.article_factory import ArticleFactory
+
+    ArticleFactory.create(topics=[topic])
+    TopicFollow.objects.create(user=user_factory.create(), topic=topic)
+    Topic.objects.filter(pk=topic.pk).update(followers_count=7, articles_count=0)
+
+    call_command('reconcile_topic_stats')
+
+    assert counters(topic) == (1, 1)
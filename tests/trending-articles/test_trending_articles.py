@@ -0,0 +1,109 @@
+import pytest
+from rest_framework import status
+
+
+@pytest.fixture
+def trending(mocker, fake_redis):
+    """
+    Keep the trending sorted sets in fake Redis.
+    """
+    from articles.services import TrendingService
+
+    mocker.patch('articles.services.TrendingService.get_redis_conn', return_value=fake_redis)
+    return TrendingService
+
+
+@pytest.mark.django_db
+def test_trending_filter_orders_by_decayed_score(trending, api_client, mocker):
+    """
+    Test ?trending=true ranks by weighted events and newer events outweigh older ones.
+    """
+    from tests.factories.article_factory import ArticleFactory
+
+    old, new, quiet = ArticleFactory.create_batch(3)
+
+    clock = mocker.patch('articles.services.time.time', return_value=1_000_000.0)
+    trending.record('comment', {old.id: 2})
+    # two half-lives later a single comment weighs four times as much
+    clock.return_value += 2 * 6 * 60 * 60
+    trending.record('comment', {new.id: 1})
+    trending.record('view', {new.id: 1})
+
+    response = api_client().get('/articles/', {'trending': 'true'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [article['id'] for article in response.data['results']] == [new.id, old.id]
+
+
+@pytest.mark.django_db
+def test_topic_trending_lists(trending, api_client):
+    """
+    Test ?trending=true&topics=<id> reads the topic's own trending list.
+    """
+    from tests.factories.article_factory import ArticleFactory
+    from tests.factories.topic_factory import TopicFactory
+
+    python, django = TopicFactory.create_batch(2)
+    in_python = ArticleFactory.create(topics=[python])
+    in_django = ArticleFactory.create(topics=[django])
+    trending.record('read', {in_python.id: 1, in_django.id: 5})
+
+    response = api_client().get('/articles/', {'trending': 'true', 'topics': python.id})
+
+    assert [article['id'] for article in response.data['results']] == [in_python.id]
+
+
+@pytest.mark.django_db
+def test_decay_drops_faded_and_unpublished_articles(trending, fake_redis, mocker):
+    """
+    Test the decay job rescales scores to the new epoch and drops faded and unpublished articles.
+    """
+    from django.core.management import call_command
+
+    from tests.factories.article_factory import ArticleFactory
+
+    kept, faded, trashed = ArticleFactory.create_batch(3)
+
+    clock = mocker.patch('articles.services.time.time', return_value=1_000_000.0)
+    trending.record('view', {faded.id: 1})
+    clock.return_value += 8 * 6 * 60 * 60
+    trending.record('comment', {kept.id: 1, trashed.id: 1})
+    trashed.status = 'trash'
+    trashed.save()
+
+    clock.return_value += 6 * 60 * 60
+    call_command('decay_trending', '--once')
+
+    assert fake_redis.zrange(trending.GLOBAL_KEY, 0, -1, withscores=True) == [(str(kept.id).encode(), 2.5)]
+
+
+@pytest.mark.django_db
+def test_empty_trending_list_falls_back_to_most_viewed(trending, api_client):
+    """
+    Test ?trending=true lists the most viewed articles while no trending events are recorded.
+    """
+    from tests.factories.article_factory import ArticleFactory
+
+    quiet = ArticleFactory.create(views_count=1)
+    popular = ArticleFactory.create(views_count=10)
+
+    response = api_client().get('/articles/', {'trending': 'true'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [article['id'] for article in response.data['results']] == [popular.id, quiet.id]
+
+
+@pytest.mark.django_db
+def test_full_trending_set_keeps_the_incremented_article(trending, fake_redis, settings):
+    """
+    Test a new article enters a full set by evicting the lowest other article, not itself.
+    """
+    from tests.factories.article_factory import ArticleFactory
+
+    settings.TRENDING_MAX_SIZE = 2
+    first, second, newcomer = ArticleFactory.create_batch(3)
+    trending.record('comment', {first.id: 2, second.id: 1})
+    trending.record('view', {newcomer.id: 1})
+
+    members = {int(member) for member in fake_redis.zrange(trending.GLOBAL_KEY, 0, -1)}
+    assert members == {first.id, newcomer.id}
@@ -1,11 +1,12 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
+from core.admin import LargeTableAdminMixin
 from .models import CustomUser
 
 
 @admin.register(CustomUser)
-class CustomUserAdmin(UserAdmin):
+class CustomUserAdmin(LargeTableAdminMixin, UserAdmin):
     fieldsets = UserAdmin.fieldsets + (
         ('Additional info', {
             'fields': ('middle_name', 'avatar',)
@@ -14,5 +15,6 @@ class CustomUserAdmin(UserAdmin):
     readonly_fields = 'id',
     list_display = ('id', 'username', 'email', 'first_name', 'last_name', 'middle_name')
     list_display_links = ('id', 'username', 'email')
+    # modeltranslation searches the active language's name columns; each column has a pg_trgm index
     search_fields = ('username', 'email', 'first_name', 'last_name', 'middle_name')
     list_filter = ('last_login', 'date_joined', 'is_staff', 'is_superuser', 'is_active')
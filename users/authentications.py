@@ -1,5 +1,6 @@
 from typing import Optional
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from rest_framework_simplejwt.authentication import AuthUser, JWTAuthentication
@@ -29,6 +30,11 @@ class CustomJWTAuthentication(JWTAuthentication):
 
     @classmethod
     def is_valid_access_token(cls, user: User, access_token: Token) -> bool:
+        if settings.TOKEN_REVOCATION == "denylist":
+            if TokenService.is_revoked(user, access_token):
+                raise AuthenticationFailed(_("Kirish ma'lumotlari yaroqsiz"))
+            return True
+
         valid_access_tokens = TokenService.get_valid_tokens(user.id, TokenType.ACCESS)
         if (
                 # valid_access_tokens and
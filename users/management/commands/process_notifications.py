@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from loguru import logger
+
+from users.services import NotificationService
+
+
+class Command(BaseCommand):
+    help = "Fans queued notification events out into the notification table."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--once", action="store_true", help="Drain the queue and exit instead of waiting.")
+        parser.add_argument("--timeout", type=int, default=5, help="Seconds to block while the queue is empty.")
+
+    def handle(self, *args, **options) -> None:
+        timeout: int = 0 if options["once"] else options["timeout"]
+
+        while True:
+            try:
+                events = NotificationService.take_events(settings.NOTIFICATION_BATCH_SIZE, timeout=timeout)
+
+                if events:
+                    created: int = NotificationService.process_events(events)
+                    NotificationService.ack_events()
+                    logger.info(f"Processed {len(events)} notification events | Created: {created}")
+                elif options["once"]:
+                    break
+            except Exception as error:
+                # the batch stays in the processing list and is retried on the next round
+                logger.exception(f"Processing notification events failed: {error}")
+                if options["once"]:
+                    raise
+                time.sleep(options["timeout"])
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.services import NotificationService
+
+
+class Command(BaseCommand):
+    help = "Deletes read notifications past the retention period and trims inboxes to the configured size."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--inbox-size", type=int, default=settings.NOTIFICATION_INBOX_SIZE)
+        parser.add_argument("--retention-days", type=int, default=settings.NOTIFICATION_RETENTION_DAYS)
+
+    def handle(self, *args, **options) -> None:
+        deleted: int = NotificationService.sweep(options["inbox_size"], options["retention_days"])
+        self.stdout.write(f"Deleted {deleted} notifications")
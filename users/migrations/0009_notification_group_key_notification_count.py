@@ -0,0 +1,23 @@
+# Generated by Django 4.2.14 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_notification_message'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='group_key',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='count',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.14 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_notification_group_key_notification_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('read', False)), fields=['user', 'created_at'], name='notification_unread_idx'),
+        ),
+    ]
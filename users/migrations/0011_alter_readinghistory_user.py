@@ -0,0 +1,20 @@
+# Generated by Django 4.2.14 on 2026-10-19 12:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_notification_notification_unread_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='readinghistory',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='reading_history', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.14 on 2026-10-19 12:00
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_alter_readinghistory_user'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='customuser_first_name_hash_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='customuser_last_name_hash_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='customuser_middle_name_hash_idx',
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['username'], name='user_username_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['first_name_en'], name='user_first_name_en_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['first_name_uz'], name='user_first_name_uz_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['first_name_ru'], name='user_first_name_ru_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['last_name_en'], name='user_last_name_en_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['last_name_uz'], name='user_last_name_uz_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['last_name_ru'], name='user_last_name_ru_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
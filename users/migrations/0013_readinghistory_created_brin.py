@@ -0,0 +1,18 @@
+# Generated by Django 4.2.14 on 2026-10-19 12:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0012_customuser_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='readinghistory',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='reading_history_created_brin'),
+        ),
+    ]
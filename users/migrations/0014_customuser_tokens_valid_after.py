@@ -0,0 +1,18 @@
+# Generated by Django 4.2.14 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0013_readinghistory_created_brin'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='tokens_valid_after',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.14 on 2026-10-19 12:00
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0014_customuser_tokens_valid_after'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customuser',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['email'], name='user_email_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 4.2.14 on 2026-10-19 12:00
+
+import core.db.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0015_customuser_email_trgm'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='user_username_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='user_first_name_en_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='user_first_name_uz_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='user_first_name_ru_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='user_last_name_en_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='user_last_name_uz_trgm',
+        ),
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='user_last_name_ru_trgm',
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=core.db.indexes.UpperTrigramIndex('username', name='user_username_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=core.db.indexes.UpperTrigramIndex('first_name_en', name='user_first_name_en_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=core.db.indexes.UpperTrigramIndex('first_name_uz', name='user_first_name_uz_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=core.db.indexes.UpperTrigramIndex('first_name_ru', name='user_first_name_ru_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=core.db.indexes.UpperTrigramIndex('last_name_en', name='user_last_name_en_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=core.db.indexes.UpperTrigramIndex('last_name_uz', name='user_last_name_uz_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=core.db.indexes.UpperTrigramIndex('last_name_ru', name='user_last_name_ru_trgm'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.14 on 2026-10-19 12:00
+
+import core.db.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0016_customuser_upper_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='customuser',
+            name='user_email_trgm',
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=core.db.indexes.UpperTrigramIndex('email', name='user_email_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=core.db.indexes.UpperTrigramIndex('middle_name_en', name='user_middle_name_en_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=core.db.indexes.UpperTrigramIndex('middle_name_uz', name='user_middle_name_uz_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=core.db.indexes.UpperTrigramIndex('middle_name_ru', name='user_middle_name_ru_trgm'),
+        ),
+    ]
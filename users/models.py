@@ -2,15 +2,21 @@ import os
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
-from django.contrib.postgres.indexes import HashIndex
+from django.contrib.postgres.indexes import BrinIndex
 from django.core import validators
 from django.core.exceptions import ValidationError
 from django.db import models
 from django_resized import ResizedImageField
 
+from core.db.indexes import UpperTrigramIndex
 from users.errors import BIRTH_YEAR_ERROR_MSG
 
 
+# username and the modeltranslation columns of the full name (see users/translation.py)
+SEARCH_FIELDS = ('username', *(f'{field}_{language}' for field in ('first_name', 'last_name')
+                               for language in settings.MODELTRANSLATION_LANGUAGES))
+
+
 def file_upload(instance, filename):
     """ This function is used to upload the user's avatar. """
     ext = filename.split('.')[-1]
@@ -28,10 +34,13 @@ class CustomUser(AbstractUser):
         ordering = ["-date_joined"]
 
         indexes = [
-            HashIndex(fields=['first_name'], name='%(class)s_first_name_hash_idx'),
-            HashIndex(fields=['last_name'], name='%(class)s_last_name_hash_idx'),
-            HashIndex(fields=['middle_name'], name='%(class)s_middle_name_hash_idx'),
             models.Index(fields=['username'], name='%(class)s_username_idx'),
+            # pg_trgm indexes on UPPER(column), the expression icontains / istartswith compile to on PostgreSQL
+            *(UpperTrigramIndex(field, name=f'user_{field}_trgm') for field in SEARCH_FIELDS),
+            # admin search (email and middle_name icontains)
+            UpperTrigramIndex('email', name='user_email_trgm'),
+            *(UpperTrigramIndex(f'middle_name_{language}', name=f'user_middle_name_{language}_trgm')
+              for language in settings.MODELTRANSLATION_LANGUAGES),
         ]
 
         constraints = [
@@ -55,6 +64,9 @@ class CustomUser(AbstractUser):
         blank=True
     )
 
+    # with TOKEN_REVOCATION = "denylist", tokens issued before this second are rejected (logout everywhere)
+    tokens_valid_after = models.DateTimeField(null=True, blank=True, editable=False)
+
     def clean(self):
         super().clean()
         if self.birth_year and not (settings.BIRTH_YEAR_MIN < self.birth_year < settings.BIRTH_YEAR_MAX):
@@ -99,8 +111,14 @@ class ReadingHistory(models.Model):
         constraints: list[models.UniqueConstraint] = [
             models.UniqueConstraint(fields=["user", "article"], name="unique_reading_history")
         ]
+        indexes: list[models.Index] = [
+            # rows are appended in created_at order, so a BRIN index serves the retention sweep at a tiny size
+            BrinIndex(fields=["created_at"], name="reading_history_created_brin"),
+        ]
 
-    user: models.ForeignKey = models.ForeignKey(to=CustomUser, related_name="reading_history", on_delete=models.CASCADE)
+    # (user, article) lookups and the user foreign key are served by the unique constraint
+    user: models.ForeignKey = models.ForeignKey(to=CustomUser, related_name="reading_history", on_delete=models.CASCADE,
+                                                db_index=False)
     article: models.ForeignKey = models.ForeignKey(to="articles.Article", related_name="readers",
                                                    on_delete=models.CASCADE)
     created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
@@ -139,9 +157,15 @@ class Notification(models.Model):
         verbose_name: str = "Notification"
         verbose_name_plural: str = "Notifications"
         ordering: list[str] = ["-created_at"]
+        indexes: list[models.Index] = [
+            models.Index(fields=["user", "created_at"], name="notification_unread_idx", condition=models.Q(read=False))
+        ]
 
     user: models.ForeignKey = models.ForeignKey(to=CustomUser, related_name="notifications", on_delete=models.CASCADE)
     message: models.TextField = models.TextField()
     read: models.BooleanField = models.BooleanField(default=False)
     read_at: models.DateTimeField = models.DateTimeField(null=True)
     created_at: models.DateTimeField = models.DateTimeField(auto_now_add=True)
+    # unread notifications sharing a group key are coalesced into one row, e.g. "5 kishi sizga follow qildi."
+    group_key: models.CharField = models.CharField(max_length=64, null=True, blank=True)
+    count: models.PositiveIntegerField = models.PositiveIntegerField(default=1)
@@ -0,0 +1,29 @@
+from django.db.models import QuerySet
+from rest_framework.pagination import LimitOffsetPagination
+
+from .models import Notification, CustomUser
+from .services import NotificationService, FollowService
+
+
+class UnreadNotificationPagination(LimitOffsetPagination):
+    """ Takes the total from the maintained unread counter instead of a ``COUNT(*)`` over the inbox. """
+
+    def get_count(self, queryset: QuerySet[Notification]) -> int:
+        return NotificationService.get_unread_count(self.request.user.id)
+
+
+class FollowGraphPagination(LimitOffsetPagination):
+    """ Takes the total from the cached follow graph instead of a ``COUNT(*)`` over the ``follow`` join. """
+
+    direction: str
+
+    def get_count(self, queryset: QuerySet[CustomUser]) -> int:
+        return FollowService.get_counts(self.request.user.id)[self.direction]
+
+
+class FollowersPagination(FollowGraphPagination):
+    direction: str = FollowService.FOLLOWERS
+
+
+class FollowingsPagination(FollowGraphPagination):
+    direction: str = FollowService.FOLLOWINGS
@@ -1,4 +1,5 @@
-from typing import Type
+from operator import itemgetter
+from typing import Type, Any, Callable, Iterable
 
 from django.conf import settings
 from django.contrib.auth import authenticate
@@ -8,6 +9,7 @@ from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from core.serialization import ValuesSerializer, file_url_extractor, format_datetime
 from users.errors import BIRTH_YEAR_ERROR_MSG
 from .models import Recommendation, Pin, Notification
 
@@ -46,7 +48,8 @@ class LoginSerializer(serializers.Serializer):
         password = data.get('password')
 
         if username and password:
-            user = authenticate(username=username, password=password)
+            # the only password check of a login; LoginView takes the user from validated_data
+            user = authenticate(self.context.get('request'), username=username, password=password)
             if user is None:
                 raise serializers.ValidationError(_('Kirish maʼlumotlari notoʻgʻri'))
         else:
@@ -157,3 +160,84 @@ class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model: Type[Notification] = Notification
         fields: tuple[str] = "id", "message", "read_at", "created_at", "read"
+
+
+class UserValuesSerializer(ValuesSerializer):
+    """ Fast-path counterpart of ``UserSerializer`` for read-only listings. """
+
+    value_fields: tuple[str, ...] = 'id', 'username', 'first_name', 'last_name', 'middle_name', 'email', 'avatar'
+
+    def get_extractors(self) -> list[tuple[str, Callable[[dict[str, Any]], Any]]]:
+        avatar_url: Callable[[str | None], str | None] = file_url_extractor(User._meta.get_field('avatar'), self.request)
+
+        return [
+            ('id', itemgetter('id')),
+            ('username', itemgetter('username')),
+            ('first_name', itemgetter('first_name')),
+            ('last_name', itemgetter('last_name')),
+            ('middle_name', itemgetter('middle_name')),
+            ('email', itemgetter('email')),
+            ('avatar', lambda row: avatar_url(row['avatar'])),
+        ]
+
+    def get_rows_by_id(self, user_ids: Iterable[int]) -> dict[int, dict[str, Any]]:
+        rows: Iterable[dict[str, Any]] = self.get_values_queryset(User.objects.filter(id__in=set(user_ids)))
+        return {row['id']: row for row in rows}
+
+    def serialize_by_id(self, user_ids: Iterable[int]) -> dict[int, dict[str, Any]]:
+        return {user_id: self.to_representation(row) for user_id, row in self.get_rows_by_id(user_ids).items()}
+
+
+class NotificationValuesSerializer(ValuesSerializer):
+    """ Fast-path counterpart of ``NotificationSerializer``. """
+
+    value_fields: tuple[str, ...] = "id", "message", "read_at", "created_at", "read"
+
+    def get_extractors(self) -> list[tuple[str, Callable[[dict[str, Any]], Any]]]:
+        return [
+            ('id', itemgetter('id')),
+            ('message', itemgetter('message')),
+            ('read_at', lambda row: format_datetime(row['read_at'])),
+            ('created_at', lambda row: format_datetime(row['created_at'])),
+            ('read', itemgetter('read')),
+        ]
+
+
+class NotificationMarkReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, allow_empty=False,
+                                max_length=1000)
+    up_to_id = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, data):
+        if 'ids' in data and 'up_to_id' in data:
+            raise serializers.ValidationError(_("ids yoki up_to_id dan faqat bittasini yuboring."))
+        return data
+
+
+class NotificationMarkReadResponseSerializer(serializers.Serializer):
+    updated = serializers.IntegerField()
+    unread_count = serializers.IntegerField()
+
+
+class FollowUserIdsSerializer(serializers.Serializer):
+    user_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), min_length=1,
+                                     max_length=settings.FOLLOW_BULK_LIMIT)
+
+
+class BulkFollowResponseSerializer(serializers.Serializer):
+    followed = serializers.ListField(child=serializers.IntegerField())
+    already_following = serializers.ListField(child=serializers.IntegerField())
+
+
+class BulkUnfollowResponseSerializer(serializers.Serializer):
+    unfollowed = serializers.IntegerField()
+
+
+class FollowCountsSerializer(serializers.Serializer):
+    followers_count = serializers.IntegerField()
+    followings_count = serializers.IntegerField()
+
+
+class AuthorSearchSerializer(serializers.Serializer):
+    q = serializers.CharField(min_length=2, max_length=100)
+    mode = serializers.ChoiceField(choices=["similar", "prefix"], default="similar")
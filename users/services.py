@@ -1,20 +1,34 @@
 import datetime
-import random
-import string
-import uuid
-from secrets import token_urlsafe
+import json
+import threading
+import time
+from collections import defaultdict, Counter
+from functools import reduce
+from operator import or_
+from secrets import token_urlsafe, randbelow
+from typing import Any
 
 import redis
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.hashers import make_password, check_password
+from django.contrib.postgres.lookups import TrigramWordSimilar
+from django.contrib.postgres.search import TrigramWordSimilarity
 from django.core.mail import EmailMessage
+from django.db import connection, transaction
+from django.db.models import Count, QuerySet, Exists, OuterRef, Q
+from django.db.models.functions import Greatest, Upper
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
 from django.template.loader import render_to_string
 from django.utils.translation import gettext_lazy as _
-from rest_framework_simplejwt.tokens import RefreshToken
+from loguru import logger
+from rest_framework_simplejwt.tokens import RefreshToken, Token
 
+from core.bloom import BloomFilter
 from users.enums import TokenType
 from .exceptions import OTPException
+from .models import Notification, Follow, SEARCH_FIELDS
+from .serializers import NotificationSerializer
 
 # REDIS_HOST = config("REDIS_HOST", None)
 # REDIS_PORT = config("REDIS_PORT", None)
@@ -60,6 +74,119 @@ class TokenService:
         if valid_tokens is not None:
             redis_client.delete(token_key)
 
+    @classmethod
+    def revoke_all(cls, user: User) -> None:
+        """ Logs the user out everywhere (``TOKEN_REVOCATION = "denylist"``) with a single UPDATE. """
+        user.tokens_valid_after = timezone.now()
+        User.objects.filter(id=user.id).update(tokens_valid_after=user.tokens_valid_after)
+
+    @classmethod
+    def revoke(cls, token: Token) -> None:
+        TokenDenylist.deny(token[settings.SIMPLE_JWT["JTI_CLAIM"]])
+
+    @classmethod
+    def is_revoked(cls, user: User, token: Token) -> bool:
+        # iat has whole seconds, so tokens issued in the second of a revoke_all stay valid
+        if user.tokens_valid_after is not None and token.get("iat", 0) < int(user.tokens_valid_after.timestamp()):
+            return True
+
+        return TokenDenylist.is_denied(token[settings.SIMPLE_JWT["JTI_CLAIM"]])
+
+
+class TokenDenylist:
+    """
+    Ids (``jti``) of revoked access tokens, mirrored into a process-local Bloom filter.
+
+    Redis keeps them in a sorted set scored by the revocation time on Redis' clock. A process pulls the
+    entries added since its last pull at most every ``TOKEN_DENYLIST_SYNC_INTERVAL`` seconds, so checking
+    a token that was never revoked costs no I/O and only a filter hit is confirmed with ZSCORE. Entries
+    outlive their tokens by at most one access-token lifetime, and the filter is rebuilt as often, so it
+    only holds live entries.
+
+    While Redis is unreachable the last copy is used; a filter hit is then treated as revoked.
+    """
+
+    KEY = "tokens:denylist"
+
+    DENY_SCRIPT = """
+    local clock = redis.call('TIME')
+    local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - tonumber(ARGV[2]))
+    redis.call('ZADD', KEYS[1], now, ARGV[1])
+    return tostring(now)
+    """
+
+    bloom: BloomFilter | None = None
+    synced_score: float = float("-inf")
+    synced_at: float = float("-inf")
+    built_at: float = float("-inf")
+    lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def get_redis_conn(cls) -> redis.Redis:
+        return redis.Redis.from_url(settings.REDIS_URL)
+
+    @staticmethod
+    def get_lifetime() -> float:
+        return settings.SIMPLE_JWT["ACCESS_TOKEN_LIFETIME"].total_seconds()
+
+    @classmethod
+    def deny(cls, jti: str) -> None:
+        cls.get_redis_conn().eval(cls.DENY_SCRIPT, 1, cls.KEY, jti, cls.get_lifetime())
+
+        # the revoking process does not wait for its next pull
+        bloom: BloomFilter | None = cls.bloom
+        if bloom is not None:
+            bloom.add(jti)
+
+    @classmethod
+    def get_filter(cls) -> BloomFilter:
+        bloom: BloomFilter | None = cls.bloom
+        if bloom is not None and time.monotonic() - cls.synced_at < settings.TOKEN_DENYLIST_SYNC_INTERVAL:
+            return bloom
+
+        with cls.lock:
+            now: float = time.monotonic()
+            rebuild: bool = (
+                    cls.bloom is None
+                    or now - cls.built_at >= cls.get_lifetime()
+                    or cls.bloom.count >= cls.bloom.capacity
+            )
+
+            try:
+                if rebuild:
+                    entries: list[tuple[bytes, float]] = cls.get_redis_conn().zrange(cls.KEY, 0, -1, withscores=True)
+                else:
+                    entries = cls.get_redis_conn().zrangebyscore(cls.KEY, cls.synced_score, "+inf", withscores=True)
+            except redis.RedisError as error:
+                logger.warning(f"Could not sync the token denylist | {error}")
+                if cls.bloom is None:
+                    cls.bloom = BloomFilter(settings.TOKEN_DENYLIST_CAPACITY)
+                cls.synced_at = now
+                return cls.bloom
+
+            if rebuild:
+                cls.bloom = BloomFilter(settings.TOKEN_DENYLIST_CAPACITY)
+                cls.built_at = now
+
+            for jti, score in entries:
+                cls.bloom.add(jti.decode())
+                cls.synced_score = max(cls.synced_score, score)
+
+            cls.synced_at = now
+            return cls.bloom
+
+    @classmethod
+    def is_denied(cls, jti: str) -> bool:
+        if jti not in cls.get_filter():
+            return False
+
+        try:
+            return cls.get_redis_conn().zscore(cls.KEY, jti) is not None
+        except redis.RedisError as error:
+            logger.warning(f"Could not confirm a token denylist hit | {error}")
+            return True
+
 
 class UserService:
 
@@ -71,10 +198,18 @@ class UserService:
             refresh: str = None,
             is_force_add_to_redis: bool = False
     ) -> dict[str, str]:
+        if settings.TOKEN_REVOCATION == "denylist" and is_force_add_to_redis:
+            # revoked before the new pair is issued, so the pair is not older than the cut-off
+            TokenService.revoke_all(user)
+
         if not access or not refresh:
             refresh = RefreshToken.for_user(user)
             access = str(getattr(refresh, "access_token"))
             refresh = str(refresh)
+
+        if settings.TOKEN_REVOCATION == "denylist":
+            return {"access": access, "refresh": refresh}
+
         valid_access_tokens = TokenService.get_valid_tokens(
             user_id=user.id, token_type=TokenType.ACCESS
         )
@@ -98,6 +233,33 @@ class UserService:
             )
         return {"access": access, "refresh": refresh}
 
+    @classmethod
+    def search(cls, query: str, prefix: bool = False) -> QuerySet[User]:
+        """
+        Active users whose username or full name (in any language) matches ``query``.
+
+        ``prefix`` is the autocomplete mode (``istartswith``); otherwise matches are substrings or similar
+        words, ranked by the best trigram word similarity. On PostgreSQL both compare ``UPPER(column)``, the
+        expression the ``user_<field>_trgm`` GIN indexes are built on (trigrams ignore case anyway).
+        """
+        queryset: QuerySet[User] = User.objects.filter(is_active=True)
+
+        if prefix:
+            condition: Q = reduce(or_, (Q(**{f"{field}__istartswith": query}) for field in SEARCH_FIELDS))
+            return queryset.filter(condition).order_by("username")
+
+        if connection.vendor != "postgresql":
+            condition: Q = reduce(or_, (Q(**{f"{field}__icontains": query}) for field in SEARCH_FIELDS))
+            return queryset.filter(condition).order_by("username")
+
+        condition: Q = reduce(or_, (
+            Q(**{f"{field}__icontains": query}) | Q(TrigramWordSimilar(Upper(field), query))
+            for field in SEARCH_FIELDS
+        ))
+        return queryset.filter(condition).annotate(
+            similarity=Greatest(*(TrigramWordSimilarity(query, field) for field in SEARCH_FIELDS))
+        ).order_by("-similarity", "id")
+
 
 class SendEmailService:
     @staticmethod
@@ -119,10 +281,28 @@ class SendEmailService:
 
 
 class OTPService:
+    """
+    Six-digit codes for password reset, stored in Redis as a keyed HMAC-SHA256 of ``secret:code``.
+
+    The code lives for two minutes and is worthless without the random ``otp_secret`` returned to the
+    client, so a keyed hash is as safe as a slow password hash here at a fraction of the cost; the
+    ``OTP_MAX_ATTEMPTS`` counter is what stops guessing, and the code is burned when it runs out.
+    """
+
+    KEY_SALT = "users.services.OTPService"
+
     @classmethod
     def get_redis_conn(cls) -> redis.Redis:
         return redis.Redis.from_url(settings.REDIS_URL)
 
+    @staticmethod
+    def attempts_key(email: str) -> str:
+        return f"{email}:otp:attempts"
+
+    @classmethod
+    def hash_otp(cls, otp_secret: str, otp_code: str) -> str:
+        return salted_hmac(cls.KEY_SALT, f"{otp_secret}:{otp_code}", algorithm="sha256").hexdigest()
+
     @classmethod
     def generate_otp(
             cls,
@@ -131,9 +311,9 @@ class OTPService:
             check_if_exists: bool = True
     ) -> tuple[str, str]:
         redis_conn = cls.get_redis_conn()
-        otp_code = "".join(random.choices(string.digits, k=6))
+        otp_code = f"{randbelow(10 ** 6):06d}"
         secret_token = token_urlsafe()
-        otp_hash = make_password(f"{secret_token}:{otp_code}")
+        otp_hash = cls.hash_otp(secret_token, otp_code)
         key = f"{email}:otp"
 
         if check_if_exists and redis_conn.exists(key):
@@ -141,17 +321,528 @@ class OTPService:
             raise OTPException(
                 _("Sizda yaroqli OTP kodingiz bor. {ttl} soniyadan keyin qayta urinib koʻring.").format(ttl=ttl)
             )
-        redis_conn.set(key, otp_hash, ex=expire_in)
+
+        with redis_conn.pipeline() as pipeline:
+            pipeline.set(key, otp_hash, ex=expire_in)
+            pipeline.delete(cls.attempts_key(email))
+            pipeline.execute()
         return otp_code, secret_token
 
     @classmethod
     def check_otp(cls, email: str, otp_code: str, otp_secret: str) -> None:
         redis_conn = cls.get_redis_conn()
-        stored_hash = redis_conn.get(f"{email}:otp")
+        key = f"{email}:otp"
+        attempts_key = cls.attempts_key(email)
 
-        if not stored_hash or not check_password(f"{otp_secret}:{otp_code}", stored_hash.decode()):
+        with redis_conn.pipeline() as pipeline:
+            pipeline.incr(attempts_key)
+            pipeline.ttl(key)
+            pipeline.get(key)
+            attempts, ttl, stored_hash = pipeline.execute()
+
+        # the counter never outlives the code it guards
+        redis_conn.expire(attempts_key, max(ttl, 1))
+
+        if not stored_hash:
+            raise OTPException(_("Yaroqsiz OTP kodi."))
+
+        if attempts > settings.OTP_MAX_ATTEMPTS:
+            redis_conn.delete(key, attempts_key)
+            raise OTPException(_("Urinishlar soni tugadi. Yangi OTP kodini soʻrang."))
+
+        if not constant_time_compare(cls.hash_otp(otp_secret, otp_code), stored_hash.decode()):
             raise OTPException(_("Yaroqsiz OTP kodi."))
 
     @classmethod
     def generate_token(cls) -> str:
-        return str(uuid.uuid4())
+        return token_urlsafe()
+
+
+class NotificationService:
+    """
+    Queue-backed notification delivery.
+
+    Views only push small JSON events onto a Redis list; the ``process_notifications`` worker moves them in
+    batches to a processing list, coalesces follow events per recipient, fans article events out to followers
+    with ``bulk_create`` and only then acks the batch. ``sweep`` enforces the inbox cap and the retention period.
+    """
+
+    EVENTS_KEY = "notifications:events"
+    PROCESSING_KEY = "notifications:processing"
+    FOLLOW = "follow"
+    ARTICLE_PUBLISHED = "article_published"
+
+    # counters are only adjusted while cached; a missing key is recounted from the table on the next read
+    ADJUST_UNREAD_COUNT_SCRIPT = """
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return false
+    end
+    local count = redis.call('INCRBY', KEYS[1], ARGV[1])
+    if count < 0 then
+        redis.call('DEL', KEYS[1])
+    end
+    return count
+    """
+
+    # a batch left over by a failed run is retried, topped up with new events to ARGV[1]
+    TAKE_EVENTS_SCRIPT = """
+    local missing = tonumber(ARGV[1]) - redis.call('LLEN', KEYS[2])
+    for _ = 1, missing do
+        if not redis.call('LMOVE', KEYS[1], KEYS[2], 'LEFT', 'RIGHT') then
+            break
+        end
+    end
+    return redis.call('LRANGE', KEYS[2], 0, -1)
+    """
+
+    @classmethod
+    def get_redis_conn(cls) -> redis.Redis:
+        return redis.Redis.from_url(settings.REDIS_URL)
+
+    @staticmethod
+    def channel_name(user_id: int) -> str:
+        return f"notifications:user:{user_id}"
+
+    @staticmethod
+    def unread_count_key(user_id: int) -> str:
+        return f"notifications:user:{user_id}:unread"
+
+    @classmethod
+    def get_unread_count(cls, user_id: int) -> int:
+        redis_conn = cls.get_redis_conn()
+        key = cls.unread_count_key(user_id)
+
+        cached = redis_conn.get(key)
+        if cached is not None:
+            return int(cached)
+
+        count: int = Notification.objects.filter(user_id=user_id, read=False).count()
+        redis_conn.set(key, count, ex=settings.NOTIFICATION_UNREAD_COUNT_TTL)
+        return count
+
+    @classmethod
+    def invalidate_unread_count(cls, user_id: int) -> None:
+        cls.get_redis_conn().delete(cls.unread_count_key(user_id))
+
+    @classmethod
+    def adjust_unread_counts(cls, deltas: dict[int, int]) -> None:
+        pipeline = cls.get_redis_conn().pipeline(transaction=False)
+
+        for user_id, delta in deltas.items():
+            if delta:
+                pipeline.eval(cls.ADJUST_UNREAD_COUNT_SCRIPT, 1, cls.unread_count_key(user_id), delta)
+
+        pipeline.execute()
+
+    @classmethod
+    def mark_read(cls, user_id: int, up_to_id: int | None = None, ids: list[int] | None = None) -> int:
+        """ Marks the user's unread notifications read with a single ``UPDATE`` and returns the affected rows. """
+        queryset: QuerySet[Notification] = Notification.objects.filter(user_id=user_id, read=False)
+
+        if up_to_id is not None:
+            queryset = queryset.filter(id__lte=up_to_id)
+        if ids is not None:
+            queryset = queryset.filter(id__in=ids)
+
+        updated: int = queryset.update(read=True, read_at=timezone.now())
+        cls.adjust_unread_counts({user_id: -updated})
+        return updated
+
+    @classmethod
+    def mark_unread(cls, user_id: int, ids: list[int]) -> int:
+        updated: int = Notification.objects.filter(user_id=user_id, read=True, id__in=ids).update(read=False,
+                                                                                                   read_at=None)
+        cls.adjust_unread_counts({user_id: updated})
+        return updated
+
+    @classmethod
+    def publish(cls, notifications: list[Notification]) -> None:
+        """ Pushes notifications to the open streams of their users. """
+        if not notifications:
+            return
+
+        pipeline = cls.get_redis_conn().pipeline(transaction=False)
+
+        for notification, data in zip(notifications, NotificationSerializer(notifications, many=True).data):
+            pipeline.publish(cls.channel_name(notification.user_id), json.dumps(data))
+
+        pipeline.execute()
+
+    @classmethod
+    def count_by_user(cls, notifications: list[Notification]) -> dict[int, int]:
+        counts: defaultdict[int, int] = defaultdict(int)
+
+        for notification in notifications:
+            counts[notification.user_id] += 1
+
+        return counts
+
+    @classmethod
+    def enqueue(cls, event_type: str, **payload: Any) -> None:
+        cls.get_redis_conn().rpush(cls.EVENTS_KEY, json.dumps({"type": event_type, **payload}))
+
+    @classmethod
+    def notify_follow(cls, follower: User, followee: User) -> None:
+        cls.enqueue(cls.FOLLOW, user_id=followee.id, username=follower.username)
+
+    @classmethod
+    def notify_follows(cls, follower: User, followee_ids: list[int]) -> None:
+        if not followee_ids:
+            return
+
+        cls.get_redis_conn().rpush(cls.EVENTS_KEY, *(
+            json.dumps({"type": cls.FOLLOW, "user_id": followee_id, "username": follower.username})
+            for followee_id in followee_ids
+        ))
+
+    @classmethod
+    def notify_article_published(cls, article_id: int, author_id: int, title: str) -> None:
+        cls.enqueue(cls.ARTICLE_PUBLISHED, article_id=article_id, author_id=author_id, title=title)
+
+    @classmethod
+    def take_events(cls, limit: int, timeout: int = 0) -> list[dict[str, Any]]:
+        """ Moves up to ``limit`` events to the processing list and returns it; ``ack_events`` drops it. """
+        redis_conn = cls.get_redis_conn()
+        raw_events: list[bytes] = redis_conn.eval(cls.TAKE_EVENTS_SCRIPT, 2, cls.EVENTS_KEY, cls.PROCESSING_KEY, limit)
+
+        if not raw_events and timeout:
+            if redis_conn.blmove(cls.EVENTS_KEY, cls.PROCESSING_KEY, timeout, "LEFT", "RIGHT") is None:
+                return []
+            raw_events = redis_conn.eval(cls.TAKE_EVENTS_SCRIPT, 2, cls.EVENTS_KEY, cls.PROCESSING_KEY, limit)
+
+        return [json.loads(raw_event) for raw_event in raw_events]
+
+    @classmethod
+    def ack_events(cls) -> None:
+        cls.get_redis_conn().delete(cls.PROCESSING_KEY)
+
+    @classmethod
+    def deliver(cls, created: list[Notification], updated: list[Notification] = ()) -> None:
+        """ Counts ``created`` as unread and pushes both to the open streams once the batch commits. """
+        if not created and not updated:
+            return
+
+        def send() -> None:
+            cls.adjust_unread_counts(cls.count_by_user(created))
+            cls.publish([*created, *updated])
+
+        # robust: a Redis error must not fail a batch that is already written, or its retry would write it again
+        transaction.on_commit(send, robust=True)
+
+    @classmethod
+    def process_events(cls, events: list[dict[str, Any]]) -> int:
+        """
+        Writes the notifications of a batch in one transaction, so a batch retried after a failure is never
+        written twice; counters and streams are only updated after the commit.
+        """
+        followers_by_user: defaultdict[int, list[str]] = defaultdict(list)
+        published: list[dict[str, Any]] = []
+
+        for event in events:
+            if event["type"] == cls.FOLLOW:
+                followers_by_user[event["user_id"]].append(event["username"])
+            elif event["type"] == cls.ARTICLE_PUBLISHED:
+                published.append(event)
+
+        with transaction.atomic():
+            return cls.coalesce_follows(followers_by_user) + cls.fan_out_articles(published)
+
+    @staticmethod
+    def follow_message(count: int, username: str) -> str:
+        if count == 1:
+            return f"{username} sizga follow qildi."
+        return f"{count} kishi sizga follow qildi."
+
+    @classmethod
+    def coalesce_follows(cls, followers_by_user: dict[int, list[str]]) -> int:
+        if not followers_by_user:
+            return 0
+
+        group_keys: dict[int, str] = {user_id: f"{cls.FOLLOW}:{user_id}" for user_id in followers_by_user}
+        # the recipients narrow the lookup to notification_unread_idx; group_key alone has no index
+        unread: dict[str, Notification] = {
+            notification.group_key: notification
+            for notification in Notification.objects.filter(user_id__in=group_keys, group_key__in=group_keys.values(),
+                                                             read=False)
+        }
+
+        now = timezone.now()
+        created: list[Notification] = []
+        updated: list[Notification] = []
+
+        for user_id, usernames in followers_by_user.items():
+            notification: Notification | None = unread.get(group_keys[user_id])
+
+            if notification is None:
+                created.append(Notification(user_id=user_id, group_key=group_keys[user_id], count=len(usernames),
+                                            message=cls.follow_message(len(usernames), usernames[-1])))
+                continue
+
+            notification.count += len(usernames)
+            notification.message = cls.follow_message(notification.count, usernames[-1])
+            notification.created_at = now
+            updated.append(notification)
+
+        Notification.objects.bulk_create(created, batch_size=settings.NOTIFICATION_BATCH_SIZE)
+        Notification.objects.bulk_update(updated, ["count", "message", "created_at"],
+                                         batch_size=settings.NOTIFICATION_BATCH_SIZE)
+        cls.deliver(created, updated)
+
+        return len(created)
+
+    @classmethod
+    def fan_out_articles(cls, events: list[dict[str, Any]]) -> int:
+        if not events:
+            return 0
+
+        batch_size: int = settings.NOTIFICATION_BATCH_SIZE
+        authors: dict[int, str] = dict(
+            User.objects.filter(id__in={event["author_id"] for event in events}).values_list("id", "username"))
+        created: int = 0
+
+        for event in events:
+            message: str = f"{authors.get(event['author_id'], '')} yangi maqola chop etdi: {event['title']}"
+            follower_ids: QuerySet = Follow.objects.filter(followee_id=event["author_id"]).order_by().values_list(
+                "follower_id", flat=True)
+
+            batch: list[Notification] = []
+            for follower_id in follower_ids.iterator(chunk_size=batch_size):
+                batch.append(Notification(user_id=follower_id, message=message))
+
+                if len(batch) == batch_size:
+                    created += len(Notification.objects.bulk_create(batch))
+                    cls.deliver(batch)
+                    batch = []
+
+            created += len(Notification.objects.bulk_create(batch))
+            cls.deliver(batch)
+
+        return created
+
+    @classmethod
+    def sweep(cls, inbox_size: int, retention_days: int) -> int:
+        deleted: int = Notification.objects.filter(
+            read=True,
+            created_at__lt=timezone.now() - datetime.timedelta(days=retention_days)
+        ).delete()[0]
+
+        overflowing: QuerySet = Notification.objects.order_by().values("user_id").annotate(
+            total=Count("id")).filter(total__gt=inbox_size).values_list("user_id", flat=True)
+
+        for user_id in overflowing.iterator():
+            stale_ids: QuerySet = Notification.objects.filter(user_id=user_id).order_by(
+                "-created_at", "-id").values_list("id", flat=True)[inbox_size:]
+            deleted += Notification.objects.filter(id__in=list(stale_ids)).delete()[0]
+            cls.invalidate_unread_count(user_id)
+
+        return deleted
+
+
+class FollowService:
+    """
+    Follow graph stored in the ``follow`` table and mirrored into Redis sets.
+
+    ``follow:user:<id>:followers`` and ``follow:user:<id>:followings`` hold user ids plus a sentinel member, so
+    a loaded but empty set still exists and a count is ``SCARD - 1``. Sets are loaded from the table on first
+    use and expire after ``FOLLOW_GRAPH_CACHE_TTL``; writes only touch sets that are already loaded.
+
+    Every write also bumps the set's ``:version`` key. A load reads the versions before the table and stores a
+    set only if its version is unchanged and no other load stored it first, so rows read before a concurrent
+    follow or unfollow are never cached.
+    """
+
+    FOLLOWERS = "followers"
+    FOLLOWINGS = "followings"
+    SENTINEL = "-"
+
+    # a set missing from Redis is left alone and loaded from the table on the next read
+    UPDATE_SET_SCRIPT = """
+    redis.call('INCR', KEYS[2])
+    redis.call('EXPIRE', KEYS[2], ARGV[2])
+    if redis.call('EXISTS', KEYS[1]) == 0 then
+        return false
+    end
+    return redis.call(ARGV[1], KEYS[1], unpack(ARGV, 3))
+    """
+
+    # in one script, so a reader never sees a set that has the sentinel but not all of its members
+    STORE_SET_SCRIPT = """
+    if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] or redis.call('EXISTS', KEYS[1]) == 1 then
+        return 0
+    end
+    redis.call('SADD', KEYS[1], unpack(ARGV, 3))
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+    return 1
+    """
+
+    @classmethod
+    def get_redis_conn(cls) -> redis.Redis:
+        return redis.Redis.from_url(settings.REDIS_URL)
+
+    @staticmethod
+    def set_key(user_id: int, direction: str) -> str:
+        return f"follow:user:{user_id}:{direction}"
+
+    @staticmethod
+    def version_key(user_id: int, direction: str) -> str:
+        return f"follow:user:{user_id}:{direction}:version"
+
+    @classmethod
+    def read_members(cls, direction: str, user_ids: list[int]) -> dict[int, set[int]]:
+        if direction == cls.FOLLOWERS:
+            pairs: QuerySet = Follow.objects.filter(followee_id__in=user_ids).values_list("followee_id", "follower_id")
+        else:
+            pairs: QuerySet = Follow.objects.filter(follower_id__in=user_ids).values_list("follower_id", "followee_id")
+
+        members: dict[int, set[int]] = {user_id: set() for user_id in user_ids}
+        for user_id, member_id in pairs.order_by().iterator():
+            members[user_id].add(member_id)
+
+        return members
+
+    @classmethod
+    def load(cls, direction: str, user_ids: list[int]) -> dict[int, set[int]]:
+        """ Reads the sets of ``user_ids`` from the table in one query and stores them in Redis. """
+        redis_conn = cls.get_redis_conn()
+        # read before the table, so a write committed after the table read changes them
+        versions: list[bytes | None] = redis_conn.mget([cls.version_key(user_id, direction) for user_id in user_ids])
+        members: dict[int, set[int]] = cls.read_members(direction, user_ids)
+
+        pipeline = redis_conn.pipeline(transaction=False)
+        for user_id, version in zip(user_ids, versions):
+            pipeline.eval(cls.STORE_SET_SCRIPT, 2, cls.set_key(user_id, direction), cls.version_key(user_id, direction),
+                          version or b"", settings.FOLLOW_GRAPH_CACHE_TTL, cls.SENTINEL, *members[user_id])
+        pipeline.execute()
+
+        return members
+
+    @classmethod
+    def get_members(cls, direction: str, user_ids: list[int]) -> dict[int, set[int]]:
+        pipeline = cls.get_redis_conn().pipeline(transaction=False)
+        for user_id in user_ids:
+            pipeline.smembers(cls.set_key(user_id, direction))
+
+        members: dict[int, set[int]] = {}
+        missing: list[int] = []
+
+        for user_id, raw_members in zip(user_ids, pipeline.execute()):
+            if cls.SENTINEL.encode() not in raw_members:
+                missing.append(user_id)
+                continue
+
+            raw_members.discard(cls.SENTINEL.encode())
+            members[user_id] = {int(member) for member in raw_members}
+
+        if missing:
+            members.update(cls.load(direction, missing))
+
+        return members
+
+    @classmethod
+    def get_counts(cls, user_id: int) -> dict[str, int]:
+        directions: tuple[str, str] = cls.FOLLOWERS, cls.FOLLOWINGS
+
+        pipeline = cls.get_redis_conn().pipeline(transaction=False)
+        for direction in directions:
+            pipeline.sismember(cls.set_key(user_id, direction), cls.SENTINEL)
+            pipeline.scard(cls.set_key(user_id, direction))
+        results: list = pipeline.execute()
+
+        counts: dict[str, int] = {}
+        for index, direction in enumerate(directions):
+            loaded, size = results[index * 2], results[index * 2 + 1]
+            counts[direction] = size - 1 if loaded else len(cls.load(direction, [user_id])[user_id])
+
+        return counts
+
+    @classmethod
+    def is_following(cls, follower_id: int, user_ids: list[int]) -> dict[int, bool]:
+        # the sentinel is checked in the same SMISMEMBER, so a loaded set answers in one round trip
+        flags: list[int] = cls.get_redis_conn().smismember(cls.set_key(follower_id, cls.FOLLOWINGS),
+                                                           [cls.SENTINEL, *user_ids])
+        if flags[0]:
+            return {user_id: bool(flag) for user_id, flag in zip(user_ids, flags[1:])}
+
+        followings: set[int] = cls.load(cls.FOLLOWINGS, [follower_id])[follower_id]
+        return {user_id: user_id in followings for user_id in user_ids}
+
+    @classmethod
+    def update_sets(cls, command: str, follower_id: int, user_ids: list[int]) -> None:
+        if not user_ids:
+            return
+
+        ttl: int = settings.FOLLOW_GRAPH_CACHE_TTL
+        pipeline = cls.get_redis_conn().pipeline(transaction=False)
+        pipeline.eval(cls.UPDATE_SET_SCRIPT, 2, cls.set_key(follower_id, cls.FOLLOWINGS),
+                      cls.version_key(follower_id, cls.FOLLOWINGS), command, ttl, *user_ids)
+        for user_id in user_ids:
+            pipeline.eval(cls.UPDATE_SET_SCRIPT, 2, cls.set_key(user_id, cls.FOLLOWERS),
+                          cls.version_key(user_id, cls.FOLLOWERS), command, ttl, follower_id)
+        pipeline.execute()
+
+    @classmethod
+    def follow(cls, follower: User, user_ids: list[int]) -> tuple[list[int], list[int]]:
+        """
+        Follows the existing users of ``user_ids`` with one lookup and one ``INSERT``.
+
+        Returns the newly followed ids and the ids that were already followed; unknown ids are in neither.
+        """
+        users: QuerySet = User.objects.filter(id__in=user_ids).annotate(
+            followed=Exists(Follow.objects.filter(follower_id=follower.id, followee_id=OuterRef("pk")))
+        ).order_by().values_list("id", "followed")
+
+        followed: list[int] = []
+        already_following: list[int] = []
+        for user_id, is_followed in users:
+            (already_following if is_followed else followed).append(user_id)
+
+        Follow.objects.bulk_create([Follow(follower_id=follower.id, followee_id=user_id) for user_id in followed],
+                                   ignore_conflicts=True)
+        cls.update_sets("SADD", follower.id, followed)
+        NotificationService.notify_follows(follower, followed)
+
+        return followed, already_following
+
+    @classmethod
+    def unfollow(cls, follower_id: int, user_ids: list[int]) -> int:
+        deleted: int = Follow.objects.filter(follower_id=follower_id, followee_id__in=user_ids).delete()[0]
+
+        if deleted:
+            cls.update_sets("SREM", follower_id, user_ids)
+
+        return deleted
+
+    @classmethod
+    def mutual_follows(cls, user_id: int) -> set[int]:
+        """ Users that follow ``user_id`` and are followed back. """
+        followers_key: str = cls.set_key(user_id, cls.FOLLOWERS)
+        followings_key: str = cls.set_key(user_id, cls.FOLLOWINGS)
+
+        pipeline = cls.get_redis_conn().pipeline(transaction=False)
+        pipeline.sismember(followers_key, cls.SENTINEL)
+        pipeline.sismember(followings_key, cls.SENTINEL)
+        pipeline.sinter(followers_key, followings_key)
+        followers_loaded, followings_loaded, mutual = pipeline.execute()
+
+        if followers_loaded and followings_loaded:
+            mutual.discard(cls.SENTINEL.encode())
+            return {int(member) for member in mutual}
+
+        return (cls.get_members(cls.FOLLOWERS, [user_id])[user_id]
+                & cls.get_members(cls.FOLLOWINGS, [user_id])[user_id])
+
+    @classmethod
+    def suggested_authors(cls, user_id: int, limit: int) -> list[int]:
+        """
+        Authors followed by the people ``user_id`` follows, ranked by how many of them follow each author,
+        i.e. by the size of ``followers(author) & followings(user_id)``.
+        """
+        followings: set[int] = cls.get_members(cls.FOLLOWINGS, [user_id])[user_id]
+        sample: list[int] = list(followings)[:settings.FOLLOW_SUGGESTIONS_SAMPLE_SIZE]
+
+        scores: Counter[int] = Counter()
+        for member_ids in cls.get_members(cls.FOLLOWINGS, sample).values():
+            scores.update(member_ids - followings)
+
+        scores.pop(user_id, None)
+        return [author_id for author_id, _ in scores.most_common(limit)]
@@ -0,0 +1,142 @@
+import asyncio
+import json
+from collections import defaultdict
+from typing import AsyncIterator, Any
+from weakref import WeakKeyDictionary
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpRequest, JsonResponse, StreamingHttpResponse, HttpResponse
+from redis import asyncio as aioredis
+from rest_framework.exceptions import AuthenticationFailed
+
+from .authentications import CustomJWTAuthentication
+from .models import CustomUser
+from .services import NotificationService
+
+
+class NotificationBroker:
+    """
+    Shares one Redis pub/sub connection between every notification stream of an event loop.
+
+    A user channel is subscribed while at least one local stream listens to it, and each message is
+    copied into the bounded queues of those streams, so an idle stream costs a queue instead of a
+    Redis connection.
+    """
+
+    def __init__(self) -> None:
+        self.pubsub: aioredis.client.PubSub = aioredis.Redis.from_url(settings.REDIS_URL).pubsub()
+        self.listeners: defaultdict[str, set[asyncio.Queue]] = defaultdict(set)
+        self.lock: asyncio.Lock = asyncio.Lock()
+        self.reader: asyncio.Task | None = None
+
+    async def subscribe(self, channel: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.NOTIFICATION_STREAM_QUEUE_SIZE)
+
+        async with self.lock:
+            if not self.listeners[channel]:
+                await self.pubsub.subscribe(channel)
+            self.listeners[channel].add(queue)
+
+            if self.reader is None or self.reader.done():
+                self.reader = asyncio.create_task(self.read())
+
+        return queue
+
+    async def unsubscribe(self, channel: str, queue: asyncio.Queue) -> None:
+        async with self.lock:
+            self.listeners[channel].discard(queue)
+
+            if not self.listeners[channel]:
+                del self.listeners[channel]
+                await self.pubsub.unsubscribe(channel)
+
+    async def read(self) -> None:
+        while self.listeners:
+            message: dict[str, Any] | None = await self.pubsub.get_message(ignore_subscribe_messages=True,
+                                                                         timeout=1.0)
+            if message is None:
+                continue
+
+            for queue in tuple(self.listeners.get(message["channel"].decode(), ())):
+                # a client that stopped reading loses messages instead of growing memory
+                if not queue.full():
+                    queue.put_nowait(message["data"])
+
+
+brokers: WeakKeyDictionary[asyncio.AbstractEventLoop, NotificationBroker] = WeakKeyDictionary()
+
+
+def get_broker() -> NotificationBroker:
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+
+    if loop not in brokers:
+        brokers[loop] = NotificationBroker()
+
+    return brokers[loop]
+
+
+def format_event(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+def authenticate(request: HttpRequest) -> CustomUser | None:
+    # EventSource cannot send headers, so the access token may also come as ?token=
+    token: str | None = request.GET.get("token")
+    if token and "HTTP_AUTHORIZATION" not in request.META:
+        request.META["HTTP_AUTHORIZATION"] = f"Bearer {token}"
+
+    try:
+        result = CustomJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return None
+
+    return result[0] if result else None
+
+
+async def notification_events(user_id: int) -> AsyncIterator[str]:
+    broker: NotificationBroker = get_broker()
+    channel: str = NotificationService.channel_name(user_id)
+    queue: asyncio.Queue = await broker.subscribe(channel)
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    # streams are closed periodically and EventSource reconnects, so abandoned connections do not pile up
+    deadline: float = loop.time() + settings.NOTIFICATION_STREAM_LIFETIME
+
+    try:
+        unread_count: int = await sync_to_async(NotificationService.get_unread_count)(user_id)
+        yield "retry: 3000\n\n"
+        yield format_event("unread", json.dumps({"unread_count": unread_count}))
+
+        while loop.time() < deadline:
+            try:
+                data: bytes = await asyncio.wait_for(queue.get(), timeout=settings.NOTIFICATION_STREAM_KEEPALIVE)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            yield format_event("notification", data.decode())
+    finally:
+        await broker.unsubscribe(channel, queue)
+
+
+async def notification_stream(request: HttpRequest) -> HttpResponse:
+    """
+    Server-Sent Events stream of the authenticated user's new notifications.
+
+    Only served under ASGI (the ``medium_stream`` service): a WSGI server, vercel included, would buffer the
+    whole stream and hold a worker for ``NOTIFICATION_STREAM_LIFETIME``. EventSource does not retry a 501.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(data={"detail": "Bildirishnomalar oqimi bu serverda mavjud emas."}, status=501)
+
+    user: CustomUser | None = await sync_to_async(authenticate)(request)
+
+    if user is None:
+        return JsonResponse(data={"detail": "Authentication credentials were not provided."}, status=401)
+
+    response: StreamingHttpResponse = StreamingHttpResponse(notification_events(user.id),
+                                                            content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
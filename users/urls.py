@@ -1,7 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from . import views
+from . import views, streams
 
 router: DefaultRouter = DefaultRouter()
 router.register(prefix=r"notifications", viewset=views.UserNotificationView, basename="notifications")
@@ -11,6 +11,7 @@ urlpatterns: list = [
     path('login/', views.LoginView.as_view(), name='login'),
     path('me/', views.UsersMe.as_view(), name='users-me'),
     path('logout/', views.LogoutView.as_view(), name='logout'),
+    path('logout/all/', views.LogoutAllView.as_view(), name='logout-all'),
     path('password/change/', views.ChangePasswordView.as_view(), name='change-password'),
     path('password/forgot/', views.ForgotPasswordView.as_view(), name='forgot-password'),
     path('password/forgot/verify/<str:otp_secret>/', views.ForgotPasswordVerifyView.as_view(),
@@ -18,9 +19,16 @@ urlpatterns: list = [
     path('password/reset/', views.ResetPasswordView.as_view(), name='reset-password'),
     path('recommend/', views.RecommendationView.as_view(), name='recommendation'),
     path('articles/popular/', views.PopularAuthorsView.as_view(), name='users-top-authors'),
+    path('search/', views.AuthorSearchView.as_view(), name='users-search'),
     path('<int:pk>/follow/', views.AuthorFollowView.as_view(), name='users-follow-unfollow-authors'),
+    path('<int:pk>/follow/counts/', views.FollowCountsView.as_view(), name='users-follow-counts'),
+    path('follow/', views.BulkFollowView.as_view(), name='users-bulk-follow'),
     path('followers/', views.FollowersListView.as_view(), name='users-followers'),
     path('following/', views.FollowingsListView.as_view(), name='users-followings'),
+    path('following/check/', views.FollowingCheckView.as_view(), name='users-following-check'),
+    path('following/mutual/', views.MutualFollowsView.as_view(), name='users-mutual-follows'),
+    path('following/suggested/', views.SuggestedAuthorsView.as_view(), name='users-suggested-authors'),
+    path('notifications/stream/', streams.notification_stream, name='notifications-stream'),
     path('', include(router.urls))
     # path('notifications/', views.UserNotificationView.as_view(), name='notification-list'),
     # path('notifications/<int:pk>/', views.UserNotificationView.as_view(), name='notification-detail'),
@@ -1,14 +1,13 @@
-from secrets import token_urlsafe
 from typing import Type, Any
 
-from django.contrib.auth import authenticate, get_user_model, update_session_auth_hash
-from django.contrib.auth.hashers import make_password
-from django.db.models import Max, QuerySet
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.db.models import Max, QuerySet, Case, When
 from django.http import HttpRequest
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
-from drf_spectacular.utils import extend_schema, extend_schema_view
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse, OpenApiExample, OpenApiParameter
 from rest_framework import status, permissions, generics, parsers, exceptions, viewsets, mixins
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
@@ -17,10 +16,12 @@ from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from articles.models import Article
+from core.serialization import ValuesListModelMixin
 from articles.schemas import no_content_response, bad_request_response, unauthorized_response
 from .authentications import CustomJWTAuthentication
 from .errors import ACTIVE_USER_NOT_FOUND_ERROR_MSG
-from .models import CustomUser, Recommendation, Follow, Notification
+from .models import CustomUser, Recommendation, Notification
+from .pagination import UnreadNotificationPagination, FollowersPagination, FollowingsPagination
 from .serializers import (
     UserSerializer,
     LoginSerializer,
@@ -34,9 +35,19 @@ from .serializers import (
     ForgotPasswordVerifyResponseSerializer,
     ForgotPasswordResponseSerializer,
     RecommendationSerializer,
-    NotificationSerializer
+    NotificationSerializer,
+    UserValuesSerializer,
+    NotificationValuesSerializer,
+    NotificationMarkReadSerializer,
+    NotificationMarkReadResponseSerializer,
+    FollowUserIdsSerializer,
+    BulkFollowResponseSerializer,
+    BulkUnfollowResponseSerializer,
+    FollowCountsSerializer,
+    AuthorSearchSerializer
 )
-from .services import UserService, SendEmailService, OTPService
+from .services import UserService, SendEmailService, OTPService, NotificationService, FollowService, \
+    TokenService
 
 User: Type[CustomUser] = get_user_model()
 
@@ -82,25 +93,19 @@ class SignupView(APIView):
 class LoginView(APIView):
     serializer_class = LoginSerializer
     permission_classes = [permissions.AllowAny]
+    # no authentication: a Basic auth header would otherwise be hashed before the throttle runs
+    authentication_classes = []
+    throttle_scope = 'login'
 
     def post(self, request):
-        serializer = self.serializer_class(data=request.data)
+        serializer = self.serializer_class(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
 
-        user = authenticate(
-            request,
-            username=serializer.validated_data['username'],
-            password=serializer.validated_data['password']
-        )
-
-        if user is not None:
-            refresh = RefreshToken.for_user(user)
-            return Response({
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-            }, status=status.HTTP_200_OK)
-        else:
-            return Response({'detail': 'Hisob maʼlumotlari yaroqsiz'}, status=status.HTTP_401_UNAUTHORIZED)
+        refresh = RefreshToken.for_user(serializer.validated_data['user'])
+        return Response({
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+        }, status=status.HTTP_200_OK)
 
 
 @extend_schema_view(
@@ -153,10 +158,29 @@ class LogoutView(generics.GenericAPIView):
 
     @extend_schema(responses=None)
     def post(self, request, *args, **kwargs):
-        UserService.create_tokens(request.user, access='fake_token', refresh='fake_token', is_force_add_to_redis=True)
+        if settings.TOKEN_REVOCATION == "denylist":
+            if request.auth is not None:
+                TokenService.revoke(request.auth)
+        else:
+            UserService.create_tokens(request.user, access='fake_token', refresh='fake_token',
+                                      is_force_add_to_redis=True)
         return Response({"detail": "Mufaqqiyatli chiqildi."})
 
 
+class LogoutAllView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    @extend_schema(summary="Log out of every device", responses=None)
+    def post(self, request, *args, **kwargs):
+        if settings.TOKEN_REVOCATION == "denylist":
+            TokenService.revoke_all(request.user)
+        else:
+            # the allow-list holds a single token per user, so logging out is logging out everywhere
+            UserService.create_tokens(request.user, access='fake_token', refresh='fake_token',
+                                      is_force_add_to_redis=True)
+        return Response({"detail": "Barcha qurilmalardan chiqildi."})
+
+
 @extend_schema_view(
     put=extend_schema(
         summary="Change user password",
@@ -175,21 +199,16 @@ class ChangePasswordView(APIView):
         serializer = self.serializer_class(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        user = authenticate(
-            request,
-            username=request.user.username,
-            password=serializer.validated_data['old_password']
-        )
-
-        if user is not None:
-            user.set_password(serializer.validated_data['new_password'])
-            user.save()
-            update_session_auth_hash(request, user)
-            tokens = UserService.create_tokens(user, is_force_add_to_redis=True)
-            return Response(tokens)
-        else:
+        # the user is already authenticated, so only the old password is checked, without a second lookup
+        user = request.user
+        if not user.check_password(serializer.validated_data['old_password']):
             raise ValidationError("Eski parol xato.")
 
+        user.set_password(serializer.validated_data['new_password'])
+        user.save()
+        tokens = UserService.create_tokens(user, is_force_add_to_redis=True)
+        return Response(tokens)
+
 
 @extend_schema_view(
     post=extend_schema(
@@ -205,6 +224,7 @@ class ForgotPasswordView(generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = ForgotPasswordRequestSerializer
     authentication_classes = []
+    throttle_scope = 'password_reset'
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -242,6 +262,7 @@ class ForgotPasswordVerifyView(generics.CreateAPIView):
     permission_classes = [permissions.AllowAny]
     serializer_class = ForgotPasswordVerifyRequestSerializer
     authentication_classes = []
+    throttle_scope = 'password_reset'
 
     def post(self, request, *args, **kwargs):
         redis_conn = OTPService.get_redis_conn()
@@ -255,9 +276,10 @@ class ForgotPasswordVerifyView(generics.CreateAPIView):
             raise exceptions.NotFound(ACTIVE_USER_NOT_FOUND_ERROR_MSG)
         OTPService.check_otp(email, otp_code, otp_secret)
         redis_conn.delete(f"{email}:otp")
-        token_hash = make_password(token_urlsafe())
-        redis_conn.set(token_hash, email, ex=2 * 60 * 60)
-        return Response({"token": token_hash})
+        # the token is already an unguessable random key; running it through make_password added nothing
+        token = OTPService.generate_token()
+        redis_conn.set(token, email, ex=2 * 60 * 60)
+        return Response({"token": token})
 
 
 @extend_schema_view(
@@ -275,6 +297,7 @@ class ResetPasswordView(generics.UpdateAPIView):
     permission_classes = [permissions.AllowAny]
     http_method_names = ['patch']
     authentication_classes = []
+    throttle_scope = 'password_reset'
 
     def patch(self, request, *args, **kwargs):
         redis_conn = OTPService.get_redis_conn()
@@ -296,7 +319,6 @@ class ResetPasswordView(generics.UpdateAPIView):
         user.set_password(password)
         user.save()
 
-        update_session_auth_hash(request, user)
         tokens = UserService.create_tokens(user, is_force_add_to_redis=True)
         redis_conn.delete(token_hash)
         return Response(tokens)
@@ -356,8 +378,9 @@ class RecommendationView(APIView):
         }
     )
 )
-class PopularAuthorsView(ListAPIView):
+class PopularAuthorsView(ValuesListModelMixin, ListAPIView):
     serializer_class: Type[UserSerializer] = UserSerializer
+    values_serializer_class: Type[UserValuesSerializer] = UserValuesSerializer
 
     def get_queryset(self) -> QuerySet[CustomUser]:
         articles = Article.objects.exclude(status__in=("trash", "archive"))
@@ -375,6 +398,29 @@ class PopularAuthorsView(ListAPIView):
         return queryset
 
 
+@extend_schema_view(
+    list=extend_schema(
+        summary="Search Authors",
+        request=None,
+        parameters=[AuthorSearchSerializer],
+        responses={
+            200: UserSerializer(many=True),
+            400: bad_request_response
+        }
+    )
+)
+class AuthorSearchView(ValuesListModelMixin, ListAPIView):
+    serializer_class: Type[UserSerializer] = UserSerializer
+    values_serializer_class: Type[UserValuesSerializer] = UserValuesSerializer
+
+    def get_queryset(self) -> QuerySet[CustomUser]:
+        serializer: AuthorSearchSerializer = AuthorSearchSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        return UserService.search(serializer.validated_data["q"],
+                                  prefix=serializer.validated_data["mode"] == "prefix")
+
+
 @extend_schema_view(
     post=extend_schema(
         summary="Follow Author",
@@ -394,16 +440,15 @@ class AuthorFollowView(APIView):
     def post(self, request: HttpRequest, pk: int, *args, **kwargs) -> Response:
         user: CustomUser = request.user
 
-        author: CustomUser = get_object_or_404(CustomUser, pk=pk)
+        followed, already_following = FollowService.follow(follower=user, user_ids=[pk])
 
-        if Follow.objects.filter(followee=author, follower=user).exists():
+        if already_following:
             return Response(data={
                 "detail": "Siz allaqachon ushbu foydalanuvchini kuzatyapsiz."
             }, status=status.HTTP_200_OK)
 
-        Follow.objects.create(followee=author, follower=user)
-
-        Notification.objects.create(user=author, message=f"{user.username} sizga follow qildi.")
+        if not followed:
+            raise exceptions.NotFound("No CustomUser matches the given query.")
 
         return Response(data={
             "detail": "Mofaqqiyatli follow qilindi."
@@ -412,13 +457,109 @@ class AuthorFollowView(APIView):
     def delete(self, request: HttpRequest, pk: int, *args, **kwargs) -> Response:
         user: CustomUser = request.user
 
-        author: CustomUser = get_object_or_404(CustomUser, pk=pk)
+        if not FollowService.unfollow(follower_id=user.id, user_ids=[pk]):
+            raise exceptions.NotFound("No Follow matches the given query.")
 
-        follow: Follow = get_object_or_404(Follow, followee=author, follower=user)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
-        follow.delete()
 
-        return Response(status=status.HTTP_204_NO_CONTENT)
+@extend_schema_view(
+    post=extend_schema(
+        summary="Follow Authors",
+        request=FollowUserIdsSerializer,
+        responses={
+            200: BulkFollowResponseSerializer,
+            400: bad_request_response,
+            401: unauthorized_response
+        }
+    ),
+    delete=extend_schema(
+        summary="Unfollow Authors",
+        request=FollowUserIdsSerializer,
+        responses={
+            200: BulkUnfollowResponseSerializer,
+            400: bad_request_response,
+            401: unauthorized_response
+        }
+    )
+)
+class BulkFollowView(APIView):
+    authentication_classes: tuple[Type[CustomJWTAuthentication]] = CustomJWTAuthentication,
+    permission_classes: tuple[Type[permissions.IsAuthenticated]] = permissions.IsAuthenticated,
+
+    def post(self, request: HttpRequest, *args, **kwargs) -> Response:
+        serializer: FollowUserIdsSerializer = FollowUserIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user: CustomUser = request.user
+        user_ids: list[int] = [user_id for user_id in serializer.validated_data["user_ids"] if user_id != user.id]
+
+        followed, already_following = FollowService.follow(follower=user, user_ids=user_ids)
+
+        return Response(data={
+            "followed": followed,
+            "already_following": already_following
+        }, status=status.HTTP_200_OK)
+
+    def delete(self, request: HttpRequest, *args, **kwargs) -> Response:
+        serializer: FollowUserIdsSerializer = FollowUserIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user: CustomUser = request.user
+        unfollowed: int = FollowService.unfollow(follower_id=user.id, user_ids=serializer.validated_data["user_ids"])
+
+        return Response(data={"unfollowed": unfollowed}, status=status.HTTP_200_OK)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Is Following",
+        request=None,
+        parameters=[OpenApiParameter(name="user_ids", description="Comma separated user ids", required=True)],
+        responses={
+            200: OpenApiResponse(description="Following flag per requested user id",
+                                 examples=[OpenApiExample(name="Flags", value={"1": True, "2": False})]),
+            400: bad_request_response,
+            401: unauthorized_response
+        }
+    )
+)
+class FollowingCheckView(APIView):
+    authentication_classes: tuple[Type[CustomJWTAuthentication]] = CustomJWTAuthentication,
+    permission_classes: tuple[Type[permissions.IsAuthenticated]] = permissions.IsAuthenticated,
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> Response:
+        user_ids: list[str] = [user_id for user_id in request.query_params.get("user_ids", "").split(",") if user_id]
+
+        serializer: FollowUserIdsSerializer = FollowUserIdsSerializer(data={"user_ids": user_ids})
+        serializer.is_valid(raise_exception=True)
+
+        user: CustomUser = request.user
+        return Response(data=FollowService.is_following(user.id, serializer.validated_data["user_ids"]),
+                        status=status.HTTP_200_OK)
+
+
+@extend_schema_view(
+    get=extend_schema(
+        summary="Follow Counts",
+        request=None,
+        responses={
+            200: FollowCountsSerializer,
+            404: "No CustomUser matches the given query."
+        }
+    )
+)
+class FollowCountsView(APIView):
+    permission_classes: tuple[Type[permissions.AllowAny]] = permissions.AllowAny,
+
+    def get(self, request: HttpRequest, pk: int, *args, **kwargs) -> Response:
+        author: CustomUser = get_object_or_404(CustomUser.objects.only("id"), pk=pk)
+        counts: dict[str, int] = FollowService.get_counts(author.id)
+
+        return Response(data={
+            "followers_count": counts[FollowService.FOLLOWERS],
+            "followings_count": counts[FollowService.FOLLOWINGS]
+        }, status=status.HTTP_200_OK)
 
 
 @extend_schema_view(
@@ -431,10 +572,12 @@ class AuthorFollowView(APIView):
         }
     )
 )
-class FollowersListView(ListAPIView):
+class FollowersListView(ValuesListModelMixin, ListAPIView):
     serializer_class: Type[UserSerializer] = UserSerializer
+    values_serializer_class: Type[UserValuesSerializer] = UserValuesSerializer
     authentication_classes: tuple[Type[CustomJWTAuthentication]] = CustomJWTAuthentication,
     permission_classes: tuple[Type[permissions.IsAuthenticated]] = permissions.IsAuthenticated,
+    pagination_class: Type[FollowersPagination] = FollowersPagination
 
     def get_queryset(self) -> QuerySet[CustomUser]:
         author: CustomUser = self.request.user
@@ -452,10 +595,12 @@ class FollowersListView(ListAPIView):
         }
     )
 )
-class FollowingsListView(ListAPIView):
+class FollowingsListView(ValuesListModelMixin, ListAPIView):
     serializer_class: Type[UserSerializer] = UserSerializer
+    values_serializer_class: Type[UserValuesSerializer] = UserValuesSerializer
     authentication_classes: tuple[Type[CustomJWTAuthentication]] = CustomJWTAuthentication,
     permission_classes: tuple[permissions.IsAuthenticated] = permissions.IsAuthenticated,
+    pagination_class: Type[FollowingsPagination] = FollowingsPagination
 
     def get_queryset(self) -> QuerySet[CustomUser]:
         user: CustomUser = self.request.user
@@ -463,6 +608,55 @@ class FollowingsListView(ListAPIView):
         return CustomUser.objects.filter(followers__follower=user)
 
 
+@extend_schema_view(
+    list=extend_schema(
+        summary="Mutual Follows",
+        request=None,
+        responses={
+            200: UserSerializer(many=True),
+            401: unauthorized_response
+        }
+    )
+)
+class MutualFollowsView(ValuesListModelMixin, ListAPIView):
+    serializer_class: Type[UserSerializer] = UserSerializer
+    values_serializer_class: Type[UserValuesSerializer] = UserValuesSerializer
+    authentication_classes: tuple[Type[CustomJWTAuthentication]] = CustomJWTAuthentication,
+    permission_classes: tuple[Type[permissions.IsAuthenticated]] = permissions.IsAuthenticated,
+
+    def get_queryset(self) -> QuerySet[CustomUser]:
+        user: CustomUser = self.request.user
+
+        return CustomUser.objects.filter(id__in=FollowService.mutual_follows(user.id))
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="Suggested Authors",
+        request=None,
+        responses={
+            200: UserSerializer(many=True),
+            401: unauthorized_response
+        }
+    )
+)
+class SuggestedAuthorsView(ValuesListModelMixin, ListAPIView):
+    serializer_class: Type[UserSerializer] = UserSerializer
+    values_serializer_class: Type[UserValuesSerializer] = UserValuesSerializer
+    authentication_classes: tuple[Type[CustomJWTAuthentication]] = CustomJWTAuthentication,
+    permission_classes: tuple[Type[permissions.IsAuthenticated]] = permissions.IsAuthenticated,
+    pagination_class: None = None
+
+    def get_queryset(self) -> QuerySet[CustomUser]:
+        user: CustomUser = self.request.user
+        author_ids: list[int] = FollowService.suggested_authors(user.id, limit=settings.FOLLOW_SUGGESTIONS_LIMIT)
+
+        # keep the ranking computed by the follow graph
+        return CustomUser.objects.filter(id__in=author_ids).order_by(
+            Case(*(When(id=author_id, then=position) for position, author_id in enumerate(author_ids)))
+        )
+
+
 @extend_schema_view(
     list=extend_schema(
         summary="User Notifications",
@@ -482,11 +676,14 @@ class FollowingsListView(ListAPIView):
         }
     )
 )
-class UserNotificationView(mixins.RetrieveModelMixin,
+class UserNotificationView(ValuesListModelMixin,
+                           mixins.RetrieveModelMixin,
                            mixins.ListModelMixin,
                            mixins.UpdateModelMixin,
                            viewsets.GenericViewSet):
     serializer_class: Type[NotificationSerializer] = NotificationSerializer
+    values_serializer_class: Type[NotificationValuesSerializer] = NotificationValuesSerializer
+    pagination_class: Type[UnreadNotificationPagination] = UnreadNotificationPagination
 
     authentication_classes: tuple[Type[CustomJWTAuthentication]] = CustomJWTAuthentication,
     permission_classes: tuple[Type[permissions.IsAuthenticated]] = permissions.IsAuthenticated,
@@ -509,13 +706,58 @@ class UserNotificationView(mixins.RetrieveModelMixin,
         }
     )
     def partial_update(self, request: HttpRequest, pk: int, *args, **kwargs) -> Response:
-        notification: Notification = get_object_or_404(klass=self.get_queryset(), pk=pk)
+        serializer: NotificationSerializer = self.get_serializer(data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
 
-        super().partial_update(request=request, *args, **kwargs)
+        user: CustomUser = request.user
+        read: bool | None = serializer.validated_data.get("read")
 
-        if Notification.objects.get(pk=pk).read:
-            notification.read = True
-            notification.read_at = timezone.now()
-            notification.save()
+        if read is True:
+            updated: int = NotificationService.mark_read(user.id, ids=[pk])
+        elif read is False:
+            updated: int = NotificationService.mark_unread(user.id, ids=[pk])
+        else:
+            updated: int = 0
+
+        if not updated and not Notification.objects.filter(pk=pk, user=user).exists():
+            return Response(data={"detail": "No Notification matches the given query."},
+                            status=status.HTTP_404_NOT_FOUND)
 
         return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @extend_schema(
+        summary="Mark Notifications As Read",
+        request=NotificationMarkReadSerializer,
+        responses={
+            200: NotificationMarkReadResponseSerializer,
+            400: bad_request_response,
+            401: unauthorized_response
+        }
+    )
+    @action(methods=["POST"], detail=False, url_path="read", url_name="mark-read")
+    def mark_read(self, request: HttpRequest, *args, **kwargs) -> Response:
+        serializer: NotificationMarkReadSerializer = NotificationMarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        user: CustomUser = request.user
+        updated: int = NotificationService.mark_read(user.id, up_to_id=serializer.validated_data.get("up_to_id"),
+                                                     ids=serializer.validated_data.get("ids"))
+
+        return Response(data={
+            "updated": updated,
+            "unread_count": NotificationService.get_unread_count(user.id)
+        }, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="Unread Notifications Count",
+        request=None,
+        responses={
+            200: OpenApiResponse(description="Cached number of unread notifications",
+                                 examples=[OpenApiExample(name="Unread count", value={"unread_count": 3})]),
+            401: unauthorized_response
+        }
+    )
+    @action(methods=["GET"], detail=False, url_path="unread-count", url_name="unread-count")
+    def unread_count(self, request: HttpRequest, *args, **kwargs) -> Response:
+        return Response(data={"unread_count": NotificationService.get_unread_count(request.user.id)},
+                        status=status.HTTP_200_OK)